@@ -0,0 +1,103 @@
+"""
+Measures the throughput of decode_many, decode_shared, encode_many and encode_into (with worker processes and with
+threads) for increasing numbers of workers, up to the number of CPUs unless a maximum is given.
+
+Usage: python benchmarks/parallel.py [records] [max workers]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from podite import (
+    pod,
+    U8,
+    U32,
+    U64,
+    Str,
+    Vec,
+    decode_many,
+    decode_shared,
+    encode_many,
+    encode_into,
+)
+
+
+@pod
+class Order:
+    id: U64
+    owner: Str[32]
+    price: U64
+    size: U32
+    fills: Vec[U64, 16]
+    flags: U8
+
+
+def make_orders(n):
+    return [
+        Order(i, f"owner{i}", 100 + i, i % 1000, list(range(i % 16)), i % 2)
+        for i in range(n)
+    ]
+
+
+def measure(fn, *args, repeat=3, **kwargs):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    orders = make_orders(count)
+    buffers = encode_many(Order, orders, workers=1)
+
+    raw = b"".join(buffers)
+    offsets = [0]
+    for buffer in buffers[:-1]:
+        offsets.append(offsets[-1] + len(buffer))
+
+    benchmarks = {
+        "decode_many": (decode_many, Order, buffers),
+        "decode_shared": (decode_shared, Order, raw, offsets),
+        "encode_many": (encode_many, Order, orders),
+        "encode_into": (encode_into, Order, orders),
+    }
+    names = [*benchmarks, "encode_into threads"]
+
+    print(f"{count} records, {os.cpu_count()} CPUs")
+    print(
+        f"{'workers':>8}"
+        + "".join(f" {name + '/s':>20} {'speedup':>8}" for name in names)
+    )
+
+    cpus = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    counts = sorted({1 << i for i in range(cpus.bit_length())} | {cpus})
+
+    base = None
+    for workers in counts:
+        with ProcessPoolExecutor(workers) as executor:
+            # start the workers before timing
+            decode_many(Order, buffers[:workers], executor=executor, chunk_size=1)
+
+            kwargs = {"workers": workers, "executor": executor if workers > 1 else None}
+            times = [measure(*args, **kwargs) for args in benchmarks.values()]
+
+        with ThreadPoolExecutor(workers) as executor:
+            kwargs = {"workers": workers, "executor": executor if workers > 1 else None}
+            times.append(measure(encode_into, Order, orders, threads=True, **kwargs))
+
+        if base is None:
+            base = times
+        print(
+            f"{workers:>8}"
+            + "".join(
+                f" {count / t:>20,.0f} {b / t:>8.2f}" for t, b in zip(times, base)
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Measures the cost of read_from against reading each record with a single readexactly of its known size and decoding
+it with from_bytes, which is the least any reader of an asyncio stream pays, for records received over a local TCP
+connection. Unlike the baseline, read_from does not know the sizes in advance: it also reads up to each length or tag
+of a record to find its end, which is what the ratio measures.
+
+Usage: python benchmarks/stream.py [records]
+"""
+import asyncio
+import sys
+import time
+
+from podite import (
+    pod,
+    U8,
+    U32,
+    U64,
+    Str,
+    Vec,
+    Enum,
+    Variant,
+    AutoTagType,
+    FORMAT_BORSH,
+)
+
+
+@pod
+class Fill(Enum[AutoTagType]):
+    NONE = None
+    SOME = Variant(field=U32)
+
+
+@pod
+class Order:
+    id: U64
+    owner: Str[32]
+    price: U64
+    fill: Fill
+    fills: Vec[U64, 16]
+    flags: U8
+
+
+@pod
+class Batch:
+    orders: Vec[Order]
+
+
+def make_orders(n):
+    return [
+        Order(i, f"owner{i}", 100 + i, Fill.SOME(i), list(range(i % 16)), i % 2)
+        for i in range(n)
+    ]
+
+
+async def read_with_from_bytes(type_, reader, buffers):
+    for raw in buffers:
+        type_.from_bytes(await reader.readexactly(len(raw)), format=FORMAT_BORSH)
+
+
+async def read_with_read_from(type_, reader, buffers):
+    for _ in buffers:
+        await type_.read_from(reader)
+
+
+async def measure(read, type_, buffers):
+    """
+    Returns the time taken by read to receive buffers over a local TCP connection.
+    """
+    raw = b"".join(buffers)
+
+    async def send(_, writer):
+        writer.write(raw)
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(send, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    await read(type_, reader, buffers)
+    elapsed = time.perf_counter() - start
+
+    writer.close()
+    server.close()
+    await server.wait_closed()
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    orders = make_orders(count)
+    cases = [
+        (f"{count} orders", Order, [Order.to_bytes(order) for order in orders]),
+        (f"1 batch of {count}", Batch, [Batch.to_bytes(Batch(orders))]),
+    ]
+
+    print(f"{'records':>20} {'from_bytes (s)':>15} {'read_from (s)':>14} {'ratio':>6}")
+    for name, type_, buffers in cases:
+        base = min(
+            asyncio.run(measure(read_with_from_bytes, type_, buffers)) for _ in range(3)
+        )
+        actual = min(
+            asyncio.run(measure(read_with_read_from, type_, buffers)) for _ in range(3)
+        )
+        print(f"{name:>20} {base:>15.3f} {actual:>14.3f} {actual / base:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
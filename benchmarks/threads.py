@@ -0,0 +1,81 @@
+"""
+Measures the decoding throughput of podite for increasing numbers of threads in one process. Throughput only scales
+on free-threaded builds of python (e.g., python3.13t); with the GIL it stays flat.
+
+Usage: python benchmarks/threads.py [records per thread]
+"""
+import os
+import sys
+import threading
+import time
+
+from podite import pod, U8, U32, U64, Str, Vec, Enum, Variant, AutoTagType
+
+
+@pod
+class Fill(Enum[AutoTagType]):
+    NONE = None
+    SOME = Variant(field=U32)
+
+
+@pod
+class Order:
+    id: U64
+    owner: Str[32]
+    price: U64
+    fill: Fill
+    fills: Vec[U64, 16]
+    flags: U8
+
+
+def make_buffers(n):
+    return [
+        Order.to_bytes(
+            Order(i, f"owner{i}", 100 + i, Fill.SOME(i), list(range(i % 16)), i % 2)
+        )
+        for i in range(n)
+    ]
+
+
+def measure(buffers, threads):
+    barrier = threading.Barrier(threads + 1)
+
+    def run():
+        barrier.wait()
+        for raw in buffers:
+            Order.from_bytes(raw)
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    buffers = make_buffers(count)
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(
+        f"{count} records per thread, {os.cpu_count()} CPUs, GIL enabled: {is_gil_enabled}"
+    )
+    print(f"{'threads':>8} {'decode/s':>12} {'speedup':>8}")
+
+    cpus = os.cpu_count() or 1
+    counts = sorted({1 << i for i in range(cpus.bit_length())} | {cpus})
+
+    base = None
+    for threads in counts:
+        rate = threads * count / measure(buffers, threads)
+        if base is None:
+            base = rate
+        print(f"{threads:>8} {rate:>12,.0f} {rate / base:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
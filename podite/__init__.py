@@ -45,6 +45,7 @@ from .types import (
     Vec,
     Bytes,
     Str,
+    LazyArray,
     Enum,
     Variant,
     named_fields,
@@ -63,7 +64,18 @@ from .bytes import (
     AutoTagTypeValueManager,
 )
 from .errors import PodPathError
-from .json import JSON_CATALOG
+from .stream import Decoder
+from .framing import (
+    Deframer,
+    frame_encode,
+    frame_decode,
+    iter_frames,
+    aiter_frames,
+    read_frame,
+)
+from .files import PodFile
+from .parallel import decode_many, encode_many, decode_shared, encode_into
+from .json import JSON_CATALOG, BytesJsonEncodingManager
 from ._utils import (
     FORMAT_ZERO_COPY,
     FORMAT_AUTO,
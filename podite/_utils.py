@@ -1,5 +1,7 @@
+import copyreg
 import inspect
-from functools import lru_cache, partial
+import threading
+from functools import partial
 
 FORMAT_AUTO = "FORMAT_AUTO"  # attempt to determine format
 FORMAT_PASS = "FORMAT_PASS"  # rely on previously set AutoTagTypeValue
@@ -10,12 +12,29 @@ FORMAT_BORSH = "FORMAT_BORSH"  # use borsh format
 FORMAT_TO_TYPE = {FORMAT_BORSH: "U8", FORMAT_ZERO_COPY: "U64"}  # stub  # stub
 
 
+# guards the lazy creation and resolution of types, which is rare, so that concurrent readers never see two versions of
+# a type. It is reentrant since creating a type may create others.
+TYPE_LOCK = threading.RLock()
+
+
+class _TagTypeState(threading.local):
+    tag_type = None  # None until a thread sets it
+
+
 class AutoTagTypeValueManager:
-    TAG_TYPE = [None]  # mutable static var
+    """
+    Sets the concrete type of AutoTagType for the current thread. Other threads keep the default TAG_TYPE[0].
+    """
+
+    TAG_TYPE = [None]  # mutable static var, the default
+    _STATE = _TagTypeState()
 
     @staticmethod
     def get_tag():
-        return AutoTagTypeValueManager.TAG_TYPE[0]
+        tag_type = AutoTagTypeValueManager._STATE.tag_type
+        if tag_type is None:
+            return AutoTagTypeValueManager.TAG_TYPE[0]
+        return tag_type
 
     def __init__(self, tag_type_or_format):
         if isinstance(tag_type_or_format, str):
@@ -23,24 +42,70 @@ class AutoTagTypeValueManager:
         self._tag_type = tag_type_or_format
 
     def __enter__(self):
-        self.old = AutoTagTypeValueManager.TAG_TYPE[0]
-        AutoTagTypeValueManager.TAG_TYPE[0] = self._tag_type
+        state = AutoTagTypeValueManager._STATE
+        self.old = state.tag_type
+        state.tag_type = self._tag_type
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.old is not None:
-            AutoTagTypeValueManager.TAG_TYPE[0] = self.old
+        AutoTagTypeValueManager._STATE.tag_type = self.old
+
+
+# the _GetitemToCall and the arguments a parametrized class was created from
+PARAMETRIZED_BY = "__pod_parametrized_by__"
+
+
+class ParametrizedType(type):
+    """
+    The metaclass of classes created by a `_GetitemToCall` (e.g., `Vec[U8, 4]`), which cannot be pickled by
+    reference to their name. It lets pickle recreate them from their parameters instead.
+    """
+
+
+def _getitem(getter, args):
+    return getter[args]
+
+
+def reduce_parametrized(cls):
+    parametrized_by = cls.__dict__.get(PARAMETRIZED_BY)
+    if parametrized_by is None:
+        return cls.__qualname__
+    return _getitem, parametrized_by
+
+
+copyreg.pickle(ParametrizedType, reduce_parametrized)
 
 
 class _GetitemToCall:
     def __init__(self, name, func):
         self.name = name
-        self.func = lru_cache()(partial(func, name))
+        self.func = partial(func, name)
+        # classes are only added once complete, so lookups need no lock
+        self._cache = {}
+        # pickles by reference to the module attribute
+        self.__module__ = func.__module__
 
     def __getitem__(self, args):
-        if isinstance(args, tuple):
-            return self.func(*args)
-        else:
-            return self.func(args)
+        cls = self._cache.get(args)
+        if cls is not None:
+            return cls
+
+        with TYPE_LOCK:
+            cls = self._cache.get(args)
+            if cls is None:
+                # func is called from here since it inspects the calling module
+                if isinstance(args, tuple):
+                    cls = self.func(*args)
+                else:
+                    cls = self.func(args)
+
+                if PARAMETRIZED_BY not in cls.__dict__:
+                    setattr(cls, PARAMETRIZED_BY, (self, args))
+                self._cache[args] = cls
+
+        return cls
+
+    def __reduce__(self):
+        return self.name
 
     def __str__(self):
         return f"{_GetitemToCall.__module__}.{self.name}"
@@ -71,3 +136,19 @@ def get_concrete_type(module, type_):
         module_dict = {name: getattr(module, name) for name in dir(module)}
         return eval(type_, module_dict, dict())
     return type_
+
+
+def lazy_plan(compile_plan):
+    """
+    Returns a function returning compile_plan(), which is called on first use as the fields of a class may refer to
+    the class itself. The plan is published by a single assignment, so other threads never see it partially built.
+    """
+    plan = None
+
+    def get_plan():
+        nonlocal plan
+        if plan is None:
+            plan = compile_plan()
+        return plan
+
+    return get_plan
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from dataclasses import is_dataclass, fields, dataclass
+from dataclasses import is_dataclass, fields, dataclass, MISSING
 from io import BytesIO
 from typing import Tuple, Dict, Any, Literal
 from .errors import PodPathError
@@ -51,6 +51,20 @@ TO_BYTES_PARTIAL = "_to_bytes_partial"
 FROM_BYTES_PARTIAL = "_from_bytes_partial"
 
 
+def is_plain_dataclass(type_) -> bool:
+    """
+    Returns True if type_ is a dataclass encoded as the concatenation of its fields (i.e., neither
+    `_to_bytes_partial` nor `_from_bytes_partial` is customized).
+    """
+    unpacker = getattr(type_, FROM_BYTES_PARTIAL, None)
+    packer = getattr(type_, TO_BYTES_PARTIAL, None)
+    return (
+        is_dataclass(type_)
+        and getattr(unpacker, "__func__", None) is dataclass_from_bytes_partial
+        and getattr(packer, "__func__", None) is dataclass_to_bytes_partial
+    )
+
+
 def dataclass_is_static(cls) -> bool:
     for field in fields(cls):
         if not BYTES_CATALOG.is_static(cls._get_field_type(field.type)):
@@ -117,6 +131,173 @@ def dataclass_from_bytes_partial(cls, buffer, **kwargs):
     return cls(**values)
 
 
+def _split_path(path):
+    if not path:
+        return []
+    return path.split(".")
+
+
+def seek_field(type_, buffer, path, **kwargs):
+    """
+    Moves buffer from the start of an encoded type_ to the start of the (nested) field at path and returns the
+    field's type. Static fields in front of it are skipped without being decoded.
+    """
+    for name in _split_path(path):
+        if not is_dataclass(type_):
+            raise ValueError(f"Cannot look up field {name} in {type_}")
+
+        for field in fields(type_):
+            field_type = type_._get_field_type(field.type)
+            if field.name == name:
+                break
+
+            if BYTES_CATALOG.is_static(field_type):
+                buffer.seek(BYTES_CATALOG.calc_max_size(field_type), 1)
+            else:
+                BYTES_CATALOG.unpack_partial(field_type, buffer, **kwargs)
+        else:
+            raise ValueError(f"{type_} has no field named {name}")
+
+        type_ = field_type
+
+    return type_
+
+
+def calc_field_offset(type_, path) -> Tuple[int, Any]:
+    """
+    Returns the offset of the (nested) field at path within a static type_ together with the field's type.
+    Note: set AutoTagType value using AutoTagTypeValueManager for the format you want the offset for
+    """
+    offset = 0
+    for name in _split_path(path):
+        if not is_dataclass(type_):
+            raise ValueError(f"Cannot look up field {name} in {type_}")
+
+        for field in fields(type_):
+            field_type = type_._get_field_type(field.type)
+            if field.name == name:
+                break
+            offset += BYTES_CATALOG.calc_max_size(field_type)
+        else:
+            raise ValueError(f"{type_} has no field named {name}")
+
+        type_ = field_type
+
+    return offset, type_
+
+
+def _seek_array(type_, buffer, path, **kwargs):
+    """
+    Moves buffer to the first element of the array at path and returns its element type and length.
+    """
+    array_type = seek_field(type_, buffer, path, **kwargs)
+    if not hasattr(array_type, "_get_element_type"):
+        raise ValueError(f"{array_type} is not an array type")
+
+    if hasattr(array_type, "_get_length_type"):
+        length_type = array_type._get_length_type()
+        length = BYTES_CATALOG.unpack_partial(length_type, buffer, **kwargs)
+    else:
+        length = array_type._get_length()
+
+    return array_type._get_element_type(), length
+
+
+def bisect_partial(
+    type_, buffer, array_path, key_path, value, side="left", **kwargs
+) -> Tuple[int, Any]:
+    """
+    Binary searches a sorted array of static elements directly on its encoding. Only the probed keys are decoded.
+
+    :return: the insertion index of value (as in `bisect.bisect_left` or `bisect.bisect_right`) and the element
+        type, with buffer positioned at the start of the array.
+    """
+    if side not in ("left", "right"):
+        raise ValueError(f"side must be either left or right, found {side}")
+
+    elem_type, length = _seek_array(type_, buffer, array_path, **kwargs)
+    if not BYTES_CATALOG.is_static(elem_type):
+        raise ValueError(f"Binary search requires static elements, found {elem_type}")
+
+    stride = BYTES_CATALOG.calc_max_size(elem_type)
+    key_offset, key_type = calc_field_offset(elem_type, key_path)
+    start = buffer.tell()
+
+    lo, hi = 0, length
+    while lo < hi:
+        mid = (lo + hi) // 2
+        buffer.seek(start + mid * stride + key_offset)
+        key = BYTES_CATALOG.unpack_partial(key_type, buffer, **kwargs)
+        if key < value or (side == "right" and key == value):
+            lo = mid + 1
+        else:
+            hi = mid
+
+    buffer.seek(start)
+    return lo, (elem_type, length, stride)
+
+
+def find_sorted_partial(type_, buffer, array_path, key_path, value, **kwargs):
+    """
+    Returns the first element of a sorted array of static elements whose key equals value (None if missing),
+    decoding only the probed keys and the element found.
+    """
+    index, (elem_type, length, stride) = bisect_partial(
+        type_, buffer, array_path, key_path, value, **kwargs
+    )
+    if index == length:
+        return None
+
+    buffer.seek(buffer.tell() + index * stride)
+    elem = BYTES_CATALOG.unpack_partial(elem_type, buffer, **kwargs)
+
+    key = elem
+    for name in _split_path(key_path):
+        key = getattr(key, name)
+
+    return elem if key == value else None
+
+
+class BufferWriter:
+    """
+    A write-only file-like window over a writable bytes-like object (e.g., a bytearray or mmap) starting at offset,
+    which can be passed to `_to_bytes_partial` to encode in place.
+    """
+
+    def __init__(self, buffer, offset=0):
+        self._view = memoryview(buffer)
+        self._start = offset
+        self._pos = offset
+
+    def write(self, data):
+        end = self._pos + len(data)
+        if end > len(self._view):
+            raise ValueError(
+                f"Buffer length is {len(self._view)}, but writing requires {end}"
+            )
+
+        self._view[self._pos : end] = data
+        self._pos = end
+        return len(data)
+
+    def tell(self):
+        return self._pos - self._start
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self.tell()
+        elif whence != 0:
+            raise ValueError(
+                "BufferWriter only supports seeking from the start or the current position"
+            )
+
+        self._pos = self._start + offset
+        return offset
+
+    def release(self):
+        self._view.release()
+
+
 class SelfBytesPodConverter(BytesPodConverter):
     def get_mapping(self, type_):
         converters = getattr(type_, POD_SELF_CONVERTER, ())
@@ -157,9 +338,9 @@ class BytesPodConverterCatalog(PodConverterCatalog[BytesPodConverter]):
         converter = self._get_converter_or_raise(type_, error_msg)
         return converter.calc_max_size(type_)
 
-    def calc_size(self, type_, obj=None, format=FORMAT_BORSH, **kwargs):
-        # zero-copy format does not support dynamic sizes
-        if obj is None or format == FORMAT_ZERO_COPY:
+    def calc_size(self, type_, obj=MISSING, format=FORMAT_BORSH, **kwargs):
+        # zero-copy format does not support dynamic sizes, and None is a valid obj (e.g., for Optional)
+        if obj is MISSING or format == FORMAT_ZERO_COPY:
             return self.calc_max_size(type_)
 
         error_msg = f"No converter was able to calculate size of type {type_}"
@@ -183,6 +364,27 @@ class BytesPodConverterCatalog(PodConverterCatalog[BytesPodConverter]):
 
         return buffer.getvalue()
 
+    def pack_into(self, type_, buffer, offset, obj, format=FORMAT_BORSH, **kwargs):
+        """
+        Encodes obj directly into the writable bytes-like buffer at offset, like `struct.pack_into`, and returns the
+        number of bytes written. Bytes written before an error are left in buffer.
+        """
+        writer = BufferWriter(buffer, offset)
+        try:
+            if format in FORMAT_TO_TYPE:
+                with AutoTagTypeValueManager(FORMAT_TO_TYPE[format]):
+                    self.pack_partial(type_, writer, obj, format=format, **kwargs)
+            elif format == FORMAT_PASS:
+                self.pack_partial(type_, writer, obj, format=format, **kwargs)
+            else:
+                raise ValueError(
+                    f"Format argument must be {FORMAT_BORSH}, {FORMAT_ZERO_COPY}, or {FORMAT_PASS}, found {format}"
+                )
+        finally:
+            writer.release()
+
+        return writer.tell()
+
     def pack_partial(self, type_, buffer, obj, format=FORMAT_BORSH, **kwargs):
         error_msg = "No converter was able to pack raw data"
         converter = self._get_converter_or_raise(type_, error_msg)
@@ -197,15 +399,7 @@ class BytesPodConverterCatalog(PodConverterCatalog[BytesPodConverter]):
 
         error_msg = "No converter was able to unpack object"
         converter = self._get_converter_or_raise(type_, error_msg)
-        if format == FORMAT_AUTO:
-            with AutoTagTypeValueManager(FORMAT_TO_TYPE[FORMAT_ZERO_COPY]):
-                pos = buffer.tell()
-                buffer.seek(0, 2)
-                if converter.calc_max_size(type_) == buffer.tell():
-                    format = FORMAT_ZERO_COPY
-                else:
-                    format = FORMAT_BORSH
-                buffer.seek(pos)
+        format = self._detect_format(type_, buffer, format)
 
         if format in FORMAT_TO_TYPE:
             with AutoTagTypeValueManager(FORMAT_TO_TYPE[format]):
@@ -222,6 +416,51 @@ class BytesPodConverterCatalog(PodConverterCatalog[BytesPodConverter]):
 
         return obj
 
+    def _detect_format(self, type_, buffer, format):
+        if format != FORMAT_AUTO:
+            return format
+
+        with AutoTagTypeValueManager(FORMAT_TO_TYPE[FORMAT_ZERO_COPY]):
+            pos = buffer.tell()
+            buffer.seek(0, 2)
+            if self.calc_max_size(type_) == buffer.tell():
+                format = FORMAT_ZERO_COPY
+            else:
+                format = FORMAT_BORSH
+            buffer.seek(pos)
+
+        return format
+
+    def _search(self, search_fn, type_, raw, *args, format=FORMAT_AUTO, **kwargs):
+        buffer = raw if isinstance(raw, BytesIO) else BytesIO(raw)
+        format = self._detect_format(type_, buffer, format)
+        if format not in FORMAT_TO_TYPE:
+            raise ValueError(
+                f"Format argument must be {FORMAT_AUTO}, {FORMAT_BORSH}, or {FORMAT_ZERO_COPY}, found {format}"
+            )
+
+        with AutoTagTypeValueManager(FORMAT_TO_TYPE[format]):
+            return search_fn(type_, buffer, *args, format=format, **kwargs)
+
+    def bisect(self, type_, raw, array_path, key_path, value, side="left", **kwargs):
+        """
+        Returns the index at which value would be inserted into the sorted array at array_path (of static elements
+        ordered by the field at key_path) of the encoded type_, without decoding the array.
+        """
+        index, _ = self._search(
+            bisect_partial, type_, raw, array_path, key_path, value, side, **kwargs
+        )
+        return index
+
+    def find_sorted(self, type_, raw, array_path, key_path, value, **kwargs):
+        """
+        Returns the element of the sorted array at array_path of the encoded type_ whose field at key_path equals
+        value, or None if there is no such element.
+        """
+        return self._search(
+            find_sorted_partial, type_, raw, array_path, key_path, value, **kwargs
+        )
+
     def unpack_partial(
         self, type_, buffer, format=FORMAT_AUTO, **kwargs
     ) -> Tuple[bool, object]:
@@ -256,6 +495,61 @@ class BytesPodConverterCatalog(PodConverterCatalog[BytesPodConverter]):
         def from_bytes(cls, raw, format=FORMAT_AUTO, **kwargs):
             return cls.unpack(raw, converter="bytes", format=format, **kwargs)
 
+        def pack_into(cls, buffer, offset, obj, format=FORMAT_BORSH, **kwargs):
+            return BYTES_CATALOG.pack_into(
+                cls, buffer, offset, obj, format=format, **kwargs
+            )
+
+        def from_bytes_columns(cls, buffers, format=FORMAT_AUTO, **kwargs):
+            from .columns import unpack_columns
+
+            return unpack_columns(cls, buffers, format=format, **kwargs)
+
+        def to_bytes_columns(cls, columns, format=FORMAT_BORSH, concat=True, **kwargs):
+            from .columns import pack_columns
+
+            return pack_columns(cls, columns, format=format, concat=concat, **kwargs)
+
+        def bytes_to_dict(cls, raw, format=FORMAT_AUTO, **kwargs):
+            from .direct import unpack_dict
+
+            return unpack_dict(cls, raw, format=format, **kwargs)
+
+        def dict_to_bytes(cls, raw, format=FORMAT_BORSH, **kwargs):
+            from .direct import pack_dict
+
+            return pack_dict(cls, raw, format=format, **kwargs)
+
+        def transcode(cls, raw, src_format=FORMAT_AUTO, dst_format=FORMAT_BORSH):
+            from .transcode import transcode
+
+            return transcode(cls, raw, src_format=src_format, dst_format=dst_format)
+
+        def iter_from_stream(cls, fileobj, format=FORMAT_BORSH, **kwargs):
+            from .stream import iter_from_stream
+
+            return iter_from_stream(cls, fileobj, format=format, **kwargs)
+
+        async def read_from(cls, reader, format=FORMAT_BORSH, **kwargs):
+            from .stream import read_from
+
+            return await read_from(cls, reader, format=format, **kwargs)
+
+        def aiter_from_stream(cls, reader, format=FORMAT_BORSH, **kwargs):
+            from .stream import aiter_from_stream
+
+            return aiter_from_stream(cls, reader, format=format, **kwargs)
+
+        def bisect(cls, raw, array_path, key_path, value, side="left", **kwargs):
+            return BYTES_CATALOG.bisect(
+                cls, raw, array_path, key_path, value, side=side, **kwargs
+            )
+
+        def find_sorted(cls, raw, array_path, key_path, value, **kwargs):
+            return BYTES_CATALOG.find_sorted(
+                cls, raw, array_path, key_path, value, **kwargs
+            )
+
         helpers.update(
             {
                 "is_static": classmethod(is_static),
@@ -263,6 +557,17 @@ class BytesPodConverterCatalog(PodConverterCatalog[BytesPodConverter]):
                 "calc_size": classmethod(calc_size),
                 "to_bytes": classmethod(to_bytes),
                 "from_bytes": classmethod(from_bytes),
+                "pack_into": classmethod(pack_into),
+                "from_bytes_columns": classmethod(from_bytes_columns),
+                "to_bytes_columns": classmethod(to_bytes_columns),
+                "bytes_to_dict": classmethod(bytes_to_dict),
+                "dict_to_bytes": classmethod(dict_to_bytes),
+                "transcode": classmethod(transcode),
+                "iter_from_stream": classmethod(iter_from_stream),
+                "read_from": classmethod(read_from),
+                "aiter_from_stream": classmethod(aiter_from_stream),
+                "bisect": classmethod(bisect),
+                "find_sorted": classmethod(find_sorted),
             }
         )
 
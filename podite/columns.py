@@ -0,0 +1,251 @@
+"""
+Columnar (struct-of-arrays) conversion between many encoded records and their field-path columns.
+"""
+import struct
+from array import array
+from dataclasses import fields
+from io import BytesIO
+from typing import Dict, Any
+
+from .bytes import BYTES_CATALOG, is_plain_dataclass
+from .errors import PodPathError
+from ._utils import (
+    FORMAT_AUTO,
+    FORMAT_BORSH,
+    FORMAT_ZERO_COPY,
+    FORMAT_TO_TYPE,
+    AutoTagTypeValueManager,
+)
+
+
+def get_column_types(type_, prefix="") -> Dict[str, Any]:
+    """
+    Returns the paths of the leaf fields of type_ (names of nested dataclass fields joined by ".") mapped to their
+    types, in encoding order. A type that is not a dataclass is a single column with an empty path.
+    """
+    if not is_plain_dataclass(type_):
+        return {prefix: type_}
+
+    columns = {}
+    for field in fields(type_):
+        path = f"{prefix}.{field.name}" if prefix else field.name
+        columns.update(get_column_types(type_._get_field_type(field.type), path))
+
+    return columns
+
+
+def get_typecode(type_):
+    """
+    Returns the `array.array` typecode that holds the values of an atomic type_ exactly, or None if there is none.
+    """
+    get_code = getattr(type_, "_get_code", None)
+    if get_code is None or getattr(type_, "_unpacker", None) not in (int, float):
+        return None
+
+    code = get_code().lstrip("<>")
+    if len(code) != 1 or code not in "bBhHiIlLqQfd":
+        return None
+
+    if array(code).itemsize != struct.calcsize(f"<{code}"):
+        return None
+
+    return code
+
+
+def compile_struct(column_types):
+    """
+    Returns a `struct.Struct` encoding a record in one call when all columns are atomic and share a byte order,
+    otherwise None.
+    """
+    order = None
+    codes = []
+    for type_ in column_types.values():
+        get_code = getattr(type_, "_get_code", None)
+        if get_code is None or not hasattr(type_, "_unpacker"):
+            return None
+
+        code = get_code()
+        if code[0] in "<>":
+            if order is not None and order != code[0]:
+                return None
+            order, code = code[0], code[1:]
+        codes.append(code)
+
+    return struct.Struct((order or "<") + "".join(codes))
+
+
+def _to_column(type_, values):
+    typecode = get_typecode(type_)
+    if typecode is None:
+        return list(values)
+    return array(typecode, values)
+
+
+def _column_error(type_, path, leaf, message):
+    return PodPathError(message, path.split(".")[::-1] + [type_.__name__], leaf)
+
+
+def _row_error(type_, row, message):
+    return PodPathError(f"{message} in row {row}", [type_.__name__], type_)
+
+
+def _unpack_columns_struct(type_, column_types, compiled, buffers):
+    rows = []
+    for row, raw in enumerate(buffers):
+        if len(raw) != compiled.size:
+            raise _row_error(
+                type_, row, f"Expected {compiled.size} bytes, found {len(raw)}"
+            )
+        try:
+            rows.append(compiled.unpack(raw))
+        except Exception as e:
+            raise _row_error(type_, row, "Failed to deserialize record") from e
+
+    values = zip(*rows) if rows else [()] * len(column_types)
+
+    columns = {}
+    for (path, leaf), column in zip(column_types.items(), values):
+        unpacker = leaf._unpacker
+        if unpacker not in (int, float):
+            column = map(unpacker, column)
+        columns[path] = _to_column(leaf, column)
+
+    return columns
+
+
+def unpack_columns(type_, buffers, format=FORMAT_AUTO, **kwargs):
+    """
+    Decodes each encoded record of buffers and returns the values of every leaf field gathered in a column, keyed
+    by field path. No intermediate objects are built for dataclasses. Columns of atomic types that fit an
+    `array.array` are returned as such, other columns are lists.
+    """
+    if format not in (FORMAT_AUTO, FORMAT_BORSH, FORMAT_ZERO_COPY):
+        raise ValueError(
+            f"Format argument must be {FORMAT_AUTO}, {FORMAT_BORSH}, or {FORMAT_ZERO_COPY}, found {format}"
+        )
+
+    column_types = get_column_types(type_)
+    compiled = compile_struct(column_types)
+    if compiled is not None:
+        # atomic layouts are the same in every format
+        return _unpack_columns_struct(type_, column_types, compiled, buffers)
+
+    with AutoTagTypeValueManager(FORMAT_TO_TYPE[FORMAT_ZERO_COPY]):
+        zero_copy_size = BYTES_CATALOG.calc_max_size(type_)
+
+    columns = {path: [] for path in column_types}
+    plan = [(path, leaf, columns[path]) for path, leaf in column_types.items()]
+    for row, raw in enumerate(buffers):
+        record_format = format
+        if record_format == FORMAT_AUTO:
+            if len(raw) == zero_copy_size:
+                record_format = FORMAT_ZERO_COPY
+            else:
+                record_format = FORMAT_BORSH
+
+        buffer = BytesIO(raw)
+        with AutoTagTypeValueManager(FORMAT_TO_TYPE[record_format]):
+            for path, leaf, column in plan:
+                try:
+                    column.append(
+                        BYTES_CATALOG.unpack_partial(
+                            leaf, buffer, format=record_format, **kwargs
+                        )
+                    )
+                except PodPathError as e:
+                    e.path.extend(path.split(".")[::-1] + [type_.__name__])
+                    raise
+                except Exception as e:
+                    raise _column_error(
+                        type_, path, leaf, f"Failed to deserialize column in row {row}"
+                    ) from e
+
+        if buffer.tell() != len(raw):
+            raise _row_error(type_, row, "Unused bytes in provided raw data")
+
+    return {
+        path: _to_column(leaf, columns[path]) for path, leaf in column_types.items()
+    }
+
+
+def _as_list(column):
+    # array.array and numpy arrays convert to python scalars much faster in bulk
+    tolist = getattr(column, "tolist", None)
+    if tolist is not None:
+        return tolist()
+    return list(column)
+
+
+def _prepare_columns(type_, column_types, columns):
+    missing = [path for path in column_types if path not in columns]
+    if missing:
+        raise ValueError(f"Missing columns {missing} for {type_}")
+
+    values = [_as_list(columns[path]) for path in column_types]
+    lengths = {len(column) for column in values}
+    if len(lengths) > 1:
+        raise ValueError("All columns must have the same length")
+
+    return values
+
+
+def _pack_columns_struct(column_types, compiled, values, concat):
+    for i, leaf in enumerate(column_types.values()):
+        if leaf._packer is not None:
+            values[i] = list(map(leaf._packer, values[i]))
+
+    rows = zip(*values)
+    if not concat:
+        return [compiled.pack(*row) for row in rows]
+
+    size = compiled.size
+    result = bytearray(size * len(values[0]) if values else 0)
+    for i, row in enumerate(rows):
+        compiled.pack_into(result, i * size, *row)
+
+    return bytes(result)
+
+
+def pack_columns(type_, columns, format=FORMAT_BORSH, concat=True, **kwargs):
+    """
+    Encodes records given as columns keyed by field path (as returned by `unpack_columns`) without building any
+    dataclass instances. Returns the concatenated encoding of all records if concat is True, otherwise the list of
+    encoded records.
+    """
+    if format not in (FORMAT_BORSH, FORMAT_ZERO_COPY):
+        raise ValueError(
+            f"Format argument must be {FORMAT_BORSH} or {FORMAT_ZERO_COPY}, found {format}"
+        )
+
+    column_types = get_column_types(type_)
+    values = _prepare_columns(type_, column_types, columns)
+
+    compiled = compile_struct(column_types)
+    if compiled is not None:
+        return _pack_columns_struct(column_types, compiled, values, concat)
+
+    plan = list(column_types.items())
+    results = []
+    buffer = BytesIO()
+    with AutoTagTypeValueManager(FORMAT_TO_TYPE[format]):
+        for row in zip(*values):
+            for (path, leaf), value in zip(plan, row):
+                try:
+                    BYTES_CATALOG.pack_partial(
+                        leaf, buffer, value, format=format, **kwargs
+                    )
+                except PodPathError as e:
+                    e.path.extend(path.split(".")[::-1] + [type_.__name__])
+                    raise
+                except Exception as e:
+                    raise _column_error(
+                        type_, path, leaf, "Failed to serialize column"
+                    ) from e
+
+            if not concat:
+                results.append(buffer.getvalue())
+                buffer = BytesIO()
+
+    if concat:
+        return buffer.getvalue()
+    return results
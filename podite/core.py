@@ -3,7 +3,8 @@
 Core functionality and base classes of podite packing/unpacking are implemented here.
 """
 import sys
-from typing import List, Dict, Callable, TypeVar, Generic, Type, Optional
+import threading
+from typing import Tuple, Dict, Callable, TypeVar, Generic, Type, Optional
 
 PodConverter = TypeVar("PodConverter")
 
@@ -17,16 +18,19 @@ class PodConverterCatalog(Generic[PodConverter]):
     success happens.
     """
 
-    converters: List[Callable[[Type], Optional[PodConverter]]]
+    # replaced rather than mutated, so that lookups from other threads always see a complete snapshot
+    converters: Tuple[Callable[[Type], Optional[PodConverter]], ...]
 
     def __init__(self):
-        self.converters = []
+        self.converters = ()
+        self._register_lock = threading.Lock()
 
     def register(self, converter: Callable[[Type], Optional[PodConverter]]):
         """
         Registers a new converter to be used if previous converters fail to pack/unpack.
         """
-        self.converters.append(converter)
+        with self._register_lock:
+            self.converters = self.converters + (converter,)
 
     def _get_converter_or_raise(self, type_, msg):
         for mapping in self.converters:
@@ -0,0 +1,290 @@
+"""
+Conversions between encoded bytes and json-style dicts that skip building the intermediate pod objects.
+
+Types take part by defining `_bytes_to_dict_partial` and `_dict_to_bytes_partial`; dataclasses, Optional and tuples
+are handled here and any other type falls back to building the object and converting it.
+"""
+from dataclasses import fields, MISSING
+from functools import lru_cache
+from io import BytesIO
+from typing import Union, get_args, get_origin
+
+from .bytes import BYTES_CATALOG, is_plain_dataclass
+from .errors import PodPathError
+from .json import JSON_CATALOG, GET_JSON_PLANS, uses_json_plans, bytes_json_encoding
+from ._utils import (
+    FORMAT_AUTO,
+    FORMAT_BORSH,
+    FORMAT_ZERO_COPY,
+    FORMAT_PASS,
+    FORMAT_TO_TYPE,
+    AutoTagTypeValueManager,
+    lazy_plan,
+)
+
+BYTES_TO_DICT_PARTIAL = "_bytes_to_dict_partial"
+DICT_TO_BYTES_PARTIAL = "_dict_to_bytes_partial"
+
+
+def _dataclass_bytes_to_dict(cls):
+    def compile_plan():
+        to_plan, _, types = getattr(cls, GET_JSON_PLANS)()
+        return [
+            (name, key, field_type, get_bytes_to_dict(field_type))
+            for (name, key, _), field_type in zip(to_plan, types)
+        ]
+
+    get_plan = lazy_plan(compile_plan)
+
+    def decode(buffer, **kwargs):
+        values = {}
+        for name, key, field_type, field_decode in get_plan():
+            try:
+                values[key] = field_decode(buffer, **kwargs)
+            except PodPathError as e:
+                e.path.append(name)
+                e.path.append(cls.__name__)
+                raise
+            except Exception as e:
+                raise PodPathError(
+                    "Failed to deserialize dataclass",
+                    [name, cls.__name__],
+                    getattr(field_type, "__name__", field_type),
+                ) from e
+
+        return values
+
+    return decode
+
+
+def _optional_bytes_to_dict(type_):
+    some_decode = get_bytes_to_dict(get_args(type_)[0])
+
+    def decode(buffer, **kwargs):
+        b = buffer.read(1)
+        if b == b"\x00":
+            return None
+
+        if b == b"\x01":
+            return some_decode(buffer, **kwargs)
+
+        if len(b) == 0:
+            raise ValueError("The end of the buffer reached but requires 1 bytes")
+        raise ValueError("Invalid byte")
+
+    return decode
+
+
+def _tuple_bytes_to_dict(type_):
+    decoders = [get_bytes_to_dict(arg) for arg in get_args(type_)]
+
+    def decode(buffer, **kwargs):
+        return tuple(d(buffer, **kwargs) for d in decoders)
+
+    return decode
+
+
+@lru_cache(maxsize=None)
+def get_bytes_to_dict(type_):
+    """
+    Resolves the converters of type_ once and returns a function `(buffer, **kwargs)` that decodes it directly into
+    its json-style representation.
+    """
+    hook = getattr(type_, BYTES_TO_DICT_PARTIAL, None)
+    if hook is not None:
+        return hook
+
+    if is_plain_dataclass(type_) and uses_json_plans(type_):
+        return _dataclass_bytes_to_dict(type_)
+
+    origin = get_origin(type_)
+    if origin == Union:
+        args = get_args(type_)
+        if len(args) == 2 and args[1] is type(None):
+            return _optional_bytes_to_dict(type_)
+    elif origin == tuple:
+        return _tuple_bytes_to_dict(type_)
+
+    error_msg = "No converter was able to unpack object"
+    converter = BYTES_CATALOG._get_converter_or_raise(type_, error_msg)
+    pack, _ = JSON_CATALOG.get_packers(type_)
+
+    def decode(buffer, format=FORMAT_AUTO, **kwargs):
+        obj = converter.unpack_partial(type_, buffer, format=format, **kwargs)
+        return obj if pack is None else pack(obj)
+
+    return decode
+
+
+def bytes_to_dict_partial(type_, buffer, **kwargs):
+    """
+    Decodes a type_ from buffer directly into its json-style representation, i.e., the result equals
+    `JSON_CATALOG.pack(type_, BYTES_CATALOG.unpack_partial(type_, buffer, **kwargs))`.
+    """
+    return get_bytes_to_dict(type_)(buffer, **kwargs)
+
+
+def unpack_dict(
+    type_, raw, checked=False, format=FORMAT_AUTO, bytes_encoding=None, **kwargs
+):
+    """
+    Returns the same result as `JSON_CATALOG.pack(type_, BYTES_CATALOG.unpack(type_, raw, ...))` in a single pass.
+    """
+    buffer = raw if isinstance(raw, BytesIO) else BytesIO(raw)
+
+    format = BYTES_CATALOG._detect_format(type_, buffer, format)
+    if format not in FORMAT_TO_TYPE:
+        raise ValueError(
+            f"Format argument must be {FORMAT_AUTO}, {FORMAT_BORSH}, or {FORMAT_ZERO_COPY}, found {format}"
+        )
+
+    with AutoTagTypeValueManager(FORMAT_TO_TYPE[format]), bytes_json_encoding(
+        bytes_encoding
+    ):
+        result = bytes_to_dict_partial(type_, buffer, format=format, **kwargs)
+
+    if checked and buffer.tell() < len(buffer.getvalue()):
+        raise RuntimeError("Unused bytes in provided raw data")
+
+    return result
+
+
+def _get_default_fn(field):
+    if field.default is not MISSING:
+        return lambda: field.default
+    if field.default_factory is not MISSING:
+        return field.default_factory
+    return None
+
+
+def _dataclass_dict_to_bytes(cls):
+    def compile_plan():
+        _, from_plan, types = getattr(cls, GET_JSON_PLANS)()
+        return [
+            (
+                name,
+                key,
+                field_type,
+                _get_default_fn(field),
+                get_dict_to_bytes(field_type),
+            )
+            for (name, key, _, _), field_type, field in zip(
+                from_plan, types, fields(cls)
+            )
+        ]
+
+    get_plan = lazy_plan(compile_plan)
+
+    def encode(buffer, raw, **kwargs):
+        if not isinstance(raw, dict):
+            raise ValueError(f"Expected a dict for {cls.__name__}, found {type(raw)}")
+
+        for name, key, field_type, default_fn, field_encode in get_plan():
+            value = raw.get(key, MISSING)
+            try:
+                if value is MISSING and default_fn is not None:
+                    BYTES_CATALOG.pack_partial(
+                        field_type, buffer, default_fn(), **kwargs
+                    )
+                else:
+                    field_encode(buffer, value, **kwargs)
+            except PodPathError as e:
+                e.path.append(name)
+                e.path.append(cls.__name__)
+                raise
+            except Exception as e:
+                raise PodPathError(
+                    "Failed to serialize dataclass",
+                    [name, cls.__name__],
+                    getattr(field_type, "__name__", field_type),
+                    value,
+                ) from e
+
+    return encode
+
+
+def _optional_dict_to_bytes(type_):
+    some_encode = get_dict_to_bytes(get_args(type_)[0])
+
+    def encode(buffer, raw, **kwargs):
+        if raw is None:
+            buffer.write(b"\x00")
+        else:
+            buffer.write(b"\x01")
+            some_encode(buffer, raw, **kwargs)
+
+    return encode
+
+
+def _tuple_dict_to_bytes(type_):
+    encoders = [get_dict_to_bytes(arg) for arg in get_args(type_)]
+
+    def encode(buffer, raw, **kwargs):
+        if len(raw) != len(encoders):
+            raise ValueError(f"Tuple should have exactly {len(encoders)} elements")
+
+        for e, value in zip(encoders, raw):
+            e(buffer, value, **kwargs)
+
+    return encode
+
+
+@lru_cache(maxsize=None)
+def get_dict_to_bytes(type_):
+    """
+    Resolves the converters of type_ once and returns a function `(buffer, raw, **kwargs)` that encodes the
+    json-style raw directly into buffer.
+    """
+    hook = getattr(type_, DICT_TO_BYTES_PARTIAL, None)
+    if hook is not None:
+        return hook
+
+    if is_plain_dataclass(type_) and uses_json_plans(type_):
+        return _dataclass_dict_to_bytes(type_)
+
+    origin = get_origin(type_)
+    if origin == Union:
+        args = get_args(type_)
+        if len(args) == 2 and args[1] is type(None):
+            return _optional_dict_to_bytes(type_)
+    elif origin == tuple:
+        return _tuple_dict_to_bytes(type_)
+
+    error_msg = "No converter was able to pack raw data"
+    converter = BYTES_CATALOG._get_converter_or_raise(type_, error_msg)
+    _, unpack = JSON_CATALOG.get_packers(type_)
+
+    def encode(buffer, raw, format=FORMAT_BORSH, **kwargs):
+        obj = raw if unpack is None else unpack(raw)
+        converter.pack_partial(type_, buffer, obj, format=format, **kwargs)
+
+    return encode
+
+
+def dict_to_bytes_partial(type_, buffer, raw, **kwargs):
+    """
+    Encodes the json-style raw of a type_ directly into buffer, i.e., writes the same bytes as
+    `BYTES_CATALOG.pack_partial(type_, buffer, JSON_CATALOG.unpack(type_, raw), **kwargs)`.
+    """
+    get_dict_to_bytes(type_)(buffer, raw, **kwargs)
+
+
+def pack_dict(type_, raw, format=FORMAT_BORSH, bytes_encoding=None, **kwargs):
+    """
+    Returns the same result as `BYTES_CATALOG.pack(type_, JSON_CATALOG.unpack(type_, raw), ...)` in a single pass.
+    Note that dataclass constructors (e.g., `__post_init__`) are not run.
+    """
+    buffer = BytesIO()
+
+    with bytes_json_encoding(bytes_encoding):
+        if format in FORMAT_TO_TYPE:
+            with AutoTagTypeValueManager(FORMAT_TO_TYPE[format]):
+                dict_to_bytes_partial(type_, buffer, raw, format=format, **kwargs)
+        elif format == FORMAT_PASS:
+            dict_to_bytes_partial(type_, buffer, raw, format=format, **kwargs)
+        else:
+            raise ValueError(
+                f"Format argument must be {FORMAT_BORSH}, {FORMAT_ZERO_COPY}, or {FORMAT_PASS}, found {format}"
+            )
+
+    return buffer.getvalue()
@@ -0,0 +1,241 @@
+"""
+Memory-mapped files of back-to-back zero-copy records.
+"""
+import io
+import mmap
+import os
+from collections.abc import Sequence
+from io import BytesIO
+
+from .bytes import BYTES_CATALOG
+from .stream import scan_partial
+from .types.array import LazyArray
+from ._utils import FORMAT_ZERO_COPY, FORMAT_TO_TYPE, AutoTagTypeValueManager
+
+_MODES = {
+    "r": ("rb", mmap.ACCESS_READ),
+    "r+": ("r+b", mmap.ACCESS_WRITE),
+    "w": ("w+b", mmap.ACCESS_WRITE),
+}
+
+
+def _is_fixed_size(type_, tag_type) -> bool:
+    # the encoding has a fixed size if its scanner never needs to look at its bytes, e.g., at the length of a Vec
+    scan = scan_partial(type_, (FORMAT_ZERO_COPY, tag_type))
+    try:
+        for size in scan:
+            if size > 0:
+                return False
+    finally:
+        scan.close()
+    return True
+
+
+class _FileBytes:
+    """
+    The bytes of a `PodFile`, sliced from its current map, so views do not pin a map that extend and close replace.
+    """
+
+    def __init__(self, pod_file):
+        self._pod_file = pod_file
+
+    def __getitem__(self, index):
+        if self._pod_file.closed:
+            raise ValueError("I/O operation on closed PodFile")
+        return self._pod_file._mmap[index]
+
+
+class PodFile(Sequence):
+    """
+    A sequence of the records of type_ stored in the zero-copy format in the file at path, each taking
+    `calc_max_size` bytes. The file is memory-mapped, so opening it does not read it: records are decoded on access,
+    slices are returned as lazy arrays (`LazyArray`) that read through the file while it is open and assigned records
+    are encoded in place, once all of them have been encoded.
+
+    :param mode: "r" to read, "r+" to also write existing records and append, "w" to start from an empty file.
+
+    Usage:
+        with PodFile(Account, "snapshot.bin") as accounts:
+            account = accounts[1000]
+    """
+
+    def __init__(self, type_, path, mode="r", **kwargs):
+        if mode not in _MODES:
+            raise ValueError(f"Mode must be one of {list(_MODES)}, found {mode}")
+
+        self._type = type_
+        self._kwargs = kwargs
+        self._tag_type = FORMAT_TO_TYPE[FORMAT_ZERO_COPY]
+        if not _is_fixed_size(type_, self._tag_type):
+            raise ValueError(
+                f"Records of {type_} do not have a fixed size in the zero-copy format"
+            )
+        with AutoTagTypeValueManager(self._tag_type):
+            self._stride = BYTES_CATALOG.calc_max_size(type_)
+
+        file_mode, self._access = _MODES[mode]
+        self._file = open(path, file_mode)
+        self._mmap = None
+        try:
+            self._map()
+        except Exception:
+            self._file.close()
+            raise
+
+    def _map(self):
+        size = os.fstat(self._file.fileno()).st_size
+        if size % self._stride:
+            raise ValueError(
+                f"File size {size} is not a multiple of the record size {self._stride}"
+            )
+
+        self._length = size // self._stride
+        # empty files cannot be mapped
+        if size:
+            self._mmap = mmap.mmap(self._file.fileno(), size, access=self._access)
+
+    def _unmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _check_writable(self):
+        if self._access == mmap.ACCESS_READ:
+            raise io.UnsupportedOperation("PodFile was opened for reading only")
+
+    def _index(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("PodFile index out of range")
+        return index
+
+    def _decode(self, index):
+        start = index * self._stride
+        buffer = BytesIO(self._mmap[start : start + self._stride])
+        with AutoTagTypeValueManager(self._tag_type):
+            return BYTES_CATALOG.unpack_partial(
+                self._type, buffer, format=FORMAT_ZERO_COPY, **self._kwargs
+            )
+
+    def _encode(self, objs):
+        """
+        Returns the records of objs encoded back-to-back, so a record that fails to encode leaves the file unchanged.
+        """
+        raw = bytearray(len(objs) * self._stride)
+        for i, obj in enumerate(objs):
+            size = BYTES_CATALOG.pack_into(
+                self._type,
+                raw,
+                i * self._stride,
+                obj,
+                format=FORMAT_ZERO_COPY,
+                **self._kwargs,
+            )
+            if size != self._stride:
+                raise ValueError(
+                    f"Record {i} takes {size} bytes instead of {self._stride}"
+                )
+
+        return raw
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    @property
+    def record_size(self) -> int:
+        return self._stride
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return [self._decode(i) for i in range(start, stop, step)]
+
+            return LazyArray(
+                self._type,
+                _FileBytes(self),
+                max(stop - start, 0),
+                self._stride,
+                self._tag_type,
+                {"format": FORMAT_ZERO_COPY, **self._kwargs},
+                start * self._stride,
+            )
+
+        return self._decode(self._index(index))
+
+    def __setitem__(self, index, obj):
+        self._check_writable()
+        if isinstance(index, slice):
+            indices = range(*index.indices(self._length))
+            objs = list(obj)
+            if len(objs) != len(indices):
+                raise ValueError(
+                    f"Cannot assign {len(objs)} records to a slice of {len(indices)}"
+                )
+        else:
+            indices = [self._index(index)]
+            objs = [obj]
+
+        raw = self._encode(objs)
+        stride = self._stride
+        for i, offset in zip(indices, range(0, len(raw), stride)):
+            self._mmap[i * stride : (i + 1) * stride] = raw[offset : offset + stride]
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield self._decode(i)
+
+    def append(self, obj):
+        self.extend([obj])
+
+    def extend(self, objs):
+        """
+        Appends objs to the end of the file, growing it once. The file is left unchanged if any of them fails.
+        """
+        self._check_writable()
+        raw = self._encode(list(objs))
+        if not raw:
+            return
+
+        start = self._length * self._stride
+        self._unmap()
+        try:
+            self._file.truncate(start + len(raw))
+            self._map()
+            self._mmap[start:] = raw
+        except BaseException:
+            self._unmap()
+            self._file.truncate(start)
+            self._map()
+            raise
+
+    def flush(self):
+        if self._mmap is not None and self._access != mmap.ACCESS_READ:
+            self._mmap.flush()
+
+    def close(self):
+        """
+        Flushes written records and closes the file.
+        """
+        if self.closed:
+            return
+
+        try:
+            self.flush()
+            self._unmap()
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return f"PodFile[{self._type}, {self._length}]"
@@ -0,0 +1,218 @@
+"""
+Length-prefixed framing of encoded records for stream transports (e.g., sockets).
+
+A frame is the size of the payload encoded as prefix_type (an unsigned integer type such as U16, U32b or U64l)
+followed by the payload.
+"""
+import struct
+from io import BytesIO
+
+from .bytes import BYTES_CATALOG
+from .types.atomic import U32
+from ._utils import (
+    FORMAT_BORSH,
+    FORMAT_ZERO_COPY,
+    FORMAT_TO_TYPE,
+    AutoTagTypeValueManager,
+)
+
+_PREFIX_CODES = "BHIQ"
+
+
+def _prefix_struct(prefix_type):
+    get_code = getattr(prefix_type, "_get_code", None)
+    code = get_code() if get_code is not None else ""
+    if not code or code[-1] not in _PREFIX_CODES:
+        raise ValueError(
+            f"Prefix type must be an unsigned integer type, found {prefix_type}"
+        )
+    return struct.Struct(code)
+
+
+def frame_encode(type_, obj, prefix_type=U32, format=FORMAT_BORSH, **kwargs) -> bytes:
+    """
+    Encodes obj and returns it as a frame. The payload is written right after room left for the prefix, so it is
+    not copied to prepend the prefix.
+    """
+    if format not in FORMAT_TO_TYPE:
+        raise ValueError(
+            f"Format argument must be {FORMAT_BORSH} or {FORMAT_ZERO_COPY}, found {format}"
+        )
+    prefix = _prefix_struct(prefix_type)
+
+    buffer = BytesIO()
+    buffer.write(bytes(prefix.size))
+    with AutoTagTypeValueManager(FORMAT_TO_TYPE[format]):
+        BYTES_CATALOG.pack_partial(type_, buffer, obj, format=format, **kwargs)
+
+    size = buffer.tell() - prefix.size
+    if size >= 1 << (8 * prefix.size):
+        raise ValueError(f"Payload of {size} bytes does not fit in {prefix_type}")
+
+    frame = buffer.getbuffer()
+    prefix.pack_into(frame, 0, size)
+    del frame
+
+    return buffer.getvalue()
+
+
+def frame_decode(type_, frame, prefix_type=U32, format=FORMAT_BORSH, **kwargs):
+    """
+    Decodes the payload of a single complete frame.
+    """
+    prefix = _prefix_struct(prefix_type)
+    (size,) = prefix.unpack_from(frame)
+    if len(frame) != prefix.size + size:
+        raise ValueError(
+            f"Frame length is {len(frame)}, but its prefix expects {prefix.size + size}"
+        )
+
+    payload = memoryview(frame)[prefix.size :]
+    return BYTES_CATALOG.unpack(type_, payload, checked=True, format=format, **kwargs)
+
+
+class Deframer:
+    """
+    Splits the bytes received from a stream into the payloads of frames.
+
+    Payloads are returned as memoryviews over the received chunks, so a frame that is received within a single
+    chunk is never copied. A frame split across chunks is copied once into a buffer allocated when its prefix is
+    received.
+
+    :param max_frame_size: payloads larger than this raise a ValueError, to protect against corrupt prefixes.
+    """
+
+    def __init__(self, prefix_type=U32, max_frame_size=None):
+        self._prefix = _prefix_struct(prefix_type)
+        self._max_frame_size = max_frame_size
+        self._head = bytearray()  # the received bytes of an incomplete prefix
+        self._frame = (
+            None  # the payload of an incomplete frame, allocated once its size is known
+        )
+        self._filled = 0
+
+    @property
+    def needed(self) -> int:
+        """
+        The number of bytes that must still be fed to complete the next prefix or frame.
+        """
+        if self._frame is not None:
+            return len(self._frame) - self._filled
+        return self._prefix.size - len(self._head)
+
+    @property
+    def pending(self) -> int:
+        """
+        The number of received bytes that are not part of a returned frame.
+        """
+        if self._frame is not None:
+            return self._prefix.size + self._filled
+        return len(self._head)
+
+    def _read_prefix(self, data, pos):
+        (size,) = self._prefix.unpack_from(data, pos)
+        if self._max_frame_size is not None and size > self._max_frame_size:
+            raise ValueError(
+                f"Frame of {size} bytes exceeds the maximum of {self._max_frame_size}"
+            )
+        return size
+
+    def _fill(self, data, pos):
+        # copies the bytes of the incomplete frame from data, and returns the position after them
+        take = min(len(self._frame) - self._filled, len(data) - pos)
+        self._frame[self._filled : self._filled + take] = data[pos : pos + take]
+        self._filled += take
+        return pos + take
+
+    def feed(self, chunk) -> list:
+        """
+        Appends chunk to the received bytes and returns the payloads of the frames it completes, in order.
+        """
+        data = memoryview(chunk)
+        prefix_size = self._prefix.size
+
+        payloads = []
+        pos = 0
+        if self._head:
+            take = min(prefix_size - len(self._head), len(data))
+            self._head += data[:take]
+            pos = take
+            if len(self._head) < prefix_size:
+                return payloads
+
+            self._frame = bytearray(self._read_prefix(self._head, 0))
+            self._filled = 0
+            self._head = bytearray()
+
+        if self._frame is not None:
+            pos = self._fill(data, pos)
+            if self._filled < len(self._frame):
+                return payloads
+
+            payloads.append(memoryview(self._frame))
+            self._frame = None
+
+        while len(data) - pos >= prefix_size:
+            size = self._read_prefix(data, pos)
+            end = pos + prefix_size + size
+            if end > len(data):
+                self._frame = bytearray(size)
+                self._filled = 0
+                self._fill(data, pos + prefix_size)
+                return payloads
+
+            payloads.append(data[pos + prefix_size : end])
+            pos = end
+
+        self._head += data[pos:]
+        return payloads
+
+
+def iter_frames(fileobj, prefix_type=U32, chunk_size=1 << 16, max_frame_size=None):
+    """
+    Lazily yields the payloads of the frames read from the binary file-like fileobj until its end.
+    """
+    deframer = Deframer(prefix_type, max_frame_size)
+    while True:
+        chunk = fileobj.read(max(chunk_size, deframer.needed))
+        if not chunk:
+            if deframer.pending:
+                raise EOFError(
+                    f"The stream ended {deframer.needed} bytes before the end of the frame"
+                )
+            return
+
+        yield from deframer.feed(chunk)
+
+
+async def read_frame(reader, prefix_type=U32, max_frame_size=None) -> bytes:
+    """
+    Reads the payload of one frame from the `asyncio.StreamReader` reader, consuming only the bytes of the frame.
+    """
+    prefix = _prefix_struct(prefix_type)
+    (size,) = prefix.unpack(await reader.readexactly(prefix.size))
+    if max_frame_size is not None and size > max_frame_size:
+        raise ValueError(
+            f"Frame of {size} bytes exceeds the maximum of {max_frame_size}"
+        )
+    return await reader.readexactly(size)
+
+
+async def aiter_frames(
+    reader, prefix_type=U32, chunk_size=1 << 16, max_frame_size=None
+):
+    """
+    Asynchronously yields the payloads of the frames read from the `asyncio.StreamReader` reader until its end.
+    """
+    deframer = Deframer(prefix_type, max_frame_size)
+    while True:
+        chunk = await reader.read(max(chunk_size, deframer.needed))
+        if not chunk:
+            if deframer.pending:
+                raise EOFError(
+                    f"The stream ended {deframer.needed} bytes before the end of the frame"
+                )
+            return
+
+        for payload in deframer.feed(chunk):
+            yield payload
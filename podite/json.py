@@ -1,8 +1,13 @@
+import base64
+import binascii
 import json
+import threading
 
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
 from dataclasses import is_dataclass, fields, MISSING
-from typing import Dict, Callable, Any
+from functools import partial
+from typing import Dict, Callable, Any, Optional, Tuple
 
 from ._utils import resolve_name_mapping
 from .core import PodConverterCatalog, POD_SELF_CONVERTER
@@ -10,8 +15,163 @@ from .core import PodConverterCatalog, POD_SELF_CONVERTER
 TO_DICT = "_to_dict"
 FROM_DICT = "_from_dict"
 
+# marks types whose json representation is the object itself
+JSON_IDENTITY = "__pod_json_identity__"
+JSON_PLANS = "__pod_json_plans__"
+GET_JSON_PLANS = "_get_json_plans"
+
+_IDENTITY_TYPES = (int, str, bool, object)
+
 POD_OPTIONS_RENAME = "rename"
 
+# records are written without whitespace to keep them on a single line
+_NDJSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+_NDJSON_DECODER = json.JSONDecoder()
+
+
+BYTES_ENCODING_LIST = "list"
+BYTES_ENCODING_HEX = "hex"
+BYTES_ENCODING_BASE64 = "base64"
+BYTES_ENCODING_BASE58 = "base58"
+BYTES_ENCODINGS = (
+    BYTES_ENCODING_LIST,
+    BYTES_ENCODING_HEX,
+    BYTES_ENCODING_BASE64,
+    BYTES_ENCODING_BASE58,
+)
+
+_BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_BASE58_INDEX = {c: i for i, c in enumerate(_BASE58_ALPHABET)}
+
+
+def b58encode(raw: bytes) -> str:
+    value = int.from_bytes(raw, "big")
+    digits = []
+    while value:
+        value, digit = divmod(value, 58)
+        digits.append(_BASE58_ALPHABET[digit])
+
+    zeros = len(raw) - len(raw.lstrip(b"\x00"))
+    return "1" * zeros + "".join(reversed(digits))
+
+
+def b58decode(encoded: str) -> bytes:
+    value = 0
+    for c in encoded:
+        try:
+            value = value * 58 + _BASE58_INDEX[c]
+        except KeyError:
+            raise ValueError(f"Invalid base58 character {c!r}") from None
+
+    zeros = len(encoded) - len(encoded.lstrip("1"))
+    return bytes(zeros) + value.to_bytes((value.bit_length() + 7) // 8, "big")
+
+
+def check_bytes_encoding(encoding):
+    if encoding not in BYTES_ENCODINGS:
+        raise ValueError(
+            f"Bytes encoding must be one of {BYTES_ENCODINGS}, found {encoding}"
+        )
+
+
+class _EncodingState(threading.local):
+    encoding = None  # None until a thread sets it
+
+
+class BytesJsonEncodingManager:
+    """
+    Sets the json representation of byte fields whose type does not fix one for the current thread, e.g.,
+    `with BytesJsonEncodingManager("hex"): ...`.
+    """
+
+    ENCODING = [BYTES_ENCODING_LIST]  # mutable static var, the default
+    _STATE = _EncodingState()
+
+    @staticmethod
+    def get_encoding():
+        encoding = BytesJsonEncodingManager._STATE.encoding
+        if encoding is None:
+            return BytesJsonEncodingManager.ENCODING[0]
+        return encoding
+
+    def __init__(self, encoding):
+        check_bytes_encoding(encoding)
+        self._encoding = encoding
+
+    def __enter__(self):
+        state = BytesJsonEncodingManager._STATE
+        self.old = state.encoding
+        state.encoding = self._encoding
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        BytesJsonEncodingManager._STATE.encoding = self.old
+
+
+def bytes_json_encoding(encoding=None):
+    """
+    Returns a context manager setting the json representation of bytes, which does nothing if encoding is None.
+    """
+    if encoding is None:
+        return nullcontext()
+    return BytesJsonEncodingManager(encoding)
+
+
+def bytes_to_json(raw: bytes, encoding=None):
+    """
+    Returns the json representation of raw as a list of ints or a string. When encoding is None, the one set by
+    `BytesJsonEncodingManager` is used.
+    """
+    if encoding is None:
+        encoding = BytesJsonEncodingManager.get_encoding()
+
+    if encoding == BYTES_ENCODING_LIST:
+        return list(raw)
+    if encoding == BYTES_ENCODING_HEX:
+        return raw.hex()
+    if encoding == BYTES_ENCODING_BASE64:
+        return base64.b64encode(raw).decode("ascii")
+    if encoding == BYTES_ENCODING_BASE58:
+        return b58encode(raw)
+
+    raise ValueError(
+        f"Bytes encoding must be one of {BYTES_ENCODINGS}, found {encoding}"
+    )
+
+
+def bytes_from_json(obj, encoding=None) -> bytes:
+    """
+    Inverse of `bytes_to_json`. Lists of ints are always accepted.
+    """
+    if not isinstance(obj, str):
+        return bytes(obj)
+
+    if encoding is None:
+        encoding = BytesJsonEncodingManager.get_encoding()
+
+    if encoding == BYTES_ENCODING_HEX:
+        return bytes.fromhex(obj)
+    if encoding == BYTES_ENCODING_BASE64:
+        try:
+            return base64.b64decode(obj, validate=True)
+        except binascii.Error as e:
+            raise ValueError(str(e)) from e
+    if encoding == BYTES_ENCODING_BASE58:
+        return b58decode(obj)
+
+    raise ValueError(f"Expected a list of ints for bytes, found {obj!r}")
+
+
+def _iter_ndjson(fileobj, unpack, bytes_encoding, kwargs):
+    decode = _NDJSON_DECODER.decode
+    for line in fileobj:
+        if line.strip():
+            raw = decode(line)
+            if unpack is not None:
+                # not held across yields, which would leak into the caller
+                with bytes_json_encoding(bytes_encoding):
+                    raw = unpack(raw, **kwargs)
+            yield raw
+
 
 class JsonPodConverter(ABC):
     @abstractmethod
@@ -37,7 +197,47 @@ class SelfJsonPodConverter(JsonPodConverter):
         return getattr(type_, FROM_DICT)(obj, **kwargs)
 
 
+def is_json_identity(type_) -> bool:
+    """
+    Returns True if objects of type_ are converted to and from json as they are.
+    """
+    if type_ in _IDENTITY_TYPES:
+        return True
+    return isinstance(type_, type) and type_.__dict__.get(JSON_IDENTITY, False)
+
+
+def uses_json_plans(type_) -> bool:
+    """
+    Returns True if type_ is a dataclass whose json conversion is given by its compiled plans (i.e., neither
+    `_to_dict` nor `_from_dict` is customized).
+    """
+    for name in (TO_DICT, FROM_DICT):
+        method = getattr(type_, name, None)
+        if not getattr(getattr(method, "__func__", None), JSON_PLANS, False):
+            return False
+    return True
+
+
 class JsonPodConverterCatalog(PodConverterCatalog[JsonPodConverter]):
+    def get_packers(
+        self, type_
+    ) -> Tuple[Optional[Callable[[Any], Any]], Optional[Callable[[Any], Any]]]:
+        """
+        Resolves the converter of type_ once and returns single argument functions to pack and unpack its objects,
+        or (None, None) when they are converted as they are.
+        """
+        if is_json_identity(type_):
+            return None, None
+
+        error_msg = "No converter was able to pack raw data"
+        converter = self._get_converter_or_raise(type_, error_msg)
+        if isinstance(converter, SelfJsonPodConverter):
+            return getattr(type_, TO_DICT), getattr(type_, FROM_DICT)
+
+        return partial(converter.pack_dict, type_), partial(
+            converter.unpack_dict, type_
+        )
+
     def pack(self, type_, obj, **kwargs):
         error_msg = "No converter was able to pack raw data"
         converter = self._get_converter_or_raise(type_, error_msg)
@@ -51,28 +251,58 @@ class JsonPodConverterCatalog(PodConverterCatalog[JsonPodConverter]):
     def generate_helpers(self, type_) -> Dict[str, classmethod]:
         helpers = super().generate_helpers(type_)
 
-        def to_dict(cls, obj, **kwargs):
-            return cls.pack(obj, converter="json", **kwargs)
+        def to_dict(cls, obj, bytes_encoding=None, **kwargs):
+            with bytes_json_encoding(bytes_encoding):
+                return cls.pack(obj, converter="json", **kwargs)
 
         def to_dict_file(cls, filename, obj, /, mode="w", **kwargs):
-            with open(filename, mode) as fin:
-                obj = cls.to_dict(obj, **kwargs)
-                print(obj, file=fin)
+            with open(filename, mode) as fout:
+                json.dump(cls.to_dict(obj, **kwargs), fout)
 
-        def from_dict(cls, raw, **kwargs):
-            return cls.unpack(raw, converter="json", **kwargs)
+        def from_dict(cls, raw, bytes_encoding=None, **kwargs):
+            with bytes_json_encoding(bytes_encoding):
+                return cls.unpack(raw, converter="json", **kwargs)
 
         def from_dict_file(cls, filename, /, **kwargs):
             with open(filename, "r") as fin:
                 raw = json.load(fin)
                 return cls.from_dict(raw, **kwargs)
 
+        def to_ndjson(cls, objs, fileobj, /, bytes_encoding=None, **kwargs):
+            """
+            Writes each object of the iterable objs to fileobj as one line of json and returns the number of lines.
+            """
+            pack, _ = self.get_packers(cls)
+            encode = _NDJSON_ENCODER.encode
+
+            count = 0
+            with bytes_json_encoding(bytes_encoding):
+                for obj in objs:
+                    raw = obj if pack is None else pack(obj, **kwargs)
+                    fileobj.write(encode(raw))
+                    fileobj.write("\n")
+                    count += 1
+
+            return count
+
+        def iter_ndjson(cls, fileobj, /, bytes_encoding=None, **kwargs):
+            """
+            Lazily yields the objects stored in fileobj as one line of json each. Blank lines are skipped.
+            """
+            if bytes_encoding is not None:
+                check_bytes_encoding(bytes_encoding)
+            _, unpack = self.get_packers(cls)
+            return _iter_ndjson(fileobj, unpack, bytes_encoding, kwargs)
+
         helpers["to_dict"] = classmethod(to_dict)
         helpers["to_dict_file"] = classmethod(to_dict_file)
 
         helpers["from_dict"] = classmethod(from_dict)
         helpers["from_dict_file"] = classmethod(from_dict_file)
 
+        helpers["to_ndjson"] = classmethod(to_ndjson)
+        helpers["iter_ndjson"] = classmethod(iter_ndjson)
+
         if is_dataclass(type_):
             helpers.update(self._generate_packers(type_))
 
@@ -85,32 +315,58 @@ class JsonPodConverterCatalog(PodConverterCatalog[JsonPodConverter]):
         rename_fn = options.get(POD_OPTIONS_RENAME, lambda x: x)
         rename_fn = resolve_name_mapping(rename_fn)
 
+        def _get_plans(cls):
+            # compiled on first use as field types may be forward references
+            plans = cls.__dict__.get(JSON_PLANS)
+            if plans is None:
+                to_plan, from_plan, types = [], [], []
+                for field in fields(cls):
+                    key = rename_fn(field.name)
+                    field_type = cls._get_field_type(field.type)
+                    pack, unpack = self.get_packers(field_type)
+                    has_default = (
+                        field.default is not MISSING
+                        or field.default_factory is not MISSING
+                    )
+                    to_plan.append((field.name, key, pack))
+                    from_plan.append((field.name, key, has_default, unpack))
+                    types.append(field_type)
+
+                plans = (to_plan, from_plan, types)
+                setattr(cls, JSON_PLANS, plans)
+
+            return plans
+
         def _to_dict(cls, obj):
+            to_plan, _, _ = _get_plans(cls)
+
             values = {}
-            for field in fields(cls):
-                value = getattr(obj, field.name)
-                values[rename_fn(field.name)] = self.pack(
-                    cls._get_field_type(field.type), value
-                )
+            for name, key, pack in to_plan:
+                value = getattr(obj, name)
+                values[key] = value if pack is None else pack(value)
 
             return values
 
         def _from_dict(cls, obj, **kwargs):
+            _, from_plan, _ = _get_plans(cls)
+
             values = {}
-            for field in fields(cls):
-                field_value = obj.get(rename_fn(field.name), MISSING)
-                has_default = (
-                    field.default is not MISSING or field.default_factory is not MISSING
-                )
+            for name, key, has_default, unpack in from_plan:
+                field_value = obj.get(key, MISSING)
                 if field_value is not MISSING or not has_default:
-                    values[field.name] = self.unpack(
-                        cls._get_field_type(field.type), field_value
+                    values[name] = (
+                        field_value if unpack is None else unpack(field_value)
                     )
+
             return cls(**values)
 
+        setattr(_to_dict, JSON_PLANS, True)
+        setattr(_from_dict, JSON_PLANS, True)
+
         return {
             TO_DICT: classmethod(_to_dict),
             FROM_DICT: classmethod(_from_dict),
+            GET_JSON_PLANS: classmethod(_get_plans),
         }
 
 
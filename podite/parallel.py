@@ -0,0 +1,541 @@
+"""
+Decoding and encoding of many records across a pool of worker processes.
+
+Records are shipped to workers in chunks: the encoded records of a chunk are concatenated into a single bytes object
+with their offsets, so pickling costs one copy of the bytes instead of one object per record. `decode_shared` avoids
+even that by placing the records in shared memory, from which workers decode their ranges directly.
+"""
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from multiprocessing.shared_memory import SharedMemory
+
+from .bytes import BYTES_CATALOG
+from .columns import get_column_types, get_typecode, unpack_columns
+from ._utils import (
+    FORMAT_AUTO,
+    FORMAT_BORSH,
+    FORMAT_ZERO_COPY,
+    FORMAT_TO_TYPE,
+    AutoTagTypeValueManager,
+)
+
+# chunks smaller than this do not amortize the cost of submitting them
+MIN_CHUNK_SIZE = 256
+CHUNKS_PER_WORKER = 4
+
+
+def _default_workers():
+    return os.cpu_count() or 1
+
+
+def _calc_chunk_size(count, workers, chunk_size):
+    if chunk_size is not None:
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, found {chunk_size}")
+        return chunk_size
+
+    per_chunk = -(-count // (workers * CHUNKS_PER_WORKER))
+    return max(per_chunk, MIN_CHUNK_SIZE)
+
+
+def _pack_chunk(buffers):
+    offsets = array("Q", [0])
+    for raw in buffers:
+        offsets.append(offsets[-1] + len(raw))
+    return b"".join(buffers), offsets
+
+
+def _unpack_chunk(raw, offsets):
+    view = memoryview(raw)
+    return [view[offsets[i] : offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+def _decode_chunk(type_, raw, offsets, format, kwargs):
+    return [
+        BYTES_CATALOG.unpack(type_, BytesIO(buffer), format=format, **kwargs)
+        for buffer in _unpack_chunk(raw, offsets)
+    ]
+
+
+def _encode_chunk(type_, objs, format, kwargs):
+    return _pack_chunk(
+        [BYTES_CATALOG.pack(type_, obj, format=format, **kwargs) for obj in objs]
+    )
+
+
+def _map_chunks(fn, chunks, workers, executor, executor_cls=ProcessPoolExecutor):
+    if executor is not None:
+        return executor.map(fn, *zip(*chunks)) if chunks else []
+
+    with executor_cls(workers) as executor:
+        return list(executor.map(fn, *zip(*chunks)))
+
+
+def _encode_chunks(type_, objs, workers, chunk_size, format, executor, kwargs):
+    if executor is None and (workers == 1 or len(objs) <= chunk_size):
+        return [_encode_chunk(type_, objs, format, kwargs)]
+
+    chunks = [
+        (type_, objs[i : i + chunk_size], format, kwargs)
+        for i in range(0, len(objs), chunk_size)
+    ]
+    return _map_chunks(_encode_chunk, chunks, workers, executor)
+
+
+def _imap_chunks(fn, chunks, workers, executor, executor_cls=ProcessPoolExecutor):
+    """
+    Yields the results of fn for each of chunks in order, submitting at most `CHUNKS_PER_WORKER` chunks per worker
+    ahead of the one being consumed, so that results do not pile up when they are consumed slower than produced.
+    """
+
+    def run(executor):
+        pending = deque()
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(fn, *chunk))
+                if len(pending) >= workers * CHUNKS_PER_WORKER:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    if executor is not None:
+        yield from run(executor)
+        return
+
+    with executor_cls(workers) as executor:
+        yield from run(executor)
+
+
+def decode_many(
+    type_,
+    buffers,
+    workers=None,
+    chunk_size=None,
+    format=FORMAT_AUTO,
+    executor=None,
+    **kwargs,
+) -> list:
+    """
+    Decodes each encoded record of buffers as type_ in a pool of worker processes and returns the records in order.
+
+    :param workers: the number of processes, which defaults to the number of CPUs. With a single worker (or a single
+        chunk), records are decoded in the current process.
+    :param chunk_size: the number of records sent to a worker at once, which defaults to splitting buffers into
+        `CHUNKS_PER_WORKER` chunks per worker of at least `MIN_CHUNK_SIZE` records.
+    :param executor: an existing `concurrent.futures.Executor` to reuse instead of starting a pool for this call.
+    """
+    buffers = list(buffers)
+    workers = workers or _default_workers()
+    chunk_size = _calc_chunk_size(len(buffers), workers, chunk_size)
+
+    if executor is None and (workers == 1 or len(buffers) <= chunk_size):
+        return _decode_chunk(type_, *_pack_chunk(buffers), format, kwargs)
+
+    chunks = [
+        (type_, *_pack_chunk(buffers[i : i + chunk_size]), format, kwargs)
+        for i in range(0, len(buffers), chunk_size)
+    ]
+
+    results = []
+    for records in _map_chunks(_decode_chunk, chunks, workers, executor):
+        results.extend(records)
+    return results
+
+
+def encode_many(
+    type_,
+    objs,
+    workers=None,
+    chunk_size=None,
+    format=FORMAT_BORSH,
+    concat=False,
+    executor=None,
+    **kwargs,
+):
+    """
+    Encodes each of objs as type_ in a pool of worker processes. Returns the list of encoded records in order, or
+    their concatenation if concat is True (see `encode_into` to encode them into a single buffer directly). The
+    other arguments are as in `decode_many`.
+    """
+    objs = list(objs)
+    workers = workers or _default_workers()
+    chunk_size = _calc_chunk_size(len(objs), workers, chunk_size)
+    encoded = _encode_chunks(type_, objs, workers, chunk_size, format, executor, kwargs)
+
+    if concat:
+        return b"".join(raw for raw, _ in encoded)
+
+    results = []
+    for raw, offsets in encoded:
+        results.extend(bytes(buffer) for buffer in _unpack_chunk(raw, offsets))
+    return results
+
+
+def _record_bounds(type_, size, offsets, format):
+    """
+    Returns the positions of the starts of the records in a buffer of size bytes, followed by its end.
+    """
+    if offsets is not None:
+        bounds = array("Q", offsets)
+        if any(a > b for a, b in zip(bounds, bounds[1:])) or (
+            bounds and bounds[-1] > size
+        ):
+            raise ValueError("Offsets must be increasing and within the buffer")
+        bounds.append(size)
+        return bounds
+
+    if format not in (FORMAT_BORSH, FORMAT_ZERO_COPY):
+        raise ValueError(
+            f"Records without offsets need format {FORMAT_BORSH} or {FORMAT_ZERO_COPY}, found {format}"
+        )
+
+    with AutoTagTypeValueManager(FORMAT_TO_TYPE[format]):
+        if not BYTES_CATALOG.is_static(type_):
+            raise ValueError(f"Records of {type_} do not have a fixed size")
+        stride = BYTES_CATALOG.calc_max_size(type_)
+
+    if size % stride:
+        raise ValueError(
+            f"Buffer size {size} is not a multiple of the record size {stride}"
+        )
+    # ranges pickle as their start, stop and step
+    return range(0, size + 1, stride)
+
+
+def _views(view, bounds):
+    return [view[bounds[i] : bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+
+def _decode_range(view, type_, bounds, format, kwargs):
+    return [
+        BYTES_CATALOG.unpack(type_, BytesIO(record), format=format, **kwargs)
+        for record in _views(view, bounds)
+    ]
+
+
+def _column_layout(column_types, count):
+    """
+    Returns the typecode and position in the output block of each column that fits an `array.array`, and the size
+    of the block.
+    """
+    layout = {}
+    size = 0
+    for path, leaf in column_types.items():
+        typecode = get_typecode(leaf)
+        if typecode is not None:
+            layout[path] = (typecode, size)
+            size += array(typecode).itemsize * count
+
+    return layout, size
+
+
+def _close(shm):
+    try:
+        shm.close()
+    except BufferError:
+        # views of the block are still referenced by the traceback of an error being raised, the block is unmapped
+        # once they are released
+        pass
+
+
+def _decode_shared_range(name, type_, bounds, format, kwargs, out_name, layout, first):
+    shm = SharedMemory(name=name)
+    try:
+        if out_name is None:
+            return _decode_range(shm.buf, type_, bounds, format, kwargs)
+
+        columns = unpack_columns(
+            type_, _views(shm.buf, bounds), format=format, **kwargs
+        )
+    finally:
+        _close(shm)
+
+    out = SharedMemory(name=out_name)
+    try:
+        for path, (typecode, start) in layout.items():
+            column = columns.pop(path)
+            start += first * column.itemsize
+            out.buf[start : start + len(column) * column.itemsize] = column.tobytes()
+    finally:
+        out.close()
+
+    # the columns that do not fit an array.array are returned as lists
+    return columns
+
+
+def decode_shared(
+    type_,
+    raw,
+    offsets=None,
+    workers=None,
+    chunk_size=None,
+    format=FORMAT_AUTO,
+    columns=False,
+    executor=None,
+    **kwargs,
+):
+    """
+    Decodes the records of type_ encoded back-to-back in raw in a pool of worker processes. raw is copied once into
+    shared memory, from which each worker decodes its range of records, so records are not pickled to workers.
+
+    :param offsets: the positions at which records start in raw. If None, records must all have the size of a
+        static type_ in the given format (which must then be FORMAT_BORSH or FORMAT_ZERO_COPY).
+    :param columns: if True, returns the values of the leaf fields as columns keyed by field path, as
+        `unpack_columns` does. Columns that fit an `array.array` are written by workers into a second shared
+        block instead of being pickled back.
+
+    The other arguments are as in `decode_many`.
+    """
+    bounds = _record_bounds(type_, len(raw), offsets, format)
+    count = len(bounds) - 1
+    workers = workers or _default_workers()
+    chunk_size = _calc_chunk_size(count, workers, chunk_size)
+
+    if executor is None and (workers == 1 or count <= chunk_size):
+        view = memoryview(raw)
+        if columns:
+            return unpack_columns(type_, _views(view, bounds), format=format, **kwargs)
+        return _decode_range(view, type_, bounds, format, kwargs)
+
+    column_types = get_column_types(type_)
+    layout, out_size = _column_layout(column_types, count) if columns else ({}, 0)
+
+    # empty blocks cannot be created
+    shm = SharedMemory(create=True, size=max(len(raw), 1))
+    out = SharedMemory(create=True, size=max(out_size, 1)) if columns else None
+    try:
+        shm.buf[: len(raw)] = raw
+        out_name = out.name if columns else None
+        chunks = [
+            (
+                shm.name,
+                type_,
+                bounds[i : i + chunk_size + 1],
+                format,
+                kwargs,
+                out_name,
+                layout,
+                i,
+            )
+            for i in range(0, count, chunk_size)
+        ]
+        results = list(_map_chunks(_decode_shared_range, chunks, workers, executor))
+
+        if not columns:
+            records = []
+            for chunk in results:
+                records.extend(chunk)
+            return records
+
+        decoded = {}
+        for path in column_types:
+            if path in layout:
+                typecode, start = layout[path]
+                column = array(typecode)
+                column.frombytes(out.buf[start : start + column.itemsize * count])
+            else:
+                column = []
+                for chunk in results:
+                    column.extend(chunk[path])
+            decoded[path] = column
+
+        return decoded
+    finally:
+        shm.close()
+        shm.unlink()
+        if out is not None:
+            out.close()
+            out.unlink()
+
+
+def calc_offsets(type_, objs, format=FORMAT_BORSH, **kwargs):
+    """
+    Returns the positions at which each of objs starts when encoded back-to-back as type_, followed by the total
+    size, i.e., the prefix sums of their sizes.
+
+    In the zero-copy format, the sizes of records of dynamic size include padding (e.g., of enums and Optionals) that
+    `calc_size` does not account for, so such records are encoded to measure them.
+    """
+    if format not in (FORMAT_BORSH, FORMAT_ZERO_COPY):
+        raise ValueError(
+            f"Format argument must be {FORMAT_BORSH} or {FORMAT_ZERO_COPY}, found {format}"
+        )
+
+    with AutoTagTypeValueManager(FORMAT_TO_TYPE[format]):
+        if BYTES_CATALOG.is_static(type_):
+            stride = BYTES_CATALOG.calc_max_size(type_)
+            return array("Q", range(0, (len(objs) + 1) * stride, stride))
+
+        offsets = array("Q", [0])
+        total = 0
+        for obj in objs:
+            if format == FORMAT_ZERO_COPY:
+                total += len(BYTES_CATALOG.pack(type_, obj, format=format, **kwargs))
+            else:
+                total += BYTES_CATALOG.calc_size(type_, obj, **kwargs)
+            offsets.append(total)
+
+    return offsets
+
+
+def _is_dynamic_zero_copy(type_, format):
+    if format != FORMAT_ZERO_COPY:
+        return False
+    with AutoTagTypeValueManager(FORMAT_TO_TYPE[format]):
+        return not BYTES_CATALOG.is_static(type_)
+
+
+def _encode_range(buffer, type_, objs, offsets, format, kwargs):
+    view = memoryview(buffer)
+    for i, obj in enumerate(objs):
+        start, end = offsets[i], offsets[i + 1]
+        # encoding to bytes and copying them into the slot is faster than writing through a BufferWriter
+        encoded = BYTES_CATALOG.pack(type_, obj, format=format, **kwargs)
+        if len(encoded) != end - start:
+            raise RuntimeError(
+                f"Encoded {len(encoded)} bytes for record {i}, but its size was calculated as {end - start}"
+            )
+        view[start:end] = encoded
+
+
+def _place_chunk(view, start, raw, chunk_offsets, offsets):
+    """
+    Copies the records of an encoded chunk, the first of which is record start, into their slots in view.
+    """
+    base = offsets[start]
+    count = len(chunk_offsets) - 1
+    if all(offsets[start + j] - base == chunk_offsets[j] for j in range(count + 1)):
+        view[base : base + len(raw)] = raw
+        return
+
+    raw = memoryview(raw)
+    for j in range(count):
+        i = start + j
+        size = chunk_offsets[j + 1] - chunk_offsets[j]
+        if size != offsets[i + 1] - offsets[i]:
+            raise RuntimeError(
+                f"Encoded {size} bytes for record {i}, but its size was calculated as {offsets[i + 1] - offsets[i]}"
+            )
+        view[offsets[i] : offsets[i + 1]] = raw[chunk_offsets[j] : chunk_offsets[j + 1]]
+
+
+def _append_chunks(buffer, encoded):
+    """
+    Writes the encoded chunks back-to-back into buffer, or a new bytearray if None, and returns it.
+    """
+    if buffer is None:
+        buffer = bytearray()
+        for raw, _ in encoded:
+            buffer += raw
+        return buffer
+
+    view = memoryview(buffer)
+    pos = 0
+    for raw, _ in encoded:
+        end = pos + len(raw)
+        if end > view.nbytes:
+            raise ValueError(
+                f"Buffer length is {view.nbytes}, but the records require more"
+            )
+        view[pos:end] = raw
+        pos = end
+    return buffer
+
+
+def encode_into(
+    type_,
+    objs,
+    buffer=None,
+    offsets=None,
+    workers=None,
+    chunk_size=None,
+    format=FORMAT_BORSH,
+    threads=False,
+    executor=None,
+    **kwargs,
+):
+    """
+    Encodes objs back-to-back as type_ into a single buffer in parallel and returns it. Records are written into
+    their slots, at the prefix sums of the sizes of the records before them, as soon as they are encoded, so the
+    encodings of all records are never held at once besides buffer.
+
+    :param buffer: a writable bytes-like object (e.g., a bytearray or mmap) of at least the total size, which
+        defaults to a new bytearray.
+    :param offsets: the positions of the records as returned by `calc_offsets`, which are calculated if None. For
+        records of dynamic size in the zero-copy format, whose sizes are only known by encoding them, the encoded
+        chunks are written back-to-back instead when offsets is None.
+    :param threads: if True, records are encoded by a pool of threads writing into buffer, which only runs in
+        parallel on free-threaded builds of python. Otherwise, worker processes encode chunks of records, which are
+        copied into buffer as they arrive with at most `CHUNKS_PER_WORKER` chunks per worker in flight. An executor
+        given with threads must run threads.
+
+    The other arguments are as in `decode_many`.
+    """
+    if threads and isinstance(executor, ProcessPoolExecutor):
+        # worker processes would write into copies of buffer
+        raise ValueError("Encoding with threads needs an executor running threads")
+
+    objs = list(objs)
+    workers = workers or _default_workers()
+    chunk_size = _calc_chunk_size(len(objs), workers, chunk_size)
+    starts = range(0, len(objs), chunk_size)
+    serial = executor is None and (workers == 1 or len(objs) <= chunk_size)
+
+    dynamic = offsets is None and _is_dynamic_zero_copy(type_, format)
+    if not dynamic:
+        if offsets is None:
+            offsets = calc_offsets(type_, objs, format=format, **kwargs)
+        elif len(offsets) != len(objs) + 1:
+            raise ValueError(f"Expected {len(objs) + 1} offsets, found {len(offsets)}")
+
+        total = offsets[-1]
+        if buffer is None:
+            buffer = bytearray(total)
+        elif memoryview(buffer).nbytes < total:
+            raise ValueError(
+                f"Buffer length is {memoryview(buffer).nbytes}, but the records require {total}"
+            )
+
+        if serial:
+            _encode_range(buffer, type_, objs, offsets, format, kwargs)
+            return buffer
+
+        if threads:
+            chunks = [
+                (
+                    buffer,
+                    type_,
+                    objs[i : i + chunk_size],
+                    offsets[i : i + chunk_size + 1],
+                    format,
+                    kwargs,
+                )
+                for i in starts
+            ]
+            list(
+                _map_chunks(
+                    _encode_range, chunks, workers, executor, ThreadPoolExecutor
+                )
+            )
+            return buffer
+
+    chunks = [(type_, objs[i : i + chunk_size], format, kwargs) for i in starts]
+    if serial:
+        encoded = (_encode_chunk(*chunk) for chunk in chunks)
+    else:
+        executor_cls = ThreadPoolExecutor if threads else ProcessPoolExecutor
+        encoded = _imap_chunks(_encode_chunk, chunks, workers, executor, executor_cls)
+
+    if dynamic:
+        return _append_chunks(buffer, encoded)
+
+    view = memoryview(buffer)
+    for start, (raw, chunk_offsets) in zip(starts, encoded):
+        _place_chunk(view, start, raw, chunk_offsets, offsets)
+    return buffer
@@ -0,0 +1,501 @@
+"""
+Decoding of back-to-back encoded records from binary streams.
+"""
+import asyncio
+import struct
+from dataclasses import fields
+from functools import lru_cache
+from io import BytesIO
+from typing import get_args, get_origin
+
+from .bytes import BYTES_CATALOG, is_plain_dataclass
+from .transcode import _is_optional, calc_max_size
+from ._utils import (
+    FORMAT_BORSH,
+    FORMAT_ZERO_COPY,
+    FORMAT_TO_TYPE,
+    AutoTagTypeValueManager,
+    lazy_plan,
+)
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class NeedMoreData(Exception):
+    """
+    Raised by a `StreamBuffer` that cannot be refilled when a read goes past the received bytes.
+
+    :param required: the position (as returned by `tell`) up to which bytes are needed.
+    """
+
+    def __init__(self, required):
+        self.required = required
+        super().__init__(f"Need data up to position {required}")
+
+
+class StreamBuffer:
+    """
+    A read-only file-like window over the bytes of a stream, which can be passed to `_from_bytes_partial`.
+
+    Bytes are pulled from fileobj in chunks of at least chunk_size when a read needs them, or pushed with `feed`
+    when fileobj is None. Bytes before the start of the current record are dropped by `discard`.
+    """
+
+    def __init__(self, fileobj=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        self._fileobj = fileobj
+        self._chunk_size = chunk_size
+        self._data = bytearray()
+        self._pos = 0
+        self._base = 0  # position in the stream of self._data[0]
+        self._eof = fileobj is None
+
+    def feed(self, chunk):
+        self._data += chunk
+
+    def available(self):
+        return len(self._data) - self._pos
+
+    def received(self):
+        """
+        Returns the position in the stream up to which bytes have been received.
+        """
+        return self._base + len(self._data)
+
+    def _fill(self, size=None):
+        # reads up to the end of the stream when size is None
+        while (size is None or self.available() < size) and not self._eof:
+            missing = 0 if size is None else size - self.available()
+            chunk = self._fileobj.read(max(self._chunk_size, missing))
+            if not chunk:
+                self._eof = True
+            self._data += chunk
+
+    def at_eof(self):
+        self._fill(1)
+        return self.available() == 0
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            self._fill()
+            size = self.available()
+        elif self.available() < size:
+            self._fill(size)
+            if self.available() < size:
+                if self._fileobj is None:
+                    raise NeedMoreData(self.tell() + size)
+                raise EOFError(
+                    f"The stream ended {size - self.available()} bytes before the end of the record"
+                )
+
+        data = bytes(self._data[self._pos : self._pos + size])
+        self._pos += size
+        return data
+
+    def tell(self):
+        return self._base + self._pos
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self.tell()
+        elif whence != 0:
+            raise ValueError(
+                "StreamBuffer only supports seeking from the start or the current position"
+            )
+
+        if offset < self._base:
+            raise ValueError("Cannot seek before the discarded bytes")
+        self._pos = offset - self._base
+        return offset
+
+    def discard(self):
+        """
+        Drops the bytes before the current position once they make up a chunk, so memory stays bounded.
+        """
+        if self._pos >= self._chunk_size or self._pos == len(self._data):
+            del self._data[: self._pos]
+            self._base += self._pos
+            self._pos = 0
+
+
+def _check_format(format):
+    if format not in (FORMAT_BORSH, FORMAT_ZERO_COPY):
+        raise ValueError(
+            f"Format argument must be {FORMAT_BORSH} or {FORMAT_ZERO_COPY}, found {format}"
+        )
+
+
+def iter_from_stream(
+    type_, fileobj, format=FORMAT_BORSH, chunk_size=DEFAULT_CHUNK_SIZE, **kwargs
+):
+    """
+    Lazily decodes consecutive records of type_ from the binary file-like fileobj until its end. The stream is read
+    in chunks of chunk_size bytes, so memory use does not depend on its length.
+    """
+    _check_format(format)
+
+    buffer = StreamBuffer(fileobj, chunk_size)
+    tag_type = FORMAT_TO_TYPE[format]
+    while not buffer.at_eof():
+        start = buffer.tell()
+        with AutoTagTypeValueManager(tag_type):
+            obj = BYTES_CATALOG.unpack_partial(type_, buffer, format=format, **kwargs)
+
+        if buffer.tell() == start:
+            raise RuntimeError(f"Decoding {type_} did not consume any bytes")
+
+        buffer.discard()
+        yield obj
+
+
+def _find_need_more_data(e):
+    # converters may wrap the error, e.g., in a PodPathError
+    while e is not None:
+        if isinstance(e, NeedMoreData):
+            return e
+        e = e.__cause__
+    return None
+
+
+SCAN_PARTIAL = "_scan_partial"
+
+
+def scan_value(type_, ctx):
+    """
+    Scans a static value, e.g., a length or a tag, and returns it decoded.
+    """
+    data = yield calc_max_size(type_, ctx[1])
+    if hasattr(type_, "_get_code"):
+        # atomic types are decoded by struct directly
+        return type_._unpacker(struct.unpack(type_._get_code(), data)[0])
+
+    with AutoTagTypeValueManager(ctx[1]):
+        return BYTES_CATALOG.unpack_partial(type_, BytesIO(data))
+
+
+def _static_scanner(types):
+    sizes = {}  # by tag type
+
+    def scan(ctx):
+        size = sizes.get(ctx[1])
+        if size is None:
+            size = sizes[ctx[1]] = sum(calc_max_size(type_, ctx[1]) for type_ in types)
+        yield -size
+
+    return scan
+
+
+def _compile_scanners(types):
+    """
+    Returns a scanner for each of types, where consecutive static types are merged into a single scanner.
+    """
+    scanners = []
+    static_types = []
+    for type_ in types:
+        if BYTES_CATALOG.is_static(type_):
+            static_types.append(type_)
+            continue
+
+        if static_types:
+            scanners.append(_static_scanner(static_types))
+            static_types = []
+        scanners.append(get_scanner(type_))
+
+    if static_types:
+        scanners.append(_static_scanner(static_types))
+    return scanners
+
+
+def _dataclass_scanner(cls):
+    get_plan = lazy_plan(
+        lambda: _compile_scanners(
+            cls._get_field_type(field.type) for field in fields(cls)
+        )
+    )
+
+    def scan(ctx):
+        for field_scan in get_plan():
+            yield from field_scan(ctx)
+
+    return scan
+
+
+def _optional_scanner(type_):
+    some_scan = get_scanner(get_args(type_)[0])
+
+    def scan(ctx):
+        b = yield 1
+        if b not in (b"\x00", b"\x01"):
+            raise ValueError("Invalid byte")
+        if b == b"\x01":
+            yield from some_scan(ctx)
+
+    return scan
+
+
+def _tuple_scanner(type_):
+    arg_scans = _compile_scanners(get_args(type_))
+
+    def scan(ctx):
+        for arg_scan in arg_scans:
+            yield from arg_scan(ctx)
+
+    return scan
+
+
+def _object_scanner(type_):
+    # types that cannot be scanned are decoded again whenever the bytes they need next arrive
+    def scan(ctx):
+        buffer = StreamBuffer()
+        while True:
+            buffer.seek(0)
+            try:
+                with AutoTagTypeValueManager(ctx[1]):
+                    BYTES_CATALOG.unpack_partial(type_, buffer, format=ctx[0])
+            except Exception as e:
+                need_more_data = _find_need_more_data(e)
+                if need_more_data is None:
+                    raise
+                buffer.feed((yield need_more_data.required - buffer.received()))
+                continue
+
+            if buffer.tell() != buffer.received():
+                raise RuntimeError(
+                    f"Decoding {type_} did not consume the bytes it read"
+                )
+            return
+
+    return scan
+
+
+@lru_cache(maxsize=None)
+def get_scanner(type_):
+    """
+    Resolves the converters of type_ once and returns a generator function `scan(ctx)` that measures an encoded
+    value of type_ from its leading bytes: it yields the number of bytes it needs to look at next and is sent
+    exactly those bytes, until it returns at the end of the value. Bytes it only skips, e.g., static fields, are
+    yielded as a negative count and are not sent, so a reader may fetch them together with the next bytes needed.
+
+    The context is a `(format, tag_type)` pair, as for transcoders. Types take part by defining `_scan_partial`;
+    dataclasses, Optional and tuples are handled here and any other dynamic type is decoded again as it grows.
+    """
+    if BYTES_CATALOG.is_static(type_):
+        return _static_scanner([type_])
+
+    hook = getattr(type_, SCAN_PARTIAL, None)
+    if hook is not None:
+        return hook
+
+    if is_plain_dataclass(type_):
+        return _dataclass_scanner(type_)
+
+    if _is_optional(type_):
+        return _optional_scanner(type_)
+
+    if get_origin(type_) == tuple:
+        return _tuple_scanner(type_)
+
+    return _object_scanner(type_)
+
+
+def scan_partial(type_, ctx):
+    return get_scanner(type_)(ctx)
+
+
+class Decoder:
+    """
+    A push-parser that decodes consecutive records of type_ from chunks of bytes as they are received.
+
+    A record of dynamic size that is not complete within the received bytes is measured by its scanner (see
+    `get_scanner`), which resumes where it stopped as more bytes are fed, and is decoded once its end is received.
+    Feeding a large record in small chunks hence costs linear time, and `needed` is the exact number of bytes the
+    scanner is missing.
+
+    Usage:
+        decoder = Decoder(Message)
+        for chunk in chunks:
+            for message in decoder.feed(chunk):
+                ...
+    """
+
+    def __init__(self, type_, format=FORMAT_BORSH, **kwargs):
+        _check_format(format)
+
+        self._type = type_
+        self._format = format
+        self._tag_type = FORMAT_TO_TYPE[format]
+        self._kwargs = kwargs
+        self._buffer = StreamBuffer()
+
+        self._static_size = None
+        with AutoTagTypeValueManager(self._tag_type):
+            if BYTES_CATALOG.is_static(type_):
+                self._static_size = BYTES_CATALOG.calc_max_size(type_)
+
+        # the position up to which bytes are needed to complete the current record
+        self._required = self._static_size or 1
+
+        # the scanner of a split record, the position it has scanned up to, the size of its next request and the
+        # position of the end of the record once it is found
+        self._scan = None
+        self._scanned = 0
+        self._scan_size = 0
+        self._end = None
+
+    @property
+    def needed(self) -> int:
+        """
+        The number of bytes that must still be fed before the next record can be completed. For records of dynamic
+        size that have not started, this is a lower bound.
+        """
+        return max(self._required - self._buffer.received(), 0)
+
+    @property
+    def pending(self) -> int:
+        """
+        The number of received bytes that are not part of a returned record.
+        """
+        return self._buffer.available()
+
+    def _scan_record(self, start) -> bool:
+        """
+        Advances the scanner of the record at start over the received bytes and returns whether the whole record
+        has been received.
+        """
+        buffer = self._buffer
+        if self._end is None:
+            if self._scan is None:
+                self._scan = scan_partial(self._type, (self._format, self._tag_type))
+                self._scanned = start
+                self._scan_size = next(self._scan)
+
+            try:
+                while True:
+                    size = self._scan_size
+                    if size < 0:
+                        self._scanned -= size
+                        self._scan_size = self._scan.send(None)
+                        continue
+
+                    if self._scanned + size > buffer.received():
+                        self._required = self._scanned + size
+                        return False
+
+                    buffer.seek(self._scanned)
+                    data = buffer.read(size)
+                    self._scanned += size
+                    self._scan_size = self._scan.send(data)
+            except StopIteration:
+                self._scan = None
+                self._end = self._scanned
+            finally:
+                buffer.seek(start)
+
+        self._required = self._end
+        return self._end <= buffer.received()
+
+    def feed(self, chunk) -> list:
+        """
+        Appends chunk to the received bytes and returns the records completed by it, in order.
+        """
+        records = []
+        buffer = self._buffer
+        buffer.feed(chunk)
+
+        while self._required <= buffer.received():
+            start = buffer.tell()
+            if self._static_size is not None and buffer.available() < self._static_size:
+                self._required = start + self._static_size
+                break
+
+            # a split record is only decoded once its scanner has found its end
+            measured = self._scan is not None or self._end is not None
+            if measured and not self._scan_record(start):
+                break
+
+            try:
+                with AutoTagTypeValueManager(self._tag_type):
+                    obj = BYTES_CATALOG.unpack_partial(
+                        self._type, buffer, format=self._format, **self._kwargs
+                    )
+            except Exception as e:
+                if _find_need_more_data(e) is None:
+                    raise
+
+                buffer.seek(start)
+                if measured or self._scan_record(start):
+                    raise RuntimeError(
+                        f"Decoding {self._type} needs more bytes than its scanner measured"
+                    ) from e
+                break
+
+            if buffer.tell() == start:
+                raise RuntimeError(f"Decoding {self._type} did not consume any bytes")
+
+            buffer.discard()
+            records.append(obj)
+            self._end = None
+            self._required = buffer.tell() + (self._static_size or 1)
+
+        return records
+
+
+async def read_from(type_, reader, format=FORMAT_BORSH, **kwargs):
+    """
+    Reads one record of type_ from the `asyncio.StreamReader` reader. Only the bytes of the record are consumed:
+    they are read with `readexactly` up to each value its scanner (see `get_scanner`) looks at, e.g., a length,
+    and all at once for static types, and the record is decoded once they are all read.
+
+    Raises EOFError if the stream ends before the record starts, and `asyncio.IncompleteReadError` if it ends
+    within the record.
+    """
+    _check_format(format)
+
+    chunks = []
+    skipped = 0
+    scan = scan_partial(type_, (format, FORMAT_TO_TYPE[format]))
+    try:
+        try:
+            size = next(scan)
+            while True:
+                if size < 0:
+                    skipped -= size
+                    size = scan.send(None)
+                    continue
+
+                chunk = await reader.readexactly(skipped + size)
+                chunks.append(chunk)
+                skipped = 0
+                size = scan.send(chunk[len(chunk) - size :])
+        except StopIteration:
+            pass
+
+        if skipped:
+            chunks.append(await reader.readexactly(skipped))
+    except asyncio.IncompleteReadError as e:
+        if not chunks and not e.partial:
+            raise EOFError("The stream ended before the record started") from e
+        raise
+
+    raw = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+    return BYTES_CATALOG.unpack(type_, raw, checked=True, format=format, **kwargs)
+
+
+async def aiter_from_stream(
+    type_, reader, format=FORMAT_BORSH, chunk_size=DEFAULT_CHUNK_SIZE, **kwargs
+):
+    """
+    Asynchronously yields consecutive records of type_ read from the `asyncio.StreamReader` reader until its end.
+    Unlike `read_from`, the stream is read in chunks of up to chunk_size bytes.
+    """
+    decoder = Decoder(type_, format=format, **kwargs)
+    while True:
+        chunk = await reader.read(max(chunk_size, decoder.needed))
+        if not chunk:
+            if decoder.pending:
+                raise EOFError(
+                    f"The stream ended {decoder.needed} bytes before the end of the record"
+                )
+            return
+
+        for record in decoder.feed(chunk):
+            yield record
@@ -0,0 +1,271 @@
+"""
+Conversion of encoded bytes between formats without building the intermediate pod objects.
+
+Spans whose encoding is the same in every format are copied verbatim, only `AutoTagType` tags and zero-copy padding
+are rewritten. Types take part by defining `_is_format_invariant` and `_transcode_partial`; dataclasses, Optional and
+tuples are handled here and any other type falls back to decoding and re-encoding the object.
+
+A transcoder is called as `transcode(src, dst, src_ctx, dst_ctx)`, where each context is a `(format, tag_type)` pair
+giving the format passed to the converters and the concrete type of `AutoTagType` tags.
+"""
+from dataclasses import fields
+from functools import lru_cache
+from io import BytesIO
+from typing import Union, get_args, get_origin
+
+from .bytes import BYTES_CATALOG, is_plain_dataclass
+from .errors import PodPathError
+from ._utils import (
+    FORMAT_AUTO,
+    FORMAT_BORSH,
+    FORMAT_ZERO_COPY,
+    FORMAT_TO_TYPE,
+    AutoTagTypeValueManager,
+    lazy_plan,
+)
+
+IS_FORMAT_INVARIANT = "_is_format_invariant"
+TRANSCODE_PARTIAL = "_transcode_partial"
+
+_INVARIANT_TYPES = (bool, str)
+
+
+def _is_optional(type_):
+    if get_origin(type_) != Union:
+        return False
+    args = get_args(type_)
+    return len(args) == 2 and args[1] is type(None)
+
+
+@lru_cache(maxsize=None)
+def is_format_invariant(type_) -> bool:
+    """
+    Returns True if the encoding of type_ does not depend on the format, i.e., it contains neither `AutoTagType`
+    tags nor enums padded in the zero-copy format.
+    """
+    hook = getattr(type_, IS_FORMAT_INVARIANT, None)
+    if hook is not None:
+        return hook()
+
+    if type_ in _INVARIANT_TYPES:
+        return True
+
+    if is_plain_dataclass(type_):
+        return all(
+            is_format_invariant(type_._get_field_type(field.type))
+            for field in fields(type_)
+        )
+
+    if _is_optional(type_):
+        return is_format_invariant(get_args(type_)[0])
+
+    if get_origin(type_) == tuple:
+        return all(is_format_invariant(arg) for arg in get_args(type_))
+
+    return False
+
+
+@lru_cache(maxsize=None)
+def calc_max_size(type_, tag_type):
+    """
+    Returns the maximum size of type_ when `AutoTagType` tags are encoded as tag_type.
+    """
+    with AutoTagTypeValueManager(tag_type):
+        return BYTES_CATALOG.calc_max_size(type_)
+
+
+def copy_partial(src, dst, size):
+    data = src.read(size)
+    if len(data) != size:
+        raise ValueError(f"Buffer length is {len(data)}, but expected {size}")
+    dst.write(data)
+
+
+def pad_partial(src, dst, src_start, dst_start, src_size=None, dst_size=None):
+    """
+    Skips the padding of src and writes the padding of dst after a value stored in a fixed size slot, given the
+    positions where the value starts and the slot sizes in each (None when the value is not padded).
+    """
+    if src_size is not None:
+        delta = src.tell() - src_start
+        if delta > src_size:
+            raise RuntimeError(
+                f"The underlying type has consumed {delta} bytes > length ({src_size})"
+            )
+        if delta < src_size:
+            required = src_size - delta
+            if len(src.read(required)) < required:
+                raise RuntimeError("Bytes object was too small.")
+
+    if dst_size is not None:
+        delta = dst.tell() - dst_start
+        if delta > dst_size:
+            raise RuntimeError(
+                f"The underlying type has consumed {delta} bytes > length ({dst_size})"
+            )
+        if delta < dst_size:
+            dst.write(bytes(dst_size - delta))
+
+
+def _copy_transcoder(size):
+    def transcode(src, dst, src_ctx, dst_ctx):
+        copy_partial(src, dst, size)
+
+    return transcode
+
+
+def _span_transcoder(type_):
+    # the size of dynamic values is only known after decoding them
+    def transcode(src, dst, src_ctx, dst_ctx):
+        start = src.tell()
+        with AutoTagTypeValueManager(src_ctx[1]):
+            BYTES_CATALOG.unpack_partial(type_, src, format=src_ctx[0])
+        end = src.tell()
+
+        src.seek(start)
+        dst.write(src.read(end - start))
+
+    return transcode
+
+
+def _compile_steps(named_types):
+    """
+    Returns a (name, type, transcoder) step for each of named_types, where consecutive types that are static and
+    format invariant are merged into a single copy.
+    """
+    steps = []
+    copy_size = 0
+    for name, type_ in named_types:
+        if is_format_invariant(type_) and BYTES_CATALOG.is_static(type_):
+            if not copy_size:
+                steps.append([name, type_, None])
+            copy_size += BYTES_CATALOG.calc_max_size(type_)
+            steps[-1][2] = _copy_transcoder(copy_size)
+        else:
+            copy_size = 0
+            steps.append([name, type_, get_transcoder(type_)])
+
+    return [tuple(step) for step in steps]
+
+
+def _dataclass_transcoder(cls):
+    get_plan = lazy_plan(
+        lambda: _compile_steps(
+            (field.name, cls._get_field_type(field.type)) for field in fields(cls)
+        )
+    )
+
+    def transcode(src, dst, src_ctx, dst_ctx):
+        for name, type_, field_transcode in get_plan():
+            try:
+                field_transcode(src, dst, src_ctx, dst_ctx)
+            except PodPathError as e:
+                e.path.append(name)
+                e.path.append(cls.__name__)
+                raise
+            except Exception as e:
+                raise PodPathError(
+                    "Failed to transcode dataclass",
+                    [name, cls.__name__],
+                    getattr(type_, "__name__", type_),
+                ) from e
+
+    return transcode
+
+
+def _optional_transcoder(type_):
+    some_transcode = get_transcoder(get_args(type_)[0])
+
+    def transcode(src, dst, src_ctx, dst_ctx):
+        b = src.read(1)
+        if b not in (b"\x00", b"\x01"):
+            if len(b) == 0:
+                raise ValueError("The end of the buffer reached but requires 1 bytes")
+            raise ValueError("Invalid byte")
+
+        dst.write(b)
+        if b == b"\x01":
+            some_transcode(src, dst, src_ctx, dst_ctx)
+
+    return transcode
+
+
+def _tuple_transcoder(type_):
+    steps = _compile_steps((str(i), arg) for i, arg in enumerate(get_args(type_)))
+
+    def transcode(src, dst, src_ctx, dst_ctx):
+        for _, _, arg_transcode in steps:
+            arg_transcode(src, dst, src_ctx, dst_ctx)
+
+    return transcode
+
+
+def _object_transcoder(type_):
+    error_msg = "No converter was able to unpack object"
+    converter = BYTES_CATALOG._get_converter_or_raise(type_, error_msg)
+
+    def transcode(src, dst, src_ctx, dst_ctx):
+        src_format, src_tag = src_ctx
+        dst_format, dst_tag = dst_ctx
+        with AutoTagTypeValueManager(src_tag):
+            obj = converter.unpack_partial(type_, src, format=src_format)
+        with AutoTagTypeValueManager(dst_tag):
+            converter.pack_partial(type_, dst, obj, format=dst_format)
+
+    return transcode
+
+
+@lru_cache(maxsize=None)
+def get_transcoder(type_):
+    """
+    Resolves the converters of type_ once and returns a function `(src, dst, src_ctx, dst_ctx)` that reads type_
+    from src and writes it to dst in the other format.
+    """
+    if is_format_invariant(type_) and BYTES_CATALOG.is_static(type_):
+        return _copy_transcoder(BYTES_CATALOG.calc_max_size(type_))
+
+    hook = getattr(type_, TRANSCODE_PARTIAL, None)
+    if hook is not None:
+        return hook
+
+    if is_format_invariant(type_):
+        return _span_transcoder(type_)
+
+    if is_plain_dataclass(type_):
+        return _dataclass_transcoder(type_)
+
+    if _is_optional(type_):
+        return _optional_transcoder(type_)
+
+    if get_origin(type_) == tuple:
+        return _tuple_transcoder(type_)
+
+    return _object_transcoder(type_)
+
+
+def transcode_partial(type_, src, dst, src_ctx, dst_ctx):
+    get_transcoder(type_)(src, dst, src_ctx, dst_ctx)
+
+
+def transcode(type_, raw, src_format=FORMAT_AUTO, dst_format=FORMAT_BORSH):
+    """
+    Returns the same result as `BYTES_CATALOG.pack(type_, BYTES_CATALOG.unpack(type_, raw, format=src_format),
+    format=dst_format)` without decoding the spans that are the same in both formats.
+    """
+    src = raw if isinstance(raw, BytesIO) else BytesIO(raw)
+    src_format = BYTES_CATALOG._detect_format(type_, src, src_format)
+    for format in (src_format, dst_format):
+        if format not in FORMAT_TO_TYPE:
+            raise ValueError(
+                f"Format argument must be {FORMAT_BORSH} or {FORMAT_ZERO_COPY}, found {format}"
+            )
+
+    dst = BytesIO()
+    transcode_partial(
+        type_,
+        src,
+        dst,
+        (src_format, FORMAT_TO_TYPE[src_format]),
+        (dst_format, FORMAT_TO_TYPE[dst_format]),
+    )
+    return dst.getvalue()
@@ -45,6 +45,7 @@ from .array import (
     Vec,
     Bytes,
     Str,
+    LazyArray,
 )
 
 from .enum import Enum, Variant, named_fields, AutoTagType
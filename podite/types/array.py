@@ -1,22 +1,140 @@
+from collections.abc import Sequence
+from io import BytesIO
+
 from .atomic import U32
 from ..bytes import BYTES_CATALOG
-from .._utils import _GetitemToCall, get_concrete_type, get_calling_module
-from ..json import JSON_CATALOG
+from .._utils import (
+    _GetitemToCall,
+    ParametrizedType,
+    get_concrete_type,
+    get_calling_module,
+    AutoTagTypeValueManager,
+    FORMAT_BORSH,
+)
+from ..direct import get_bytes_to_dict, get_dict_to_bytes
+from ..transcode import (
+    get_transcoder,
+    is_format_invariant,
+    calc_max_size,
+    copy_partial,
+)
+from ..stream import get_scanner, scan_value
+from ..json import (
+    JSON_CATALOG,
+    JSON_IDENTITY,
+    is_json_identity,
+    bytes_to_json,
+    bytes_from_json,
+    check_bytes_encoding,
+)
 from ..decorators import pod
 
 
+class LazyArray(Sequence):
+    """
+    A read-only sequence over the encoded elements of an array whose element type is static.
+
+    Elements are decoded on access, so touching a few entries of a large array does not pay for
+    decoding all of it. Instances are returned by `from_bytes(..., lazy=True)`.
+    """
+
+    def __init__(self, type_, raw, length, stride, tag_type, kwargs, start=0):
+        self._type = type_
+        self._raw = raw
+        self._length = length
+        self._stride = stride
+        self._tag_type = tag_type
+        self._kwargs = kwargs
+        self._start = start
+
+    @classmethod
+    def from_buffer(cls, type_, buffer, length, **kwargs):
+        stride = BYTES_CATALOG.calc_max_size(type_)
+        raw = buffer.read(stride * length)
+        if len(raw) != stride * length:
+            raise ValueError(
+                f"Buffer length is {len(raw)}, but expected {stride * length}"
+            )
+
+        return cls(
+            type_, raw, length, stride, AutoTagTypeValueManager.get_tag(), kwargs
+        )
+
+    def _decode(self, index):
+        # only the element is copied, raw may be a view of a large file
+        start = self._start + index * self._stride
+        buffer = BytesIO(self._raw[start : start + self._stride])
+        with AutoTagTypeValueManager(self._tag_type):
+            return BYTES_CATALOG.unpack_partial(self._type, buffer, **self._kwargs)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return [self._decode(i) for i in range(start, stop, step)]
+
+            return LazyArray(
+                self._type,
+                self._raw,
+                max(stop - start, 0),
+                self._stride,
+                self._tag_type,
+                self._kwargs,
+                self._start + start * self._stride,
+            )
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("LazyArray index out of range")
+
+        return self._decode(index)
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield self._decode(i)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, LazyArray)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __reduce__(self):
+        # only the bytes of the elements are kept, raw may be a view of a large file
+        end = self._start + self._length * self._stride
+        raw = bytes(self._raw[self._start : end])
+        return LazyArray, (
+            self._type,
+            raw,
+            self._length,
+            self._stride,
+            self._tag_type,
+            self._kwargs,
+        )
+
+    def __repr__(self):
+        return f"LazyArray[{self._type}, {self._length}]"
+
+
 def _fixed_len_array(name, type_, length, autopad=False):
     module = get_calling_module()
 
     @pod(dataclass_fn=None)
-    class _ArrayPod:
+    class _ArrayPod(metaclass=ParametrizedType):
         @classmethod
         def _is_static(cls) -> bool:
             return BYTES_CATALOG.is_static(get_concrete_type(module, type_))
 
         @classmethod
         def _calc_size(cls, obj, **kwargs):
-            return cls._calc_max_size()
+            ty = get_concrete_type(module, type_)
+            if BYTES_CATALOG.is_static(ty):
+                return cls._calc_max_size()
+
+            return sum(BYTES_CATALOG.calc_size(ty, elem, **kwargs) for elem in obj)
 
         @classmethod
         def _calc_max_size(cls):
@@ -25,34 +143,89 @@ def _fixed_len_array(name, type_, length, autopad=False):
             )
 
         @classmethod
-        def _from_bytes_partial(cls, buffer, **kwargs):
+        def _get_element_type(cls):
+            return get_concrete_type(module, type_)
+
+        @classmethod
+        def _get_length(cls):
+            return length
+
+        @classmethod
+        def _is_format_invariant(cls) -> bool:
+            return is_format_invariant(cls._get_element_type())
+
+        @classmethod
+        def _transcode_partial(cls, src, dst, src_ctx, dst_ctx):
+            transcode = get_transcoder(cls._get_element_type())
+            for _ in range(length):
+                transcode(src, dst, src_ctx, dst_ctx)
+
+        @classmethod
+        def _scan_partial(cls, ctx):
+            scan = get_scanner(cls._get_element_type())
+            for _ in range(length):
+                yield from scan(ctx)
+
+        @classmethod
+        def _from_bytes_partial(cls, buffer, lazy=False, **kwargs):
+            elem_type = cls._get_element_type()
+            if lazy and BYTES_CATALOG.is_static(elem_type):
+                return LazyArray.from_buffer(
+                    elem_type, buffer, length, lazy=lazy, **kwargs
+                )
+
+            if hasattr(elem_type, "_from_bytes_many"):
+                return elem_type._from_bytes_many(buffer, length, **kwargs)
+
             result = []
             for _ in range(length):
                 value = BYTES_CATALOG.unpack_partial(
-                    get_concrete_type(module, type_), buffer, **kwargs
+                    elem_type, buffer, lazy=lazy, **kwargs
                 )
                 result.append(value)
 
             return result
 
+        @classmethod
+        def _bytes_to_dict_partial(cls, buffer, lazy=False, **kwargs):
+            elem_type = cls._get_element_type()
+            if is_json_identity(elem_type) and hasattr(elem_type, "_from_bytes_many"):
+                return elem_type._from_bytes_many(buffer, length, **kwargs)
+
+            decode = get_bytes_to_dict(elem_type)
+            return [decode(buffer, **kwargs) for _ in range(length)]
+
         @classmethod
         def _to_bytes_partial(cls, buffer, obj, **kwargs):
             if len(obj) != length:
                 raise ValueError("Length of array does not equal fixed length")
             for elem in obj:
                 BYTES_CATALOG.pack_partial(
-                    get_concrete_type(module, type_), buffer, elem
+                    get_concrete_type(module, type_), buffer, elem, **kwargs
                 )
 
+        @classmethod
+        def _dict_to_bytes_partial(cls, buffer, raw, **kwargs):
+            if len(raw) != length:
+                raise ValueError("Length of array does not equal fixed length")
+
+            encode = get_dict_to_bytes(cls._get_element_type())
+            for elem in raw:
+                encode(buffer, elem, **kwargs)
+
         @classmethod
         def _to_dict(cls, obj):
-            return [JSON_CATALOG.pack(get_concrete_type(module, type_), e) for e in obj]
+            pack, _ = JSON_CATALOG.get_packers(cls._get_element_type())
+            if pack is None:
+                return list(obj)
+            return [pack(e) for e in obj]
 
         @classmethod
         def _from_dict(cls, raw):
-            return [
-                JSON_CATALOG.unpack(get_concrete_type(module, type_), e) for e in raw
-            ]
+            _, unpack = JSON_CATALOG.get_packers(cls._get_element_type())
+            if unpack is None:
+                return list(raw)
+            return [unpack(e) for e in raw]
 
     _ArrayPod.__name__ = f"{name}[{type_}, {length}]"
     _ArrayPod.__qualname__ = _ArrayPod.__name__
@@ -60,13 +233,20 @@ def _fixed_len_array(name, type_, length, autopad=False):
     return _ArrayPod
 
 
-def _fixed_len_bytes(name, length):
+def _fixed_len_bytes(name, length, json_encoding=None):
+    if json_encoding is not None:
+        check_bytes_encoding(json_encoding)
+
     @pod(dataclass_fn=None)
-    class _BytesPod:
+    class _BytesPod(metaclass=ParametrizedType):
         @classmethod
         def _is_static(cls) -> bool:
             return True
 
+        @classmethod
+        def _is_format_invariant(cls) -> bool:
+            return True
+
         @classmethod
         def _calc_size(cls, obj, **kwargs):
             return cls._calc_max_size()
@@ -88,21 +268,15 @@ def _fixed_len_bytes(name, length):
 
         @classmethod
         def _to_dict(cls, obj):
-            return list(obj)
+            return bytes_to_json(obj, json_encoding)
 
         @classmethod
         def _from_dict(cls, raw):
-            return bytes(raw)
-
-        @classmethod
-        def _to_dict(cls, obj):
-            return list(obj)
-
-        @classmethod
-        def _from_dict(cls, raw):
-            return bytes(raw)
+            return bytes_from_json(raw, json_encoding)
 
     _BytesPod.__name__ = f"{name}[{length}]"
+    if json_encoding is not None:
+        _BytesPod.__name__ = f"{name}[{length}, json_encoding={json_encoding}]"
     _BytesPod.__qualname__ = _BytesPod.__name__
 
     return _BytesPod
@@ -110,11 +284,15 @@ def _fixed_len_bytes(name, length):
 
 def _fixed_len_str(name, length, encoding="UTF-8", autopad=True):
     @pod(dataclass_fn=None)
-    class _StrPod:
+    class _StrPod(metaclass=ParametrizedType):
         @classmethod
         def _is_static(cls) -> bool:
             return True
 
+        @classmethod
+        def _is_format_invariant(cls) -> bool:
+            return True
+
         @classmethod
         def _calc_size(cls, obj, **kwargs):
             return length
@@ -153,6 +331,7 @@ def _fixed_len_str(name, length, encoding="UTF-8", autopad=True):
         def _from_dict(cls, raw):
             return raw
 
+    setattr(_StrPod, JSON_IDENTITY, True)
     _StrPod.__name__ = f"{name}[{length}, encoding={encoding}]"
     _StrPod.__qualname__ = _StrPod.__name__
 
@@ -169,15 +348,73 @@ def _var_len_array(name, type_, max_length=None, length_type=None):
         max_length = 2 ** (BYTES_CATALOG.calc_max_size(length_type) * 8)
 
     @pod(dataclass_fn=None)
-    class _ArrayPod:
+    class _ArrayPod(metaclass=ParametrizedType):
         @classmethod
-        def is_static(cls) -> bool:
+        def _is_static(cls) -> bool:
             return False
 
+        @classmethod
+        def _get_element_type(cls):
+            return get_concrete_type(module, type_)
+
+        @classmethod
+        def _get_length_type(cls):
+            return length_type
+
+        @classmethod
+        def _get_max_length(cls):
+            return max_length
+
+        @classmethod
+        def _is_format_invariant(cls) -> bool:
+            return is_format_invariant(length_type) and is_format_invariant(
+                cls._get_element_type()
+            )
+
+        @classmethod
+        def _transcode_partial(cls, src, dst, src_ctx, dst_ctx):
+            with AutoTagTypeValueManager(src_ctx[1]):
+                length = BYTES_CATALOG.unpack_partial(length_type, src)
+            if length > max_length:
+                raise RuntimeError("actual_length > max_length")
+            with AutoTagTypeValueManager(dst_ctx[1]):
+                BYTES_CATALOG.pack_partial(length_type, dst, length)
+
+            elem_type = cls._get_element_type()
+            if is_format_invariant(elem_type) and BYTES_CATALOG.is_static(elem_type):
+                copy_partial(src, dst, BYTES_CATALOG.calc_max_size(elem_type) * length)
+                return
+
+            # elements are converted without passing the format
+            transcode = get_transcoder(elem_type)
+            src_ctx, dst_ctx = (FORMAT_BORSH, src_ctx[1]), (FORMAT_BORSH, dst_ctx[1])
+            for _ in range(length):
+                transcode(src, dst, src_ctx, dst_ctx)
+
+        @classmethod
+        def _scan_partial(cls, ctx):
+            length = yield from scan_value(length_type, ctx)
+            if length > max_length:
+                raise RuntimeError("actual_length > max_length")
+
+            elem_type = cls._get_element_type()
+            if BYTES_CATALOG.is_static(elem_type):
+                yield -calc_max_size(elem_type, ctx[1]) * length
+                return
+
+            # elements are converted without passing the format
+            scan = get_scanner(elem_type)
+            ctx = (FORMAT_BORSH, ctx[1])
+            for _ in range(length):
+                yield from scan(ctx)
+
         @classmethod
         def _calc_size(cls, obj, **kwargs):
             len_size = BYTES_CATALOG.calc_max_size(length_type)
             ty = get_concrete_type(module, type_)
+            if BYTES_CATALOG.is_static(ty):
+                return len_size + len(obj) * BYTES_CATALOG.calc_max_size(ty)
+
             body_size = sum(
                 (BYTES_CATALOG.calc_size(ty, elem, **kwargs) for elem in obj)
             )
@@ -193,20 +430,40 @@ def _var_len_array(name, type_, max_length=None, length_type=None):
             return len_size + body_size
 
         @classmethod
-        def _from_bytes_partial(cls, buffer, **kwargs):
+        def _from_bytes_partial(cls, buffer, lazy=False, **kwargs):
             length = BYTES_CATALOG.unpack_partial(length_type, buffer, **kwargs)
             if length > max_length:
                 raise RuntimeError("actual_length > max_length")
 
+            elem_type = cls._get_element_type()
+            if lazy and BYTES_CATALOG.is_static(elem_type):
+                return LazyArray.from_buffer(
+                    elem_type, buffer, length, lazy=lazy, **kwargs
+                )
+
+            if hasattr(elem_type, "_from_bytes_many"):
+                return elem_type._from_bytes_many(buffer, length, **kwargs)
+
             result = []
             for _ in range(length):
-                value = BYTES_CATALOG.unpack_partial(
-                    get_concrete_type(module, type_), buffer
-                )
+                value = BYTES_CATALOG.unpack_partial(elem_type, buffer, lazy=lazy)
                 result.append(value)
 
             return result
 
+        @classmethod
+        def _bytes_to_dict_partial(cls, buffer, lazy=False, **kwargs):
+            length = BYTES_CATALOG.unpack_partial(length_type, buffer, **kwargs)
+            if length > max_length:
+                raise RuntimeError("actual_length > max_length")
+
+            elem_type = cls._get_element_type()
+            if is_json_identity(elem_type) and hasattr(elem_type, "_from_bytes_many"):
+                return elem_type._from_bytes_many(buffer, length, **kwargs)
+
+            decode = get_bytes_to_dict(elem_type)
+            return [decode(buffer) for _ in range(length)]
+
         @classmethod
         def _to_bytes_partial(cls, buffer, obj, **kwargs):
             if len(obj) > max_length:
@@ -218,15 +475,29 @@ def _var_len_array(name, type_, max_length=None, length_type=None):
                     get_concrete_type(module, type_), buffer, elem
                 )
 
+        @classmethod
+        def _dict_to_bytes_partial(cls, buffer, raw, **kwargs):
+            if len(raw) > max_length:
+                raise RuntimeError("actual_length > max_length")
+
+            BYTES_CATALOG.pack_partial(length_type, buffer, len(raw), **kwargs)
+            encode = get_dict_to_bytes(cls._get_element_type())
+            for elem in raw:
+                encode(buffer, elem)
+
         @classmethod
         def _to_dict(cls, obj):
-            return [JSON_CATALOG.pack(get_concrete_type(module, type_), e) for e in obj]
+            pack, _ = JSON_CATALOG.get_packers(cls._get_element_type())
+            if pack is None:
+                return list(obj)
+            return [pack(e) for e in obj]
 
         @classmethod
         def _from_dict(cls, raw):
-            return [
-                JSON_CATALOG.unpack(get_concrete_type(module, type_), e) for e in raw
-            ]
+            _, unpack = JSON_CATALOG.get_packers(cls._get_element_type())
+            if unpack is None:
+                return list(raw)
+            return [unpack(e) for e in raw]
 
     _ArrayPod.__name__ = (
         f"{name}[{type_}, length_type={length_type}, max_length={max_length}]"
@@ -236,7 +507,10 @@ def _var_len_array(name, type_, max_length=None, length_type=None):
     return _ArrayPod
 
 
-def _var_len_bytes(name, max_length=None, length_type=None):
+def _var_len_bytes(name, max_length=None, length_type=None, json_encoding=None):
+    if json_encoding is not None:
+        check_bytes_encoding(json_encoding)
+
     if length_type is None:
         length_type = U32
 
@@ -244,11 +518,23 @@ def _var_len_bytes(name, max_length=None, length_type=None):
         max_length = 2 ** (BYTES_CATALOG.calc_max_size(length_type) * 8)
 
     @pod(dataclass_fn=None)
-    class _BytesPod:
+    class _BytesPod(metaclass=ParametrizedType):
         @classmethod
         def _is_static(cls) -> bool:
             return False
 
+        @classmethod
+        def _is_format_invariant(cls) -> bool:
+            return True
+
+        @classmethod
+        def _scan_partial(cls, ctx):
+            length = yield from scan_value(length_type, ctx)
+            if length > max_length:
+                raise RuntimeError("actual_length > max_length")
+
+            yield -length
+
         @classmethod
         def _calc_size(cls, obj, **kwargs):
             len_size = BYTES_CATALOG.calc_max_size(length_type)
@@ -278,13 +564,15 @@ def _var_len_bytes(name, max_length=None, length_type=None):
 
         @classmethod
         def _to_dict(cls, obj):
-            return list(obj)
+            return bytes_to_json(obj, json_encoding)
 
         @classmethod
         def _from_dict(cls, raw):
-            return bytes(raw)
+            return bytes_from_json(raw, json_encoding)
 
     _BytesPod.__name__ = f"{name}[length_type={length_type}, max_length={max_length}]"
+    if json_encoding is not None:
+        _BytesPod.__name__ = f"{name}[length_type={length_type}, max_length={max_length}, json_encoding={json_encoding}]"
     _BytesPod.__qualname__ = _BytesPod.__name__
 
     return _BytesPod
@@ -298,15 +586,27 @@ def _var_len_str(name, max_length=None, length_type=None, encoding="UTF-8"):
         max_length = 2 ** (BYTES_CATALOG.calc_max_size(length_type) * 8)
 
     @pod(dataclass_fn=None)
-    class _StrPod:
+    class _StrPod(metaclass=ParametrizedType):
         @classmethod
         def _is_static(cls) -> bool:
             return False
 
+        @classmethod
+        def _is_format_invariant(cls) -> bool:
+            return True
+
+        @classmethod
+        def _scan_partial(cls, ctx):
+            length = yield from scan_value(length_type, ctx)
+            if length > max_length:
+                raise RuntimeError("actual_length > max_length")
+
+            yield -length
+
         @classmethod
         def _calc_size(cls, obj, **kwargs):
             len_size = BYTES_CATALOG.calc_max_size(length_type)
-            return len_size + len(obj.encode("utf-8"))
+            return len_size + len(obj.encode(encoding))
 
         @classmethod
         def _calc_max_size(cls):
@@ -324,11 +624,12 @@ def _var_len_str(name, max_length=None, length_type=None, encoding="UTF-8"):
 
         @classmethod
         def _to_bytes_partial(cls, buffer, obj, **kwargs):
-            if len(obj) > max_length:
+            encoded = obj.encode(encoding)
+            if len(encoded) > max_length:
                 raise RuntimeError("actual_length > max_length")
 
-            BYTES_CATALOG.pack_partial(length_type, buffer, len(obj), **kwargs)
-            buffer.write(obj.encode(encoding))
+            BYTES_CATALOG.pack_partial(length_type, buffer, len(encoded), **kwargs)
+            buffer.write(encoded)
 
         @classmethod
         def _to_dict(cls, obj):
@@ -338,6 +639,7 @@ def _var_len_str(name, max_length=None, length_type=None, encoding="UTF-8"):
         def _from_dict(cls, raw):
             return raw
 
+    setattr(_StrPod, JSON_IDENTITY, True)
     _StrPod.__name__ = f"{name}[max_length={max_length}, length_type={length_type}, encoding={encoding}]"
     _StrPod.__qualname__ = _StrPod.__name__
 
@@ -5,13 +5,19 @@ from typing import Literal
 
 import podite.decorators as decorators
 import podite._utils as utils
+from podite.json import JSON_IDENTITY
 
 _BYTEORDER: Literal["little", "big"] = "little"
 
 
-def new_atomic_type(name: str, base: type, code: str, unpacker, packer=lambda x: x):
+def new_atomic_type(
+    name: str, base: type, code: str, unpacker, packer=None, many_unpacker=None
+):
     @decorators.pod(override=("from_bytes", "to_bytes"), dataclass_fn=None)
     class Atom(base):  # type: ignore
+        _unpacker = staticmethod(unpacker)
+        _packer = staticmethod(packer)
+
         @classmethod
         def _get_code(cls):
             order_char = "<" if _BYTEORDER == "little" else ">"
@@ -21,6 +27,10 @@ def new_atomic_type(name: str, base: type, code: str, unpacker, packer=lambda x:
         def _is_static(cls) -> bool:
             return True
 
+        @classmethod
+        def _is_format_invariant(cls) -> bool:
+            return True
+
         @classmethod
         def _calc_size(cls, obj, **kwargs):
             return struct.calcsize(cls._get_code())
@@ -31,7 +41,8 @@ def new_atomic_type(name: str, base: type, code: str, unpacker, packer=lambda x:
 
         @classmethod
         def _to_bytes_partial(cls, buffer, obj, **kwargs):
-            obj = packer(obj)
+            if packer is not None:
+                obj = packer(obj)
             buffer.write(struct.pack(cls._get_code(), obj))
 
         @classmethod
@@ -41,6 +52,27 @@ def new_atomic_type(name: str, base: type, code: str, unpacker, packer=lambda x:
             decoded, *_ = struct.unpack(cls._get_code(), encoded)
             return unpacker(decoded)
 
+        @classmethod
+        def _from_bytes_many(cls, buffer: BytesIO, count, **kwargs):
+            """
+            Decodes count consecutive values with a single struct call.
+            """
+            if many_unpacker is not None:
+                return many_unpacker(buffer, count, **kwargs)
+
+            code = cls._get_code()
+            size = struct.calcsize(code) * count
+            encoded = buffer.read(size)
+            if len(encoded) != size:
+                raise ValueError(
+                    f"Buffer length is {len(encoded)}, but expected {size}"
+                )
+
+            decoded = struct.unpack(f"{code[:-1]}{count}{code[-1]}", encoded)
+            if unpacker in (int, float):
+                return list(decoded)
+            return list(map(unpacker, decoded))
+
         @classmethod
         def _to_dict(cls, obj):
             return obj
@@ -49,6 +81,7 @@ def new_atomic_type(name: str, base: type, code: str, unpacker, packer=lambda x:
         def _from_dict(cls, obj):
             return obj
 
+    setattr(Atom, JSON_IDENTITY, True)
     Atom.__name__ = name
     Atom.__qualname__ = name
 
@@ -108,49 +141,72 @@ U64 = new_atomic_type("U64", int, "{}Q", int)
 
 
 # 16-byte integers
-I128l = new_atomic_type(
-    "I128l",
-    int,
-    "16s",
-    unpacker=lambda x: int.from_bytes(x, byteorder="little", signed=True),
-    packer=lambda x: int.to_bytes(x, length=16, byteorder="little", signed=True),
-)
-I128b = new_atomic_type(
-    "I128b",
-    int,
-    "16s",
-    unpacker=lambda x: int.from_bytes(x, byteorder="big", signed=True),
-    packer=lambda x: int.to_bytes(x, length=16, byteorder="big", signed=True),
-)
-I128 = new_atomic_type(
-    "I128",
-    int,
-    "16s",
-    unpacker=lambda x: int.from_bytes(x, byteorder=_BYTEORDER, signed=True),
-    packer=lambda x: int.to_bytes(x, length=16, byteorder=_BYTEORDER, signed=True),
-)
-
-U128l = new_atomic_type(
-    "I128l",
-    int,
-    "16s",
-    unpacker=lambda x: int.from_bytes(x, byteorder="little", signed=False),
-    packer=lambda x: int.to_bytes(x, length=16, byteorder="little", signed=False),
-)
-U128b = new_atomic_type(
-    "I128b",
-    int,
-    "16s",
-    unpacker=lambda x: int.from_bytes(x, byteorder="big", signed=False),
-    packer=lambda x: int.to_bytes(x, length=16, byteorder="big", signed=False),
-)
-U128 = new_atomic_type(
-    "I128",
-    int,
-    "16s",
-    unpacker=lambda x: int.from_bytes(x, byteorder=_BYTEORDER, signed=False),
-    packer=lambda x: int.to_bytes(x, length=16, byteorder=_BYTEORDER, signed=False),
-)
+INT128_MODES = ("int", "halves", "float")
+
+
+def _int128_many_unpacker(signed, get_byteorder):
+    def unpack_many(buffer, count, int128_mode="int", **kwargs):
+        """
+        Decodes count 128-bit integers as pairs of 64-bit halves in one struct call.
+
+        :param int128_mode: "int" for python ints, "halves" for (hi, lo) tuples (hi carries the sign) or "float"
+            for floats.
+        """
+        if int128_mode not in INT128_MODES:
+            raise ValueError(
+                f"int128_mode must be one of {INT128_MODES}, found {int128_mode}"
+            )
+
+        encoded = buffer.read(16 * count)
+        if len(encoded) != 16 * count:
+            raise ValueError(
+                f"Buffer length is {len(encoded)}, but expected {16 * count}"
+            )
+
+        hi_code = "q" if signed else "Q"
+        if get_byteorder() == "little":
+            halves = struct.unpack("<" + ("Q" + hi_code) * count, encoded)
+            lo, hi = halves[0::2], halves[1::2]
+        else:
+            halves = struct.unpack(">" + (hi_code + "Q") * count, encoded)
+            hi, lo = halves[0::2], halves[1::2]
+
+        if int128_mode == "halves":
+            return list(zip(hi, lo))
+        if int128_mode == "float":
+            return [float((h << 64) | l) for h, l in zip(hi, lo)]
+        return [(h << 64) | l for h, l in zip(hi, lo)]
+
+    return unpack_many
+
+
+def new_int128_type(name: str, signed: bool, byteorder=None):
+    """
+    Creates a 128-bit integer type. When byteorder is None, the default byte order at the time of conversion is used.
+    """
+
+    def get_byteorder():
+        return byteorder or _BYTEORDER
+
+    return new_atomic_type(
+        name,
+        int,
+        "16s",
+        unpacker=lambda x: int.from_bytes(x, byteorder=get_byteorder(), signed=signed),
+        packer=lambda x: int.to_bytes(
+            x, length=16, byteorder=get_byteorder(), signed=signed
+        ),
+        many_unpacker=_int128_many_unpacker(signed, get_byteorder),
+    )
+
+
+I128l = new_int128_type("I128l", signed=True, byteorder="little")
+I128b = new_int128_type("I128b", signed=True, byteorder="big")
+I128 = new_int128_type("I128", signed=True)
+
+U128l = new_int128_type("U128l", signed=False, byteorder="little")
+U128b = new_int128_type("U128b", signed=False, byteorder="big")
+U128 = new_int128_type("U128", signed=False)
 
 # Floating-point
 F32l = new_atomic_type("F32l", float, "<f", float)
@@ -1,7 +1,13 @@
+from functools import lru_cache
 from typing import Optional, get_origin, Union, get_args, Any, ForwardRef
 
 from podite.bytes import BytesPodConverter, BYTES_CATALOG
-from podite.json import JsonPodConverter, JSON_CATALOG
+from podite.json import (
+    JsonPodConverter,
+    JSON_CATALOG,
+    bytes_to_json,
+    bytes_from_json,
+)
 
 from .atomic import U64
 
@@ -16,14 +22,14 @@ class BoolConverter(BytesPodConverter, JsonPodConverter):
     def is_static(self, type_) -> bool:
         return True
 
-    def calc_size(self, type_, **kwargs) -> int:
+    def calc_size(self, type_, obj, **kwargs) -> int:
         return 1
 
     def calc_max_size(self, type_) -> int:
         return 1
 
     def pack_partial(self, type_, buffer, obj, **kwargs):
-        buffer.write(bytes(obj))
+        buffer.write(b"\x01" if obj else b"\x00")
 
     def unpack_partial(self, type_, buffer, **kwargs) -> bool:
         b = buffer.read(1)
@@ -53,14 +59,15 @@ class StrConverter(BytesPodConverter, JsonPodConverter):
         return False
 
     def calc_size(self, type_, obj, **kwargs) -> int:
-        return 8 + len(obj)
+        return 8 + len(obj.encode("utf-8"))
 
     def calc_max_size(self, type_) -> int:
         return 2**64 + 8
 
     def pack_partial(self, type_, buffer, obj, **kwargs):
-        BYTES_CATALOG.pack_partial(U64, buffer, len(obj))
-        buffer.write(obj.encode("utf-8"))
+        encoded = obj.encode("utf-8")
+        BYTES_CATALOG.pack_partial(U64, buffer, len(encoded))
+        buffer.write(encoded)
 
     def unpack_partial(self, type_, buffer, **kwargs) -> bool:
         length = BYTES_CATALOG.unpack_partial(U64, buffer)
@@ -87,6 +94,7 @@ class OptionalConverter(BytesPodConverter, JsonPodConverter):
         return None
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_field_type(type_):
         field_type = get_args(type_)[0]
         if isinstance(field_type, ForwardRef):
@@ -97,8 +105,10 @@ class OptionalConverter(BytesPodConverter, JsonPodConverter):
         return False
 
     def calc_size(self, type_, obj, **kwargs) -> int:
+        if obj is None:
+            return 1
         field_type = self.get_field_type(type_)
-        return 1 + BYTES_CATALOG.calc_size(field_type)
+        return 1 + BYTES_CATALOG.calc_size(field_type, obj, **kwargs)
 
     def calc_max_size(self, type_) -> int:
         field_type = self.get_field_type(type_)
@@ -115,17 +125,16 @@ class OptionalConverter(BytesPodConverter, JsonPodConverter):
 
     def unpack_partial(self, type_, buffer, **kwargs):
         b = buffer.read(1)
-        if len(b) == 0:
-            raise ValueError("The end of the buffer reached but requires 1 bytes")
-
-        if b not in (b"\x00", b"\x01"):
-            raise ValueError("Invalid byte")
-
         if b == b"\x00":
             return None
 
-        field_type = self.get_field_type(type_)
-        return BYTES_CATALOG.unpack_partial(field_type, buffer, **kwargs)
+        if b == b"\x01":
+            field_type = self.get_field_type(type_)
+            return BYTES_CATALOG.unpack_partial(field_type, buffer, **kwargs)
+
+        if len(b) == 0:
+            raise ValueError("The end of the buffer reached but requires 1 bytes")
+        raise ValueError("Invalid byte")
 
     def pack_dict(self, type_, obj, **kwargs) -> Any:
         if obj is None:
@@ -226,11 +235,11 @@ class JsonBytesPodConverter(JsonPodConverter):
 
         return None
 
-    def pack_dict(self, type_, obj, **kwargs) -> Any:
-        return list(obj)
+    def pack_dict(self, type_, obj, bytes_encoding=None, **kwargs) -> Any:
+        return bytes_to_json(obj, bytes_encoding)
 
-    def unpack_dict(self, type_, obj, **kwargs) -> Any:
-        return bytes(obj)
+    def unpack_dict(self, type_, obj, bytes_encoding=None, **kwargs) -> Any:
+        return bytes_from_json(obj, bytes_encoding)
 
 
 class JsonListConverter(JsonPodConverter):
@@ -1,3 +1,4 @@
+import copyreg
 from dataclasses import dataclass
 from enum import _is_sunder, _is_dunder, _is_descriptor  # type: ignore
 from io import BytesIO
@@ -9,19 +10,28 @@ from typing import (
     Dict,
     Generic,
     TypeVar,
+    Union,
     get_args,
     get_origin,
 )
 
 from podite.bytes import BYTES_CATALOG
 from podite.core import POD_SELF_CONVERTER
+from podite.direct import bytes_to_dict_partial, dict_to_bytes_partial
+from podite.transcode import (
+    calc_max_size,
+    is_format_invariant,
+    pad_partial,
+    transcode_partial,
+)
+from podite.stream import scan_partial, scan_value
 from podite.decorators import (
     POD_OPTIONS,
     POD_OPTIONS_OVERRIDE,
     POD_OPTIONS_DATACLASS_FN,
 )
-from podite.json import JSON_CATALOG
-from .atomic import U8
+from podite.json import JSON_CATALOG, uses_json_plans
+from .atomic import U8, get_default_repr
 from .misc import static_from_bytes_partial, static_to_bytes_partial
 from .. import pod
 from .._utils import (
@@ -32,10 +42,17 @@ from .._utils import (
     FORMAT_ZERO_COPY,
     AutoTagTypeValueManager,
     FORMAT_TO_TYPE,
+    reduce_parametrized,
 )
 
 _VALUES_TO_NAMES = "__enum_values_to_names__"
 _NAMES_TO_VARIANTS = "__enum_names_to_variants__"
+_VALUES_TO_INSTANCES = "__enum_values_to_instances__"
+_TAG_TYPE = "__enum_tag_type__"
+_TAG_TABLE = "__enum_tag_table__"
+_TAG_BYTES = "__enum_tag_bytes__"
+_JSON_NAMES = "__enum_json_names__"
+_JSON_TABLE = "__enum_json_table__"
 
 ENUM_OPTIONS = "__enum_options__"
 ENUM_TAG_NAME = "json_tag_name"
@@ -95,6 +112,7 @@ class EnumMeta(type(Generic)):  # type: ignore
             variants[name] = variant
 
         values_to_names = {}
+        values_to_instances = {}
         for name, variant in variants.items():
             value = variant.value
 
@@ -105,9 +123,11 @@ class EnumMeta(type(Generic)):  # type: ignore
                 raise ValueError("Repeated value is not allowed in enums.")
 
             values_to_names[value] = name
+            values_to_instances[value] = instance
 
         setattr(cls, _VALUES_TO_NAMES, values_to_names)
         setattr(cls, _NAMES_TO_VARIANTS, variants)
+        setattr(cls, _VALUES_TO_INSTANCES, values_to_instances)
 
         return cls
 
@@ -115,8 +135,13 @@ class EnumMeta(type(Generic)):  # type: ignore
         if self == Enum:
             return self.__class_getitem__(item)
 
+        # fieldless instances are immutable, so the canonical one is shared
         variant = getattr(self, _NAMES_TO_VARIANTS)[item]
-        return self(variant.value)
+        return getattr(self, _VALUES_TO_INSTANCES)[variant.value]
+
+
+# enums created by a _GetitemToCall (e.g., Option[U32]) pickle by their parameters
+copyreg.pickle(EnumMeta, reduce_parametrized)
 
 
 @dataclass(init=False)
@@ -243,6 +268,12 @@ class Enum(int, Generic[TagType], metaclass=EnumMeta):  # type: ignore
         # TODO what is the right exception to raise?
         raise TypeError("Enum objects are immutable")
 
+    def __reduce__(self):
+        # fieldless instances are restored as the canonical instance of their variant
+        if self.field is None:
+            return getattr, (type(self), self.get_name())
+        return type(self), (int(self), self.field)
+
     @classmethod
     def _is_static(cls) -> bool:
         for variant in getattr(cls, _NAMES_TO_VARIANTS).values():
@@ -254,12 +285,9 @@ class Enum(int, Generic[TagType], metaclass=EnumMeta):  # type: ignore
     def _calc_size(cls, obj, format=FORMAT_BORSH, **kwargs):
         tag_type = cls.get_tag_type()
         val_size = BYTES_CATALOG.calc_size(tag_type, **kwargs)
-        max_field_size = 0
-        variant: Variant = cls._get_variant(obj.get_name())
-        if variant.field is not None:
-            return val_size + BYTES_CATALOG.calc_size(
-                variant.concrete_field_type, obj.field
-            )
+        _, field_type, _ = cls._get_tag_table()[int(obj)]
+        if field_type is not None:
+            return val_size + BYTES_CATALOG.calc_size(field_type, obj.field)
         return val_size
 
     @classmethod
@@ -300,42 +328,180 @@ class Enum(int, Generic[TagType], metaclass=EnumMeta):  # type: ignore
 
     @classmethod
     def _inner_to_bytes_partial(cls, buffer, instance, **kwargs):
-        BYTES_CATALOG.pack_partial(cls.get_tag_type(), buffer, instance, **kwargs)
+        tag = int(instance)
+        buffer.write(cls._get_tag_bytes(cls._get_concrete_tag_type())[tag])
 
-        variant: Variant = cls._get_variant(instance.get_name())
-        variant.to_bytes_partial(buffer, instance, **kwargs)
+        _, field_type, _ = cls._get_tag_table()[tag]
+        if field_type is not None:
+            BYTES_CATALOG.pack_partial(field_type, buffer, instance.field, **kwargs)
 
     @classmethod
     def _inner_from_bytes_partial(cls, buffer, **kwargs):
-        tag_type = cls.get_tag_type()
+        tag_type = cls._get_concrete_tag_type()
         tag = BYTES_CATALOG.unpack_partial(tag_type, buffer, **kwargs)
 
-        instance = cls(tag)
-        variant = cls._get_variant(instance.get_name())
-        return variant.from_bytes_partial(buffer, instance, **kwargs)
+        try:
+            _, field_type, instance = cls._get_tag_table()[tag]
+        except KeyError:
+            raise ValueError(f"Unknown tag {tag} for {cls.__name__}") from None
+
+        if field_type is None:
+            return instance
+
+        return cls(tag, BYTES_CATALOG.unpack_partial(field_type, buffer, **kwargs))
 
     @classmethod
-    def _transform_name(cls, name):
-        mapping = cls._get_json_tag_name_map()
-        mapping = resolve_name_mapping(mapping)
+    def _bytes_to_dict_partial(cls, buffer, format=FORMAT_BORSH, **kwargs):
+        if format == FORMAT_ZERO_COPY:
+            return static_from_bytes_partial(
+                cls._inner_bytes_to_dict_partial, cls, buffer, format=format, **kwargs
+            )
+        return cls._inner_bytes_to_dict_partial(buffer, format=format, **kwargs)
+
+    @classmethod
+    def _inner_bytes_to_dict_partial(cls, buffer, **kwargs):
+        tag_type = cls._get_concrete_tag_type()
+        tag = BYTES_CATALOG.unpack_partial(tag_type, buffer, **kwargs)
+
+        try:
+            variant, field_type, _ = cls._get_tag_table()[tag]
+        except KeyError:
+            raise ValueError(f"Unknown tag {tag} for {cls.__name__}") from None
+
+        field_json = None
+        if field_type is not None:
+            field_json = bytes_to_dict_partial(field_type, buffer, **kwargs)
+
+        return cls._variant_to_dict(variant, field_json)
+
+    @classmethod
+    def _is_format_invariant(cls) -> bool:
+        # padding is only written in zero-copy when variants have different sizes
+        if cls.get_tag_type() is AutoTagType:
+            return False
+
+        sizes = set()
+        for _, field_type, _ in cls._get_tag_table().values():
+            if field_type is None:
+                sizes.add(0)
+            elif BYTES_CATALOG.is_static(field_type) and is_format_invariant(
+                field_type
+            ):
+                sizes.add(BYTES_CATALOG.calc_max_size(field_type))
+            else:
+                return False
+
+        return len(sizes) <= 1
+
+    @classmethod
+    def _transcode_partial(cls, src, dst, src_ctx, dst_ctx):
+        src_start, dst_start = src.tell(), dst.tell()
+
+        src_tag_type = dst_tag_type = cls.get_tag_type()
+        if src_tag_type is AutoTagType:
+            src_tag_type, dst_tag_type = src_ctx[1], dst_ctx[1]
+
+        tag = BYTES_CATALOG.unpack_partial(src_tag_type, src)
+        try:
+            _, field_type, _ = cls._get_tag_table()[tag]
+        except KeyError:
+            raise ValueError(f"Unknown tag {tag} for {cls.__name__}") from None
+
+        dst.write(cls._get_tag_bytes(dst_tag_type)[tag])
+        if field_type is not None:
+            transcode_partial(field_type, src, dst, src_ctx, dst_ctx)
+
+        src_format, src_tag = src_ctx
+        dst_format, dst_tag = dst_ctx
+        pad_partial(
+            src,
+            dst,
+            src_start,
+            dst_start,
+            calc_max_size(cls, src_tag) if src_format == FORMAT_ZERO_COPY else None,
+            calc_max_size(cls, dst_tag) if dst_format == FORMAT_ZERO_COPY else None,
+        )
+
+    @classmethod
+    def _scan_partial(cls, ctx):
+        if ctx[0] == FORMAT_ZERO_COPY:
+            yield -calc_max_size(cls, ctx[1])
+            return
+
+        tag_type = cls.get_tag_type()
+        if tag_type is AutoTagType:
+            tag_type = ctx[1]
+
+        tag = yield from scan_value(tag_type, ctx)
+        try:
+            _, field_type, _ = cls._get_tag_table()[tag]
+        except KeyError:
+            raise ValueError(f"Unknown tag {tag} for {cls.__name__}") from None
+
+        if field_type is not None:
+            yield from scan_partial(field_type, ctx)
+
+    @classmethod
+    def _get_json_names(cls):
+        """
+        Returns a dict mapping member names to their names in json.
+        """
+        names = cls.__dict__.get(_JSON_NAMES)
+        if names is None:
+            mapping = resolve_name_mapping(cls._get_json_tag_name_map())
+            names = {name: mapping(name) for name in cls.get_member_names()}
+            setattr(cls, _JSON_NAMES, names)
+
+        return names
+
+    @classmethod
+    def _get_json_table(cls):
+        """
+        Returns a dict mapping names in json to the member name, its variant and whether the variant's field can
+        be read from a tagged dict that still contains the tag (i.e., when it is a dataclass whose compiled json
+        plans ignore unknown keys, possibly wrapped in Optional).
+        """
+        table = cls.__dict__.get(_JSON_TABLE)
+        if table is None:
+            table = {}
+            for name, json_name in cls._get_json_names().items():
+                variant = cls._get_variant(name)
+
+                field_type = variant.concrete_field_type
+                if get_origin(field_type) == Union:
+                    field_type = get_args(field_type)[0]
+                ignores_tag = uses_json_plans(field_type)
+
+                table.setdefault(json_name, (name, variant, ignores_tag))
+
+            setattr(cls, _JSON_TABLE, table)
 
-        return mapping(name)
+        return table
+
+    @classmethod
+    def _transform_name(cls, name):
+        return cls._get_json_names()[name]
 
     @classmethod
     def _inv_transform_name(cls, name):
-        for member_name in cls.get_member_names():
-            if cls._transform_name(member_name) == name:
-                return member_name
+        try:
+            member_name, _, _ = cls._get_json_table()[name]
+        except (KeyError, TypeError):
+            raise ValueError(
+                f"No member with name {name} was found in this enum."
+            ) from None
 
-        raise ValueError(f"No member with name {name} was found in this enum.")
+        return member_name
 
     @classmethod
     def _to_dict(cls, instance):
         variant: Variant = cls._get_variant(instance.get_name())
-        field_json = variant.to_dict(instance)
+        return cls._variant_to_dict(variant, variant.to_dict(instance))
 
+    @classmethod
+    def _variant_to_dict(cls, variant, field_json):
         name_key = cls._get_json_tag_name_key()
-        name_val = cls._transform_name(instance.get_name())
+        name_val = cls._transform_name(variant.name)
         if name_key is None:
             if variant.field is None:
                 return name_val
@@ -354,6 +520,15 @@ class Enum(int, Generic[TagType], metaclass=EnumMeta):  # type: ignore
 
     @classmethod
     def _from_dict(cls, raw):
+        member_name, variant, field_json = cls._parse_dict(raw)
+        instance = cls[member_name]
+        return variant.from_dict(instance, field_json)
+
+    @classmethod
+    def _parse_dict(cls, raw):
+        """
+        Returns the member name, the variant and the json of the field of an enum given in json.
+        """
         name_key = cls._get_json_tag_name_key()
         if name_key is None:
 
@@ -369,19 +544,47 @@ class Enum(int, Generic[TagType], metaclass=EnumMeta):  # type: ignore
                 )
         elif isinstance(raw, dict) and name_key in raw:
             transformed_name = raw[name_key]
-            field_json = dict(**raw)
-            del field_json[name_key]
-            if not field_json:
-                field_json = None
+            field_json = raw if len(raw) > 1 else None
         else:
             raise ValueError(
                 "Unknown input."
             )  # TODO do a better error handling in this case
 
-        member_name = cls._inv_transform_name(transformed_name)
-        instance = cls[member_name]
-        variant = cls._get_variant(instance.get_name())
-        return variant.from_dict(instance, field_json)
+        try:
+            member_name, variant, ignores_tag = cls._get_json_table()[transformed_name]
+        except (KeyError, TypeError):
+            raise ValueError(
+                f"No member with name {transformed_name} was found in this enum."
+            ) from None
+
+        if field_json is raw and not ignores_tag:
+            field_json = {key: val for key, val in raw.items() if key != name_key}
+
+        return member_name, variant, field_json
+
+    @classmethod
+    def _dict_to_bytes_partial(cls, buffer, raw, format=FORMAT_BORSH, **kwargs):
+        if format == FORMAT_ZERO_COPY:
+            static_to_bytes_partial(
+                cls._inner_dict_to_bytes_partial,
+                cls,
+                buffer,
+                raw,
+                format=format,
+                **kwargs,
+            )
+            return
+        cls._inner_dict_to_bytes_partial(buffer, raw, format=format, **kwargs)
+
+    @classmethod
+    def _inner_dict_to_bytes_partial(cls, buffer, raw, **kwargs):
+        _, variant, field_json = cls._parse_dict(raw)
+        buffer.write(cls._get_tag_bytes(cls._get_concrete_tag_type())[variant.value])
+
+        if variant.field is not None:
+            dict_to_bytes_partial(
+                variant.concrete_field_type, buffer, field_json, **kwargs
+            )
 
     @classmethod
     def get_options(cls):
@@ -389,15 +592,74 @@ class Enum(int, Generic[TagType], metaclass=EnumMeta):  # type: ignore
 
     @classmethod
     def get_tag_type(cls):
-        orig_bases = getattr(cls, "__orig_bases__")
+        tag_type = cls.__dict__.get(_TAG_TYPE)
+        if tag_type is not None:
+            return tag_type
+
+        # return the default tag type
+        tag_type = U8
 
         # when Enum[...] is a superclass of cls
-        for base in orig_bases:
+        for base in getattr(cls, "__orig_bases__"):
             if get_origin(base) == Enum:
-                return get_args(base)[0]
+                tag_type = get_args(base)[0]
+                break
 
-        # return the default tag type
-        return U8
+        setattr(cls, _TAG_TYPE, tag_type)
+        return tag_type
+
+    @classmethod
+    def _get_concrete_tag_type(cls):
+        tag_type = cls.get_tag_type()
+        if tag_type is AutoTagType:
+            return AutoTagTypeValueManager.get_tag()
+        return tag_type
+
+    @classmethod
+    def _get_tag_table(cls):
+        """
+        Returns a dict mapping each tag value to its variant, the concrete type of its field (None if it has no
+        field) and its canonical instance. It is built on first use so that variant fields may refer to types
+        defined after the enum.
+        """
+        table = cls.__dict__.get(_TAG_TABLE)
+        if table is None:
+            table = {}
+            instances = getattr(cls, _VALUES_TO_INSTANCES)
+            for variant in getattr(cls, _NAMES_TO_VARIANTS).values():
+                field_type = None
+                if variant.field is not None:
+                    field_type = variant.concrete_field_type
+                table[variant.value] = (variant, field_type, instances[variant.value])
+
+            setattr(cls, _TAG_TABLE, table)
+
+        return table
+
+    @classmethod
+    def _get_tag_bytes(cls, tag_type):
+        """
+        Returns a dict mapping each tag value to its encoding as tag_type.
+        Note: tag_type should be concrete, i.e., not AutoTagType
+        """
+        tag_bytes = cls.__dict__.get(_TAG_BYTES)
+        if tag_bytes is None:
+            tag_bytes = {}
+            setattr(cls, _TAG_BYTES, tag_bytes)
+
+        # the encoding of atoms without explicit byte order depends on the default one
+        key = (tag_type, get_default_repr())
+        encoded = tag_bytes.get(key)
+        if encoded is None:
+            encoded = {}
+            for value in getattr(cls, _VALUES_TO_NAMES):
+                buffer = BytesIO()
+                BYTES_CATALOG.pack_partial(tag_type, buffer, value)
+                encoded[value] = buffer.getvalue()
+
+            tag_bytes[key] = encoded
+
+        return encoded
 
     @classmethod
     def _get_json_tag_name_key(cls):
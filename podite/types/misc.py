@@ -2,9 +2,23 @@ from functools import partial
 from io import BytesIO
 from typing import Type
 
-from podite._utils import _GetitemToCall, get_calling_module, get_concrete_type
+from podite._utils import (
+    _GetitemToCall,
+    ParametrizedType,
+    TYPE_LOCK,
+    get_calling_module,
+    get_concrete_type,
+)
 from ..bytes import BYTES_CATALOG
 from ..decorators import pod
+from ..direct import bytes_to_dict_partial, dict_to_bytes_partial
+from ..transcode import (
+    calc_max_size,
+    is_format_invariant,
+    pad_partial,
+    transcode_partial,
+)
+from ..stream import scan_partial
 from ..json import JSON_CATALOG, MISSING
 
 
@@ -48,7 +62,7 @@ def _static(name, type_: Type, length="auto"):
     module = get_calling_module()
 
     @pod
-    class _Static:  # type: ignore
+    class _Static(metaclass=ParametrizedType):  # type: ignore
         @classmethod
         def _is_static(cls) -> bool:
             return True
@@ -78,6 +92,40 @@ def _static(name, type_: Type, length="auto"):
             f = partial(BYTES_CATALOG.unpack_partial, get_concrete_type(module, type_))
             return static_from_bytes_partial(f, cls, buffer, **kwargs)
 
+        @classmethod
+        def _bytes_to_dict_partial(cls, buffer, **kwargs):
+            f = partial(bytes_to_dict_partial, get_concrete_type(module, type_))
+            return static_from_bytes_partial(f, cls, buffer, **kwargs)
+
+        @classmethod
+        def _dict_to_bytes_partial(cls, buffer, raw, **kwargs):
+            static_to_bytes_partial(
+                partial(dict_to_bytes_partial, get_concrete_type(module, type_)),
+                cls,
+                buffer,
+                raw,
+                **kwargs,
+            )
+
+        @classmethod
+        def _is_format_invariant(cls) -> bool:
+            return is_format_invariant(get_concrete_type(module, type_))
+
+        @classmethod
+        def _transcode_partial(cls, src, dst, src_ctx, dst_ctx):
+            src_start, dst_start = src.tell(), dst.tell()
+            transcode_partial(
+                get_concrete_type(module, type_), src, dst, src_ctx, dst_ctx
+            )
+            pad_partial(
+                src,
+                dst,
+                src_start,
+                dst_start,
+                calc_max_size(cls, src_ctx[1]),
+                calc_max_size(cls, dst_ctx[1]),
+            )
+
         @classmethod
         def _to_dict(cls, obj):
             return JSON_CATALOG.pack(get_concrete_type(module, type_), obj)
@@ -99,7 +147,7 @@ def _default(name, type_: Type, default=None):
     module = get_calling_module()
 
     @pod(override=("from_bytes", "to_bytes"), dataclass_fn=None)
-    class _Default:  # type: ignore
+    class _Default(metaclass=ParametrizedType):  # type: ignore
         @classmethod
         def _is_static(cls) -> bool:
             return BYTES_CATALOG.is_static(get_concrete_type(module, type_))
@@ -123,6 +171,35 @@ def _default(name, type_: Type, default=None):
                 get_concrete_type(module, type_), buffer, **kwargs
             )
 
+        @classmethod
+        def _bytes_to_dict_partial(cls, buffer, **kwargs):
+            return bytes_to_dict_partial(
+                get_concrete_type(module, type_), buffer, **kwargs
+            )
+
+        @classmethod
+        def _dict_to_bytes_partial(cls, buffer, raw, **kwargs):
+            if raw is MISSING:
+                return cls._to_bytes_partial(buffer, cls._from_dict(raw), **kwargs)
+
+            dict_to_bytes_partial(
+                get_concrete_type(module, type_), buffer, raw, **kwargs
+            )
+
+        @classmethod
+        def _is_format_invariant(cls) -> bool:
+            return is_format_invariant(get_concrete_type(module, type_))
+
+        @classmethod
+        def _transcode_partial(cls, src, dst, src_ctx, dst_ctx):
+            transcode_partial(
+                get_concrete_type(module, type_), src, dst, src_ctx, dst_ctx
+            )
+
+        @classmethod
+        def _scan_partial(cls, ctx):
+            yield from scan_partial(get_concrete_type(module, type_), ctx)
+
         @classmethod
         def _to_dict(cls, obj):
             return JSON_CATALOG.pack(get_concrete_type(module, type_), obj)
@@ -150,17 +227,22 @@ def _forward_ref(name, type_expr):
     module = get_calling_module()
 
     @pod(override=("from_bytes", "to_bytes"), dataclass_fn=None)
-    class _ForwardRef:  # type: ignore
+    class _ForwardRef(metaclass=ParametrizedType):  # type: ignore
         type_ = None
 
         @classmethod
         def get_type(cls):
-            if cls.type_ is None:
-                cls.type_ = eval(
-                    type_expr, {key: getattr(module, key) for key in dir(module)}
-                )
-
-            return cls.type_
+            type_ = cls.type_
+            if type_ is None:
+                with TYPE_LOCK:
+                    if cls.type_ is None:
+                        cls.type_ = eval(
+                            type_expr,
+                            {key: getattr(module, key) for key in dir(module)},
+                        )
+                    type_ = cls.type_
+
+            return type_
 
         @classmethod
         def _is_static(cls) -> bool:
@@ -181,6 +263,27 @@ def _forward_ref(name, type_expr):
         def _from_bytes_partial(cls, buffer: BytesIO, **kwargs):
             return BYTES_CATALOG.unpack_partial(cls.get_type(), buffer, **kwargs)
 
+        @classmethod
+        def _bytes_to_dict_partial(cls, buffer, **kwargs):
+            return bytes_to_dict_partial(cls.get_type(), buffer, **kwargs)
+
+        @classmethod
+        def _dict_to_bytes_partial(cls, buffer, raw, **kwargs):
+            dict_to_bytes_partial(cls.get_type(), buffer, raw, **kwargs)
+
+        @classmethod
+        def _is_format_invariant(cls) -> bool:
+            # the referenced type may contain this one
+            return False
+
+        @classmethod
+        def _transcode_partial(cls, src, dst, src_ctx, dst_ctx):
+            transcode_partial(cls.get_type(), src, dst, src_ctx, dst_ctx)
+
+        @classmethod
+        def _scan_partial(cls, ctx):
+            yield from scan_partial(cls.get_type(), ctx)
+
         @classmethod
         def _to_dict(cls, obj):
             return JSON_CATALOG.pack(cls.get_type(), obj)
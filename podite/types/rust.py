@@ -1,10 +1,13 @@
 from typing import Type
 from functools import lru_cache
 
-from podite._utils import _GetitemToCall, get_calling_module
+from podite._utils import _GetitemToCall, get_calling_module, AutoTagTypeValueManager
 from .enum import Enum, Variant, AutoTagType
+from ..bytes import BYTES_CATALOG
 from ..decorators import pod
 
+_MAX_SIZES = "__option_max_sizes__"
+
 
 def _option(_name, type_: Type):
     @pod
@@ -12,6 +15,53 @@ def _option(_name, type_: Type):
         NONE = Variant()
         SOME = Variant(field=type_, module=get_calling_module(4))
 
+        # Options are decoded much more often than any other enum, so they skip the generic variant dispatch and
+        # compare the raw tag against the cached encodings of NONE and SOME instead.
+
+        @classmethod
+        def _calc_max_size(cls):
+            tag_type = AutoTagTypeValueManager.get_tag()
+            max_sizes = cls.__dict__.get(_MAX_SIZES)
+            if max_sizes is None:
+                max_sizes = {}
+                setattr(cls, _MAX_SIZES, max_sizes)
+
+            max_size = max_sizes.get(tag_type)
+            if max_size is None:
+                max_size = super()._calc_max_size()
+                max_sizes[tag_type] = max_size
+
+            return max_size
+
+        @classmethod
+        def _inner_to_bytes_partial(cls, buffer, instance, **kwargs):
+            tag = int(instance)
+            buffer.write(cls._get_tag_bytes(AutoTagTypeValueManager.get_tag())[tag])
+            if tag:
+                _, field_type, _ = cls._get_tag_table()[1]
+                BYTES_CATALOG.pack_partial(field_type, buffer, instance.field, **kwargs)
+
+        @classmethod
+        def _inner_from_bytes_partial(cls, buffer, **kwargs):
+            tag_bytes = cls._get_tag_bytes(AutoTagTypeValueManager.get_tag())
+            none_tag = tag_bytes[0]
+
+            tag = buffer.read(len(none_tag))
+            if tag == none_tag:
+                return cls.NONE
+
+            if tag == tag_bytes[1]:
+                _, field_type, _ = cls._get_tag_table()[1]
+                return cls(
+                    1, BYTES_CATALOG.unpack_partial(field_type, buffer, **kwargs)
+                )
+
+            if len(tag) < len(none_tag):
+                raise ValueError(
+                    f"The end of the buffer reached but requires {len(none_tag)} bytes"
+                )
+            raise ValueError(f"Invalid tag {tag} for {cls.__name__}")
+
     _Option.__name__ = f"Option[{type_}]"
     _Option.__qualname__ = _Option.__name__
 
@@ -1,3 +1,5 @@
+import io
+
 from podite import (
     FixedLenArray,
     FixedLenBytes,
@@ -10,7 +12,18 @@ from podite import (
     pod,
     Bool,
     U8,
+    LazyArray,
+    U16b,
+    U128,
+    U128b,
+    I128,
+    I128b,
+    FORMAT_BORSH,
+    FORMAT_ZERO_COPY,
+    BytesJsonEncodingManager,
+    JSON_CATALOG,
 )
+from podite.json import b58encode, b58decode
 
 
 def test_bytes_fixed_len_array():
@@ -145,6 +158,23 @@ def test_bytes_str():
     assert actual == expect
 
 
+def test_bytes_str_non_ascii():
+    type_ = Str[10]
+    raw = type_.to_bytes("ünï")
+
+    assert raw == bytes([5, 0, 0, 0]) + "ünï".encode("utf-8")
+    assert type_.calc_size("ünï") == len(raw)
+    assert type_.from_bytes(raw) == "ünï"
+
+    # the max length is in bytes
+    try:
+        type_.to_bytes("ü" * 6)
+    except RuntimeError:
+        pass
+    else:
+        assert False
+
+
 def test_bytes_fix_len_array_with_forward_ref_global():
     type_ = FixedLenArray["Element", 2]
 
@@ -169,3 +199,223 @@ def test_bytes_fix_len_array_with_forward_ref_global():
 class Element:
     a: U8
     b: U32
+
+
+def test_bytes_vec_in_dataclass_is_not_static():
+    @pod
+    class A:
+        x: U8
+        y: Vec[U8, 3]
+
+    assert not A.is_static()
+
+
+def test_bytes_fixed_len_array_lazy():
+    type_ = FixedLenArray[Element, 1000]
+
+    raw = b"".join(Element.to_bytes(Element(i % 256, i)) for i in range(1000))
+    actual = type_.from_bytes(raw, lazy=True)
+
+    assert isinstance(actual, LazyArray)
+    assert len(actual) == 1000
+    assert actual[3] == Element(3, 3)
+    assert actual[-1] == Element(999 % 256, 999)
+    assert actual[10:13] == [Element(i, i) for i in range(10, 13)]
+    assert actual[10:13][-1] == Element(12, 12)
+    assert actual[:6:2] == [Element(i, i) for i in range(0, 6, 2)]
+    assert actual == type_.from_bytes(raw)
+
+    try:
+        actual[1000]
+        assert False
+    except IndexError:
+        pass
+
+
+def test_bytes_vec_lazy():
+    @pod
+    class A:
+        x: U16
+        y: Vec[U32, 100]
+        z: U16
+
+    a = A(1, list(range(50)), 2)
+    actual = A.from_bytes(A.to_bytes(a), lazy=True)
+
+    assert isinstance(actual.y, LazyArray)
+    assert list(actual.y[45:]) == list(range(45, 50))
+    assert actual.z == 2
+    assert actual == a
+    assert A.to_bytes(actual) == A.to_bytes(a)
+
+
+@pod(dataclass_fn=None)
+class Scaled:
+    @classmethod
+    def _is_static(cls):
+        return True
+
+    @classmethod
+    def _calc_max_size(cls):
+        return 1
+
+    @classmethod
+    def _from_bytes_partial(cls, buffer, scale=1, **kwargs):
+        return buffer.read(1)[0] * scale
+
+
+def test_bytes_lazy_forwards_kwargs():
+    elems = b"\x01\x02\x03"
+    for type_, raw in (
+        (FixedLenArray[Scaled, 3], elems),
+        (Vec[Scaled, 3], b"\x03\x00\x00\x00" + elems),
+    ):
+        actual = type_.from_bytes(raw, lazy=True, scale=2)
+        assert isinstance(actual, LazyArray)
+        assert list(actual) == [2, 4, 6]
+
+
+def test_bytes_vec_lazy_non_static_element():
+    type_ = Vec[Str[10], 10]
+
+    raw = type_.to_bytes(["a", "bc"])
+    assert type_.from_bytes(raw, lazy=True) == ["a", "bc"]
+
+
+@pod
+class Order:
+    price: U32
+    size: U16
+
+
+@pod
+class Book:
+    header: Str[10]
+    count: U16
+    orders: FixedLenArray[Order, 64]
+    extra: Vec[Order, 10]
+
+
+def test_bytes_bisect():
+    orders = [Order(2 * i, i) for i in range(64)]
+    book = Book("book", 64, orders, [Order(1, 1), Order(3, 3), Order(3, 4)])
+
+    for format in (FORMAT_BORSH, FORMAT_ZERO_COPY):
+        raw = Book.to_bytes(book, format=format)
+
+        assert Book.bisect(raw, "orders", "price", 10) == 5
+        assert Book.bisect(raw, "orders", "price", 11) == 6
+        assert Book.bisect(raw, "orders", "price", 10, side="right") == 6
+        assert Book.bisect(raw, "orders", "price", 1000) == 64
+        assert Book.bisect(raw, "extra", "price", 3) == 1
+        assert Book.bisect(raw, "extra", "price", 3, side="right") == 3
+
+        assert Book.find_sorted(raw, "orders", "price", 10) == Order(10, 5)
+        assert Book.find_sorted(raw, "orders", "price", 11) is None
+        assert Book.find_sorted(raw, "orders", "price", 1000) is None
+        assert Book.find_sorted(raw, "extra", "price", 3) == Order(3, 3)
+
+
+def test_bytes_bisect_array_of_atoms():
+    type_ = FixedLenArray[U32, 5]
+    raw = type_.to_bytes([1, 4, 9, 16, 25])
+
+    assert type_.bisect(raw, "", "", 9) == 2
+    assert type_.find_sorted(raw, "", "", 16) == 16
+
+
+def test_bytes_int128_arrays():
+    values = [0, 1, 2**64 - 1, 2**64, 2**127 - 1, 2**128 - 1, 12345 << 70]
+    signed = [0, -1, 2**63, -(2**64), -(2**127), 2**127 - 1, -12345 << 70]
+
+    for type_, vals in (
+        (U128, values),
+        (U128b, values),
+        (I128, signed),
+        (I128b, signed),
+    ):
+        raw = b"".join(type_.to_bytes(v) for v in vals)
+
+        array = FixedLenArray[type_, len(vals)].from_bytes(raw)
+        assert array == vals
+
+        vec = Vec[type_, 10]
+        assert vec.from_bytes(vec.to_bytes(vals)) == vals
+
+        halves = FixedLenArray[type_, len(vals)].from_bytes(raw, int128_mode="halves")
+        assert [(hi << 64) + lo for hi, lo in halves] == vals
+
+        floats = vec.from_bytes(vec.to_bytes(vals), int128_mode="float")
+        assert floats == [float(v) for v in vals]
+
+
+def test_bytes_atomic_array_bulk():
+    type_ = FixedLenArray[Bool, 3]
+    assert type_.from_bytes(b"\x01\x00\x01") == [True, False, True]
+
+    type_ = Vec[U16b, 3]
+    assert type_.from_bytes(b"\x02\x00\x00\x00\x01\x02\x03\x04") == [258, 772]
+
+
+def test_bytes_json_encodings():
+    @pod
+    class Account:
+        key: FixedLenBytes[4, "base58"]
+        blob: Bytes[10]
+
+    obj = Account(b"\x00\x00\x01\x02", b"\xff\x00")
+
+    assert Account.to_dict(obj) == {"key": "115T", "blob": [255, 0]}
+    assert Account.to_dict(obj, bytes_encoding="hex") == {"key": "115T", "blob": "ff00"}
+
+    encoded = Account.to_dict(obj, bytes_encoding="base64")
+    assert encoded["blob"] == "/wA="
+    assert Account.from_dict(encoded, bytes_encoding="base64") == obj
+    assert Account.from_dict({"key": [0, 0, 1, 2], "blob": [255, 0]}) == obj
+
+    with BytesJsonEncodingManager("hex"):
+        assert Account.from_dict({"key": "115T", "blob": "ff00"}) == obj
+
+    raw = Account.to_bytes(obj)
+    assert Account.bytes_to_dict(raw, bytes_encoding="hex") == Account.to_dict(
+        obj, bytes_encoding="hex"
+    )
+    assert Account.dict_to_bytes(encoded, bytes_encoding="base64") == raw
+
+    assert JSON_CATALOG.pack(bytes, b"ab") == [97, 98]
+    assert JSON_CATALOG.pack(bytes, b"ab", bytes_encoding="hex") == "6162"
+    assert JSON_CATALOG.unpack(bytes, "6162", bytes_encoding="hex") == b"ab"
+
+    try:
+        Account.from_dict({"key": "115T", "blob": "ff00"})
+    except ValueError:
+        pass
+    else:
+        assert False
+
+    # invalid encodings are rejected when they are set rather than on first use
+    for fail in [
+        lambda: FixedLenBytes[4, "base32"],
+        lambda: Bytes[10, U32, "base32"],
+        lambda: Account.iter_ndjson(io.StringIO(""), bytes_encoding="base32"),
+    ]:
+        try:
+            fail()
+        except ValueError:
+            pass
+        else:
+            assert False
+
+
+def test_base58():
+    assert b58encode(b"hello world") == "StV1DL6CwTryKyV"
+    assert b58decode("StV1DL6CwTryKyV") == b"hello world"
+    assert b58decode(b58encode(b"\x00\x00\xff")) == b"\x00\x00\xff"
+    assert b58encode(b"") == ""
+
+    try:
+        b58decode("0OIl")
+    except ValueError:
+        pass
+    else:
+        assert False
@@ -0,0 +1,170 @@
+from array import array
+
+from podite import (
+    pod,
+    U8,
+    U16,
+    I32,
+    U32b,
+    U128,
+    Bool,
+    Str,
+    Option,
+    FixedLenArray,
+    FORMAT_BORSH,
+    FORMAT_ZERO_COPY,
+    PodPathError,
+)
+
+
+@pod
+class Inner:
+    a: U16
+    b: Bool
+
+
+@pod
+class Record:
+    x: I32
+    inner: Inner
+    big: U128
+
+
+@pod
+class Dynamic:
+    name: Str[10]
+    value: Option[U16]
+    values: FixedLenArray[U8, 2]
+    inner: Inner
+
+
+def test_bytes_columns_static():
+    records = [Record(-i, Inner(i, i % 2 == 0), 2**100 + i) for i in range(5)]
+    columns = Record.from_bytes_columns([Record.to_bytes(r) for r in records])
+
+    assert list(columns) == ["x", "inner.a", "inner.b", "big"]
+    assert columns["x"] == array("i", [-i for i in range(5)])
+    assert columns["inner.a"] == array("H", range(5))
+    assert columns["inner.b"] == [True, False, True, False, True]
+    assert columns["big"] == [2**100 + i for i in range(5)]
+
+
+def test_bytes_columns_mixed_byte_order():
+    @pod
+    class A:
+        x: U8
+        y: U32b
+
+    columns = A.from_bytes_columns([A.to_bytes(A(i, i * 1000)) for i in range(3)])
+
+    assert columns["x"] == array("B", [0, 1, 2])
+    assert columns["y"] == array("I", [0, 1000, 2000])
+
+
+def test_bytes_columns_dynamic():
+    option = Option[U16]
+    records = [
+        Dynamic("a", option.NONE, [1, 2], Inner(3, True)),
+        Dynamic("bcd", option.SOME(5), [3, 4], Inner(6, False)),
+    ]
+
+    for format in (None, FORMAT_ZERO_COPY):
+        kwargs = {} if format is None else dict(format=format)
+        raw = [Dynamic.to_bytes(r, **kwargs) for r in records]
+        columns = Dynamic.from_bytes_columns(raw, **kwargs)
+
+        assert columns["name"] == ["a", "bcd"]
+        assert columns["value"] == [option.NONE, option.SOME(5)]
+        assert columns["values"] == [[1, 2], [3, 4]]
+        assert columns["inner.a"] == array("H", [3, 6])
+        assert columns["inner.b"] == [True, False]
+
+
+def test_bytes_columns_empty():
+    assert Record.from_bytes_columns([]) == {
+        "x": array("i"),
+        "inner.a": array("H"),
+        "inner.b": [],
+        "big": [],
+    }
+
+
+def test_bytes_columns_pack_static():
+    records = [Record(-i, Inner(i, i % 2 == 0), 2**100 + i) for i in range(5)]
+    columns = dict(
+        x=array("i", [-i for i in range(5)]),
+        big=[2**100 + i for i in range(5)],
+    )
+    columns["inner.a"] = list(range(5))
+    columns["inner.b"] = [i % 2 == 0 for i in range(5)]
+
+    expect = [Record.to_bytes(r) for r in records]
+    assert Record.to_bytes_columns(columns, concat=False) == expect
+    assert Record.to_bytes_columns(columns) == b"".join(expect)
+    assert Record.from_bytes_columns(Record.to_bytes_columns(columns, concat=False))[
+        "big"
+    ] == list(columns["big"])
+
+
+def test_bytes_columns_pack_dynamic():
+    option = Option[U16]
+    records = [
+        Dynamic("a", option.NONE, [1, 2], Inner(3, True)),
+        Dynamic("bcd", option.SOME(5), [3, 4], Inner(6, False)),
+    ]
+    columns = {
+        "name": ["a", "bcd"],
+        "value": [option.NONE, option.SOME(5)],
+        "values": [[1, 2], [3, 4]],
+        "inner.a": array("H", [3, 6]),
+        "inner.b": [True, False],
+    }
+
+    for format in (FORMAT_BORSH, FORMAT_ZERO_COPY):
+        expect = [Dynamic.to_bytes(r, format=format) for r in records]
+        actual = Dynamic.to_bytes_columns(columns, format=format, concat=False)
+        assert actual == expect
+        assert Dynamic.to_bytes_columns(columns, format=format) == b"".join(expect)
+
+
+def test_bytes_columns_pack_errors():
+    try:
+        Record.to_bytes_columns({"x": [1]})
+        assert False
+    except ValueError as e:
+        assert "Missing columns" in str(e)
+
+    columns = {"name": ["a"], "value": [None], "values": [[1, 2]]}
+    columns.update({"inner.a": [1], "inner.b": [True]})
+    try:
+        Dynamic.to_bytes_columns(columns)
+        assert False
+    except PodPathError as e:
+        assert e.path == ["value", "Dynamic"]
+
+
+def test_bytes_columns_wrong_row_length():
+    raw = [Record.to_bytes(Record(-i, Inner(i, True), i)) for i in range(3)]
+    for invalid in (raw[1][:-1], raw[1] + b"\x00"):
+        try:
+            Record.from_bytes_columns([raw[0], invalid, raw[2]])
+            assert False
+        except PodPathError as e:
+            assert e.path == ["Record"]
+            assert "row 1" in str(e)
+
+    option = Option[U16]
+    raw = Dynamic.to_bytes(Dynamic("a", option.NONE, [1, 2], Inner(3, True)))
+    try:
+        Dynamic.from_bytes_columns([raw, raw[:-1]], format=FORMAT_BORSH)
+        assert False
+    except PodPathError as e:
+        assert e.path == ["b", "inner", "Dynamic"]
+        assert "row 1" in str(e)
+
+    try:
+        Dynamic.from_bytes_columns([raw + b"\x00"], format=FORMAT_BORSH)
+        assert False
+    except PodPathError as e:
+        assert e.path == ["Dynamic"]
+        assert "row 0" in str(e)
@@ -1,6 +1,14 @@
+import io
+import json
+import os
+import tempfile
+from typing import Optional
+
 from podite.decorators import pod
 from podite.json import POD_OPTIONS_RENAME
 from podite.types.atomic import I8, I16, U8, I32, U128
+from podite.types.array import Vec
+from podite._utils import FORMAT_ZERO_COPY
 
 
 def test_bytes_simple():
@@ -21,6 +29,29 @@ def test_bytes_simple():
     assert a1 == a2
 
 
+def test_bytes_pack_into():
+    @pod
+    class A:
+        x: I16
+        y: Vec[U8, 4]
+
+    a = A(x=5, y=[1, 2])
+    buffer = bytearray(b"\xff" * 30)
+    assert A.pack_into(buffer, 3, a) == A.calc_size(a)
+    assert buffer[3 : 3 + A.calc_size(a)] == A.to_bytes(a)
+    assert buffer[:3] == b"\xff" * 3
+
+    size = A.pack_into(buffer, 10, a, format=FORMAT_ZERO_COPY)
+    assert buffer[10 : 10 + size] == A.to_bytes(a, format=FORMAT_ZERO_COPY)
+
+    try:
+        A.pack_into(buffer, 28, a)
+    except Exception:
+        pass
+    else:
+        assert False
+
+
 def test_json_simple():
     @pod
     class A:
@@ -83,3 +114,63 @@ def test_json_name_fields():
 
     assert A.to_dict(a) == dict(X=5, Y=18)
     assert a == A.from_dict(dict(X=5, Y=18))
+
+
+def test_json_nested_plans():
+    @pod
+    class Inner:
+        __pod_options__ = {POD_OPTIONS_RENAME: "upper"}
+        a: U8
+        b: Optional[I16] = None
+
+    @pod
+    class Outer:
+        x: I8
+        inner: Inner
+        inners: list[Inner]
+
+    @pod
+    class Derived(Outer):
+        y: I32 = 7
+
+    outer = Outer(1, Inner(2, 3), [Inner(4), Inner(5, -6)])
+    raw = dict(
+        x=1,
+        inner=dict(A=2, B=3),
+        inners=[dict(A=4, B=None), dict(A=5, B=-6)],
+    )
+
+    assert Outer.to_dict(outer) == raw
+    assert Outer.from_dict(raw) == outer
+    assert Inner.from_dict(dict(A=9)) == Inner(9)
+
+    derived = Derived(1, Inner(2, 3), [], 8)
+    assert Derived.to_dict(derived) == dict(x=1, inner=dict(A=2, B=3), inners=[], y=8)
+    assert Derived.from_dict(dict(x=1, inner=dict(A=2, B=3), inners=[])) == Derived(
+        1, Inner(2, 3), []
+    )
+
+
+def test_json_files():
+    @pod
+    class A:
+        x: I16
+        y: Optional[U8] = None
+        __pod_options__ = {POD_OPTIONS_RENAME: "upper"}
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "a.json")
+        A.to_dict_file(filename, A(1, 2))
+        with open(filename) as f:
+            assert json.load(f) == dict(X=1, Y=2)
+        assert A.from_dict_file(filename) == A(1, 2)
+
+    objs = (A(i, i % 2 or None) for i in range(5))
+    fileobj = io.StringIO()
+    assert A.to_ndjson(objs, fileobj) == 5
+
+    lines = fileobj.getvalue().splitlines()
+    assert lines[:2] == ['{"X":0,"Y":null}', '{"X":1,"Y":1}']
+
+    fileobj = io.StringIO(fileobj.getvalue() + "\n")
+    assert list(A.iter_ndjson(fileobj)) == [A(i, i % 2 or None) for i in range(5)]
@@ -0,0 +1,156 @@
+from typing import Optional, Tuple
+
+from podite import (
+    pod,
+    U8,
+    U16,
+    U64,
+    I128,
+    Bool,
+    Str,
+    Bytes,
+    Vec,
+    FixedLenArray,
+    FixedLenStr,
+    Option,
+    Static,
+    Enum,
+    Variant,
+    AutoTagType,
+    FORMAT_BORSH,
+    FORMAT_ZERO_COPY,
+    PodPathError,
+)
+from podite.json import POD_OPTIONS_RENAME
+from podite.types.enum import ENUM_TAG_NAME, ENUM_TAG_NAME_MAP
+
+
+@pod
+class Point:
+    x: U16
+    y: U16
+
+
+@pod
+class Kind(Enum[AutoTagType]):
+    EMPTY = None
+    POINT = Variant(field=Point)
+    COUNT = Variant(field=U64)
+
+
+@pod
+class Shape(Enum[U8]):
+    __enum_options__ = {ENUM_TAG_NAME: "type", ENUM_TAG_NAME_MAP: "lower"}
+
+    DOT = None
+    LINE = Variant(field=Point)
+
+
+@pod
+class Record:
+    __pod_options__ = {POD_OPTIONS_RENAME: "upper"}
+
+    record_id: U64
+    big_value: I128
+    label: FixedLenStr[8]
+    points: FixedLenArray[Point, 2]
+    kind: Kind
+    maybe: Option[U16]
+    flag: Optional[Bool]
+
+
+@pod
+class Dynamic:
+    name: Str[16]
+    data: Bytes[8]
+    values: Vec[U16]
+    shapes: Vec[Shape]
+    pair: Tuple[U8, Point]
+    padded: Static[Str[4], 8]
+
+
+def make_record():
+    return Record(
+        record_id=7,
+        big_value=-(2**100),
+        label="abc",
+        points=[Point(1, 2), Point(3, 4)],
+        kind=Kind.POINT(Point(5, 6)),
+        maybe=Option[U16].SOME(9),
+        flag=None,
+    )
+
+
+def test_bytes_to_dict_matches_to_dict():
+    for format in [FORMAT_BORSH, FORMAT_ZERO_COPY]:
+        raw = Record.to_bytes(make_record(), format=format)
+        expected = Record.to_dict(Record.from_bytes(raw, format=format))
+
+        assert Record.bytes_to_dict(raw, format=format) == expected
+
+    raw = Record.to_bytes(make_record())
+    assert Record.bytes_to_dict(raw) == Record.to_dict(Record.from_bytes(raw))
+
+
+def test_bytes_to_dict_dynamic():
+    obj = Dynamic(
+        name="hello",
+        data=b"\x01\x02",
+        values=[1, 2, 3],
+        shapes=[Shape.DOT, Shape.LINE(Point(7, 8))],
+        pair=(1, Point(2, 3)),
+        padded="ab",
+    )
+    raw = Dynamic.to_bytes(obj)
+
+    actual = Dynamic.bytes_to_dict(raw)
+    assert actual == Dynamic.to_dict(Dynamic.from_bytes(raw))
+    assert actual["shapes"] == [{"type": "dot"}, {"type": "line", "x": 7, "y": 8}]
+
+
+def test_bytes_to_dict_error_path():
+    raw = Record.to_bytes(make_record())
+
+    try:
+        Record.bytes_to_dict(raw[:20], format=FORMAT_BORSH)
+    except PodPathError as e:
+        assert e.path[::-1] == ["Record", "big_value"]
+    else:
+        assert False
+
+
+@pod
+class Order:
+    __pod_options__ = {POD_OPTIONS_RENAME: "upper"}
+
+    side: Shape
+    prices: Vec[U64]
+    note: Optional[Str[8]]
+    count: U16 = 3
+
+
+def test_dict_to_bytes_matches_to_bytes():
+    raw = Record.to_dict(make_record())
+
+    for format in [FORMAT_BORSH, FORMAT_ZERO_COPY]:
+        expected = Record.to_bytes(Record.from_dict(raw), format=format)
+        assert Record.dict_to_bytes(raw, format=format) == expected
+
+
+def test_dict_to_bytes_defaults_and_enums():
+    raw = {"SIDE": {"type": "line", "x": 1, "y": 2}, "PRICES": [5, 6], "NOTE": None}
+
+    actual = Order.dict_to_bytes(raw)
+    assert actual == Order.to_bytes(Order.from_dict(raw))
+    assert Order.from_bytes(actual).count == 3
+
+
+def test_dict_to_bytes_error_path():
+    raw = {"SIDE": {"type": "dot"}, "PRICES": [5, -1], "NOTE": None}
+
+    try:
+        Order.dict_to_bytes(raw)
+    except PodPathError as e:
+        assert e.path[::-1] == ["Order", "prices"]
+    else:
+        assert False
@@ -204,3 +204,100 @@ def test_enum_instances_eq():
 
     assert A1.APPLE == A2.APPLE
     assert A1.INT(1) == A1.INT(1)
+
+
+def test_bytes_enum_unknown_tag():
+    @pod
+    class A(Enum[U16]):
+        X = None
+        Y = Variant(field=U8)
+
+    assert A.get_tag_type() == U16
+    assert A.from_bytes(b"\x01\x00\x07") == A.Y(7)
+
+    try:
+        A.from_bytes(b"\x05\x00")
+        assert False
+    except ValueError as e:
+        assert "Unknown tag 5" in str(e)
+
+
+def test_bytes_enum_with_forward_ref_field():
+    @pod
+    class A(Enum):
+        X = None
+        Y = Variant(field="LaterDefined")
+
+    assert A.to_bytes(A.Y(LaterDefined(3))) == b"\x01\x03\x00"
+    assert A.from_bytes(b"\x01\x03\x00") == A.Y(LaterDefined(3))
+
+
+@pod
+class LaterDefined:
+    a: U16
+
+
+def test_enum_fieldless_instances_are_interned():
+    @pod
+    class A(Enum[AutoTagType]):
+        X = None
+        Y = Variant(field=U8)
+
+    assert A.from_bytes(b"\x00") is A.X
+    assert A.from_bytes(bytes(9), format=FORMAT_ZERO_COPY) is A.X
+    assert A.from_dict("X") is A.X
+    assert A["X"] is A.X
+    assert A.from_bytes(b"\x01\x05") == A.Y(5)
+    assert A.from_bytes(b"\x01\x05") is not A.Y
+
+
+def test_json_enum_tagged_with_name_map():
+    t = named_fields(b=int, c=str)
+
+    @pod
+    class Inner(Enum):
+        __enum_options__ = {ENUM_TAG_NAME: "inner"}
+        P = None
+        Q = Variant(field=Optional[t])
+
+    @pod
+    class B(Enum):
+        __enum_options__ = {ENUM_TAG_NAME: "kind", ENUM_TAG_NAME_MAP: "lower"}
+        X = None
+        Y = Variant(field=t)
+        Z = Variant(field=Inner)
+
+    raw = dict(kind="y", b=5, c="s")
+    assert B.from_dict(raw) == B.Y(t(b=5, c="s"))
+    assert raw == dict(kind="y", b=5, c="s")
+    assert B.to_dict(B.Y(t(b=5, c="s"))) == raw
+
+    assert B.from_dict(dict(kind="x")) is B.X
+    assert B.from_dict(dict(kind="z", inner="Q")) == B.Z(Inner.Q)
+    assert B.from_dict(dict(kind="z", inner="Q", b=1, c="d")) == B.Z(Inner.Q(t(1, "d")))
+
+    try:
+        B.from_dict(dict(kind="X"))
+        assert False
+    except ValueError as e:
+        assert "No member with name X" in str(e)
+
+
+def test_json_enum_tagged_strips_tag_for_custom_from_dict():
+    @pod
+    class Point:
+        x: int
+        y: int
+
+        @classmethod
+        def _from_dict(cls, raw):
+            assert set(raw) == {"x", "y"}
+            return cls(raw["x"], raw["y"])
+
+    @pod
+    class B(Enum):
+        __enum_options__ = {ENUM_TAG_NAME: "kind"}
+        X = None
+        Y = Variant(field=Point)
+
+    assert B.from_dict(dict(kind="Y", x=1, y=2)) == B.Y(Point(1, 2))
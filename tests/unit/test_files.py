@@ -0,0 +1,175 @@
+import io
+
+import pytest
+
+from podite import (
+    pod,
+    U32,
+    U64,
+    Str,
+    Vec,
+    Enum,
+    Variant,
+    AutoTagType,
+    PodFile,
+    LazyArray,
+    FORMAT_ZERO_COPY,
+)
+
+
+@pod
+class Fill(Enum[AutoTagType]):
+    NONE = None
+    SOME = Variant(field=U32)
+
+
+@pod
+class Account:
+    id: U64
+    balance: U32
+    fill: Fill
+
+
+def make_accounts(n):
+    return [Account(i, 10 * i, Fill.SOME(i) if i % 2 else Fill.NONE) for i in range(n)]
+
+
+def test_write_and_read(tmp_path):
+    path = tmp_path / "accounts.bin"
+    accounts = make_accounts(50)
+
+    with PodFile(Account, path, "w") as f:
+        assert len(f) == 0
+        f.extend(accounts[:40])
+        for account in accounts[40:]:
+            f.append(account)
+
+    assert path.stat().st_size == 50 * Account.calc_max_size()
+    raw = path.read_bytes()
+    assert raw[: f.record_size] == Account.to_bytes(
+        accounts[0], format=FORMAT_ZERO_COPY
+    )
+
+    with PodFile(Account, path) as f:
+        assert len(f) == 50
+        assert f[7] == accounts[7]
+        assert f[-1] == accounts[-1]
+        assert list(f) == accounts
+        assert f[::10] == accounts[::10]
+
+        view = f[10:20]
+        assert len(view) == 10
+        assert view[3] == accounts[13]
+        assert view == accounts[10:20]
+
+        with pytest.raises(IndexError):
+            f[50]
+        with pytest.raises(io.UnsupportedOperation):
+            f[0] = accounts[1]
+
+
+def test_update_in_place(tmp_path):
+    path = tmp_path / "accounts.bin"
+    accounts = make_accounts(10)
+    with PodFile(Account, path, "w") as f:
+        f.extend(accounts)
+
+    with PodFile(Account, path, "r+") as f:
+        f[3] = Account(3, 99, Fill.NONE)
+        f[5:7] = [accounts[0], accounts[1]]
+        with pytest.raises(ValueError):
+            f[0:2] = [accounts[0]]
+
+    with PodFile(Account, path) as f:
+        assert f[3] == Account(3, 99, Fill.NONE)
+        assert f[5:7] == accounts[:2]
+        assert f[8] == accounts[8]
+
+
+def test_slice_then_append(tmp_path):
+    path = tmp_path / "accounts.bin"
+    accounts = make_accounts(10)
+    with PodFile(Account, path, "w") as f:
+        f.extend(accounts[:5])
+        view = f[1:4]
+        f.append(accounts[5])
+        f.extend(accounts[6:])
+
+        assert view == accounts[1:4]
+        assert list(f) == accounts
+
+
+def test_slice_then_close(tmp_path):
+    path = tmp_path / "accounts.bin"
+    accounts = make_accounts(10)
+    with PodFile(Account, path, "w") as f:
+        f.extend(accounts)
+
+    f = PodFile(Account, path)
+    view = f[2:8]
+    assert len(view) == 6
+    f.close()
+
+    assert f.closed
+    # views read through the file rather than copying or pinning its map
+    with pytest.raises(ValueError):
+        view[0]
+
+
+def test_slices_read_through(tmp_path):
+    path = tmp_path / "accounts.bin"
+    accounts = make_accounts(10)
+    with PodFile(Account, path, "w") as f:
+        f.extend(accounts)
+        view = f[2:8]
+        empty = f[8:2]
+
+        f[3] = accounts[0]
+        assert view[1] == accounts[0]
+        assert view[2:4] == accounts[4:6]
+
+        assert isinstance(view, LazyArray)
+        assert isinstance(empty, LazyArray)
+        assert len(empty) == 0
+        assert empty == []
+
+
+def test_failed_writes_leave_file_unchanged(tmp_path):
+    path = tmp_path / "accounts.bin"
+    accounts = make_accounts(10)
+    invalid = Account(10, -1, Fill.NONE)
+    with PodFile(Account, path, "w") as f:
+        f.extend(accounts)
+
+        with pytest.raises(Exception):
+            f[3] = invalid
+        with pytest.raises(Exception):
+            f[4:6] = [accounts[0], invalid]
+        with pytest.raises(Exception):
+            f.extend([accounts[0], invalid])
+
+        assert len(f) == 10
+        assert list(f) == accounts
+
+    assert path.stat().st_size == 10 * Account.calc_max_size()
+
+
+def test_dynamic_records(tmp_path):
+    @pod
+    class Message:
+        id: U64
+        values: Vec[U32, 4]
+
+    with pytest.raises(ValueError):
+        PodFile(Message, tmp_path / "messages.bin", "w")
+    with pytest.raises(ValueError):
+        PodFile(Str[8], tmp_path / "names.bin", "w")
+    assert not (tmp_path / "messages.bin").exists()
+
+
+def test_invalid_size(tmp_path):
+    path = tmp_path / "accounts.bin"
+    path.write_bytes(bytes(Account.calc_max_size() + 1))
+
+    with pytest.raises(ValueError):
+        PodFile(Account, path)
@@ -0,0 +1,168 @@
+import asyncio
+import io
+
+import pytest
+
+from podite import (
+    pod,
+    U16,
+    U16b,
+    U32,
+    U64b,
+    Str,
+    Vec,
+    Deframer,
+    FORMAT_PASS,
+    FORMAT_ZERO_COPY,
+    frame_encode,
+    frame_decode,
+    iter_frames,
+    read_frame,
+    aiter_frames,
+)
+
+
+@pod
+class Message:
+    sender: Str[32]
+    values: Vec[U32]
+
+
+MESSAGES = [Message(f"sender{i}", list(range(i))) for i in range(20)]
+
+
+@pytest.mark.parametrize("prefix_type", [U16, U16b, U32, U64b])
+def test_frame_round_trip(prefix_type):
+    message = Message("abc", [1, 2, 3])
+    frame = frame_encode(Message, message, prefix_type)
+    payload = Message.to_bytes(message)
+
+    assert frame[-len(payload) :] == payload
+    assert len(frame) == len(payload) + prefix_type.calc_max_size()
+    assert prefix_type.from_bytes(frame[: -len(payload)]) == len(payload)
+    assert frame_decode(Message, frame, prefix_type) == message
+
+
+def test_frame_format():
+    message = Message("abc", [1, 2, 3])
+    frame = frame_encode(Message, message, format=FORMAT_ZERO_COPY)
+    assert frame[4:] == Message.to_bytes(message, format=FORMAT_ZERO_COPY)
+    assert frame_decode(Message, frame, format=FORMAT_ZERO_COPY) == message
+
+
+def test_frame_errors():
+    with pytest.raises(ValueError):
+        frame_encode(Message, Message("a", list(range(20000))), U16)
+
+    with pytest.raises(ValueError):
+        frame_encode(Message, MESSAGES[0], Str)
+
+    with pytest.raises(ValueError):
+        frame_encode(Message, MESSAGES[0], format=FORMAT_PASS)
+
+    frame = frame_encode(Message, MESSAGES[3])
+    with pytest.raises(ValueError):
+        frame_decode(Message, frame[:-1])
+
+
+def test_deframer():
+    raw = b"".join(frame_encode(Message, m, U16b) for m in MESSAGES)
+
+    deframer = Deframer(U16b)
+    assert deframer.needed == 2
+
+    payloads = []
+    for i in range(0, len(raw), 7):
+        payloads.extend(deframer.feed(raw[i : i + 7]))
+    assert deframer.pending == 0
+    assert [Message.from_bytes(p) for p in payloads] == MESSAGES
+
+    # frames within a single chunk are views over it
+    payloads = deframer.feed(raw)
+    assert all(p.obj is raw for p in payloads)
+    assert [Message.from_bytes(p) for p in payloads] == MESSAGES
+
+
+def test_deframer_needed():
+    frame = frame_encode(Message, MESSAGES[10])
+
+    deframer = Deframer()
+    assert deframer.feed(frame[:6]) == []
+    assert deframer.needed == len(frame) - 6
+    assert deframer.feed(frame[6:]) == [frame[4:]]
+
+
+def test_deframer_large_frame_in_small_chunks():
+    message = Message("big", list(range(1 << 18)))
+    frame = frame_encode(Message, message)
+    raw = frame + frame_encode(Message, MESSAGES[0]) + frame
+
+    deframer = Deframer()
+    payloads = []
+    buffers = set()
+    for i in range(0, len(raw), 4093):
+        payloads.extend(deframer.feed(raw[i : i + 4093]))
+        if deframer._frame is not None:
+            buffers.add(id(deframer._frame))
+            assert deframer.pending + deframer.needed == len(frame)
+
+    assert deframer.pending == 0
+    assert deframer.needed == 4
+    assert [Message.from_bytes(p) for p in payloads] == [message, MESSAGES[0], message]
+    # each split frame is copied into a single buffer, not joined again for every chunk
+    assert len(buffers) == 2
+
+
+def test_deframer_split_prefix():
+    raw = frame_encode(Message, MESSAGES[5], U64b) + bytes(8)
+
+    deframer = Deframer(U64b)
+    payloads = []
+    for i in range(len(raw)):
+        payloads.extend(deframer.feed(raw[i : i + 1]))
+
+    assert Message.from_bytes(payloads[0]) == MESSAGES[5]
+    assert payloads[1] == b""
+    assert deframer.pending == 0
+
+
+def test_deframer_max_frame_size():
+    deframer = Deframer(max_frame_size=8)
+    with pytest.raises(ValueError):
+        deframer.feed(frame_encode(Message, MESSAGES[10]))
+
+
+def test_iter_frames():
+    raw = b"".join(frame_encode(Message, m) for m in MESSAGES)
+
+    payloads = iter_frames(io.BytesIO(raw), chunk_size=16)
+    assert [Message.from_bytes(p) for p in payloads] == MESSAGES
+
+    with pytest.raises(EOFError):
+        list(iter_frames(io.BytesIO(raw[:-1])))
+
+
+def make_reader(raw):
+    reader = asyncio.StreamReader()
+    reader.feed_data(raw)
+    reader.feed_eof()
+    return reader
+
+
+def test_async_frames():
+    async def run():
+        raw = b"".join(frame_encode(Message, m) for m in MESSAGES)
+
+        reader = make_reader(raw)
+        assert Message.from_bytes(await read_frame(reader)) == MESSAGES[0]
+        assert Message.from_bytes(await read_frame(reader)) == MESSAGES[1]
+
+        actual = [Message.from_bytes(p) async for p in aiter_frames(reader)]
+        assert actual == MESSAGES[2:]
+
+        reader = make_reader(raw[:-1])
+        with pytest.raises(EOFError):
+            async for _ in aiter_frames(reader):
+                pass
+
+    asyncio.run(run())
@@ -0,0 +1,297 @@
+import tracemalloc
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+import pytest
+
+from podite import (
+    pod,
+    U8,
+    U32,
+    U64,
+    Str,
+    Vec,
+    FixedLenArray,
+    Enum,
+    Variant,
+    AutoTagType,
+    decode_many,
+    encode_many,
+    decode_shared,
+    encode_into,
+    FORMAT_BORSH,
+    FORMAT_ZERO_COPY,
+)
+from podite.parallel import calc_offsets
+
+
+@pod
+class Message:
+    sender: Str[16]
+    values: Vec[U32, 8]
+
+
+MESSAGES = [Message(f"s{i}", list(range(i % 8))) for i in range(1000)]
+
+
+@pytest.mark.parametrize("format", [FORMAT_BORSH, FORMAT_ZERO_COPY])
+def test_decode_many(format):
+    buffers = [Message.to_bytes(m, format=format) for m in MESSAGES]
+
+    assert decode_many(Message, buffers, workers=1) == MESSAGES
+    assert decode_many(Message, buffers, workers=2, chunk_size=300) == MESSAGES
+
+
+def test_encode_many():
+    buffers = [Message.to_bytes(m) for m in MESSAGES]
+
+    assert encode_many(Message, MESSAGES, workers=1) == buffers
+    assert encode_many(Message, MESSAGES, workers=2, chunk_size=300) == buffers
+    assert encode_many(Message, MESSAGES, workers=2, concat=True) == b"".join(buffers)
+
+    actual = encode_many(Message, MESSAGES, format=FORMAT_ZERO_COPY, workers=1)
+    assert actual == [Message.to_bytes(m, format=FORMAT_ZERO_COPY) for m in MESSAGES]
+
+
+def test_executor():
+    buffers = [Message.to_bytes(m) for m in MESSAGES]
+    with ProcessPoolExecutor(2) as executor:
+        assert decode_many(Message, buffers, executor=executor) == MESSAGES
+        assert encode_many(Message, MESSAGES, executor=executor) == buffers
+        assert decode_many(Message, [], executor=executor) == []
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        decode_many(Message, [], chunk_size=0)
+
+    with pytest.raises(Exception):
+        decode_many(Message, [b"\x01"] * 10, workers=2, chunk_size=5)
+
+
+@pod
+class Tick:
+    price: U64
+    size: U32
+    side: U8
+
+
+TICKS = [Tick(100 + i, i, i % 2) for i in range(1000)]
+
+
+@pytest.mark.parametrize("format", [FORMAT_BORSH, FORMAT_ZERO_COPY])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_decode_shared_stride(format, workers):
+    raw = b"".join(Tick.to_bytes(t, format=format) for t in TICKS)
+
+    actual = decode_shared(Tick, raw, workers=workers, chunk_size=300, format=format)
+    assert actual == TICKS
+
+    columns = decode_shared(
+        Tick, raw, workers=workers, chunk_size=300, format=format, columns=True
+    )
+    assert columns == Tick.from_bytes_columns(
+        [Tick.to_bytes(t) for t in TICKS], format=FORMAT_BORSH
+    )
+    assert isinstance(columns["price"], array)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_decode_shared_offsets(workers):
+    buffers = [Message.to_bytes(m) for m in MESSAGES]
+    offsets = [0]
+    for buffer in buffers[:-1]:
+        offsets.append(offsets[-1] + len(buffer))
+    raw = b"".join(buffers)
+
+    actual = decode_shared(Message, raw, offsets, workers=workers, chunk_size=300)
+    assert actual == MESSAGES
+
+    columns = decode_shared(
+        Message, raw, offsets, workers=workers, chunk_size=300, columns=True
+    )
+    assert columns == Message.from_bytes_columns(buffers)
+
+
+def test_decode_shared_errors():
+    raw = Tick.to_bytes(TICKS[0])
+    with pytest.raises(ValueError):
+        decode_shared(Tick, raw + b"\x00")
+
+    with pytest.raises(ValueError):
+        decode_shared(Message, Message.to_bytes(MESSAGES[0]), format=FORMAT_BORSH)
+
+    with pytest.raises(ValueError):
+        decode_shared(Tick, raw, [4, 0], format=FORMAT_BORSH)
+
+    # records cut short fail in the workers
+    raw = Message.to_bytes(MESSAGES[5])
+    with pytest.raises(Exception):
+        decode_shared(
+            Message, raw * 10, list(range(0, 100, 10)), workers=2, chunk_size=5
+        )
+
+
+@pytest.mark.parametrize("format", [FORMAT_BORSH, FORMAT_ZERO_COPY])
+def test_calc_offsets(format):
+    sizes = [len(Message.to_bytes(m, format=format)) for m in MESSAGES]
+    offsets = calc_offsets(Message, MESSAGES, format=format)
+
+    assert len(offsets) == len(MESSAGES) + 1
+    assert offsets[0] == 0
+    assert [b - a for a, b in zip(offsets, offsets[1:])] == sizes
+
+
+@pytest.mark.parametrize("format", [FORMAT_BORSH, FORMAT_ZERO_COPY])
+@pytest.mark.parametrize("workers,threads", [(1, False), (2, False), (2, True)])
+def test_encode_into(format, workers, threads):
+    expected = b"".join(Message.to_bytes(m, format=format) for m in MESSAGES)
+
+    actual = encode_into(
+        Message,
+        MESSAGES,
+        workers=workers,
+        chunk_size=300,
+        format=format,
+        threads=threads,
+    )
+    assert actual == expected
+
+    buffer = bytearray(len(expected) + 3)
+    encode_into(
+        Message,
+        MESSAGES,
+        buffer,
+        workers=workers,
+        chunk_size=300,
+        format=format,
+        threads=threads,
+    )
+    assert buffer == expected + bytes(3)
+
+
+@pod
+class Fill(Enum[AutoTagType]):
+    NONE = None
+    SOME = Variant(field=U64)
+
+
+@pod
+class Order:
+    done: bool
+    owner: str
+    fill: Fill
+    values: Vec[U32, 8]
+
+
+ORDERS = [
+    Order(
+        i % 3 == 0,
+        f"ünïcødé{i}" * (i % 4),
+        Fill.SOME(i) if i % 2 else Fill.NONE,
+        list(range(i % 5)),
+    )
+    for i in range(600)
+]
+
+
+@pytest.mark.parametrize("format", [FORMAT_BORSH, FORMAT_ZERO_COPY])
+def test_calc_offsets_bool_str_and_enum(format):
+    sizes = [len(Order.to_bytes(o, format=format)) for o in ORDERS]
+    offsets = calc_offsets(Order, ORDERS, format=format)
+
+    assert [b - a for a, b in zip(offsets, offsets[1:])] == sizes
+
+
+@pytest.mark.parametrize("format", [FORMAT_BORSH, FORMAT_ZERO_COPY])
+@pytest.mark.parametrize("workers,threads", [(1, False), (2, False), (2, True)])
+def test_encode_into_bool_str_and_enum(format, workers, threads):
+    expected = b"".join(Order.to_bytes(o, format=format) for o in ORDERS)
+
+    actual = encode_into(
+        Order, ORDERS, workers=workers, chunk_size=200, format=format, threads=threads
+    )
+    assert actual == expected
+    encoded = encode_many(Order, ORDERS, format=format)
+    assert decode_many(Order, encoded, format=format) == ORDERS
+
+    buffer = bytearray(len(expected) + 3)
+    offsets = calc_offsets(Order, ORDERS, format=format)
+    encode_into(Order, ORDERS, buffer, offsets, workers=workers, format=format)
+    assert buffer == expected + bytes(3)
+
+
+@pod
+class Labelled:
+    note: Optional[U64]
+    labels: FixedLenArray[Str[10], 2]
+
+
+LABELLED = [
+    Labelled(None if i % 3 else i, [f"a{i}", "b" * (i % 10)]) for i in range(600)
+]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_encode_into_borsh_optional_and_fixed_len_array(workers):
+    expected = b"".join(Labelled.to_bytes(r) for r in LABELLED)
+
+    offsets = calc_offsets(Labelled, LABELLED)
+    assert [b - a for a, b in zip(offsets, offsets[1:])] == [
+        len(Labelled.to_bytes(r)) for r in LABELLED
+    ]
+    assert encode_into(Labelled, LABELLED, workers=workers, chunk_size=200) == expected
+
+
+def test_encode_into_thread_executor():
+    expected = b"".join(Message.to_bytes(m) for m in MESSAGES)
+
+    with ThreadPoolExecutor(4) as executor:
+        actual = encode_into(
+            Message, MESSAGES, chunk_size=100, threads=True, executor=executor
+        )
+    assert actual == expected
+
+    with ProcessPoolExecutor(2) as executor:
+        with pytest.raises(ValueError):
+            encode_into(Message, MESSAGES, threads=True, executor=executor)
+
+
+def test_encode_into_errors():
+    with pytest.raises(ValueError):
+        encode_into(Message, MESSAGES, bytearray(10))
+
+    with pytest.raises(ValueError):
+        encode_into(Message, MESSAGES, offsets=[0, 1])
+
+    # records must fit the slots given by offsets
+    offsets = calc_offsets(Message, MESSAGES[:2])
+    offsets[1] -= 1
+    with pytest.raises(Exception):
+        encode_into(Message, MESSAGES[:2], offsets=offsets)
+    with pytest.raises(Exception):
+        encode_into(Message, MESSAGES[:2], offsets=offsets, workers=2, chunk_size=1)
+
+
+@pod
+class Batch:
+    name: Str[16]
+    values: Vec[U64, 128]
+
+
+@pytest.mark.parametrize("format", [FORMAT_BORSH, FORMAT_ZERO_COPY])
+def test_encode_into_memory_is_bounded(format):
+    batches = [Batch(f"n{i}", list(range(i % 128))) for i in range(1000)]
+    total = sum(len(Batch.to_bytes(b, format=format)) for b in batches)
+
+    tracemalloc.start()
+    try:
+        buffer = encode_into(Batch, batches, workers=2, chunk_size=25, format=format)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(buffer) == total
+    # the buffer and the chunks in flight, not a second copy of the records
+    assert peak < 1.5 * total
@@ -0,0 +1,92 @@
+import pickle
+
+import pytest
+
+from podite import (
+    pod,
+    U8,
+    U16,
+    U32,
+    Vec,
+    Str,
+    Bytes,
+    FixedLenArray,
+    FixedLenBytes,
+    FixedLenStr,
+    Option,
+    Static,
+    Default,
+    Enum,
+    Variant,
+    AutoTagType,
+    LazyArray,
+)
+
+
+@pod
+class Fill(Enum[AutoTagType]):
+    NONE = None
+    SOME = Variant(field=U32)
+
+
+@pod
+class Record:
+    values: Vec[U8, 4]
+    pair: FixedLenArray[U16, 2]
+    name: Str[8]
+    maybe: Option[U32]
+    padded: Static[Vec[U8, 3]]
+    fill: Fill
+
+
+def round_trip(obj):
+    return pickle.loads(pickle.dumps(obj))
+
+
+@pytest.mark.parametrize(
+    "type_",
+    [
+        Vec[U8, 4],
+        Vec[Vec[U16], 3],
+        Str[8],
+        Bytes[16],
+        FixedLenArray[U16, 2],
+        FixedLenBytes[4],
+        FixedLenStr[5],
+        Option[U32],
+        Option[Vec[U8]],
+        Static[Vec[U8, 3]],
+        Default[U32, 3],
+        Vec,
+        Option,
+    ],
+)
+def test_parametrized_types(type_):
+    assert round_trip(type_) is type_
+
+
+def test_enum_instances():
+    assert round_trip(Fill) is Fill
+    assert round_trip(Fill.NONE) is Fill.NONE
+    assert round_trip(Fill.SOME(3)) == Fill.SOME(3)
+
+    assert round_trip(Option[U32].NONE) is Option[U32].NONE
+    some = round_trip(Option[U32].SOME(5))
+    assert some == Option[U32].SOME(5)
+    assert type(some) is Option[U32]
+
+
+def test_decoded_records():
+    record = Record([1, 2], [3, 4], "abc", Option[U32].SOME(5), [6], Fill.SOME(7))
+    decoded = Record.from_bytes(Record.to_bytes(record))
+    assert round_trip(decoded) == record
+
+
+def test_lazy_array():
+    values = list(range(10))
+    raw = Vec[U32].to_bytes(values)
+    lazy = Vec[U32].from_bytes(raw, lazy=True)[2:5]
+
+    actual = round_trip(lazy)
+    assert isinstance(actual, LazyArray)
+    assert actual == values[2:5]
@@ -1,4 +1,15 @@
-from podite import U8, U32, Option, AutoTagTypeValueManager
+from typing import Optional
+
+from podite import (
+    pod,
+    U8,
+    U32,
+    Str,
+    Option,
+    AutoTagTypeValueManager,
+    FORMAT_BORSH,
+    FORMAT_ZERO_COPY,
+)
 
 
 def test_option_packed():
@@ -40,3 +51,43 @@ def test_option_equal():
     assert b.NONE != c.NONE
     assert b.SOME(1) != c.SOME(1)
     assert b.SOME(2) != c.SOME(1)
+
+
+def test_option_none_is_interned():
+    type_ = Option[U32]
+
+    assert type_.from_bytes(b"\x00") is type_.NONE
+    assert type_.from_dict("NONE") is type_.NONE
+
+
+def test_option_zero_copy():
+    type_ = Option[U32]
+
+    raw = type_.to_bytes(type_.SOME(7), format=FORMAT_ZERO_COPY)
+    assert raw == b"\x01".ljust(8, b"\x00") + b"\x07\x00\x00\x00"
+    assert type_.from_bytes(raw) == type_.SOME(7)
+
+    raw = type_.to_bytes(type_.NONE, format=FORMAT_ZERO_COPY)
+    assert raw == bytes(12)
+    assert type_.from_bytes(raw) is type_.NONE
+
+
+def test_option_invalid_tag():
+    type_ = Option[U32]
+
+    for raw in (b"\x02", b""):
+        try:
+            type_.from_bytes(raw, format=FORMAT_BORSH)
+            assert False
+        except ValueError:
+            pass
+
+
+def test_optional_calc_size():
+    @pod
+    class A:
+        x: Optional[Str[10]]
+
+    assert A.calc_size(A("abc")) == 1 + 4 + 3
+    assert A.from_bytes(A.to_bytes(A("abc"))) == A("abc")
+    assert A.from_bytes(A.to_bytes(A(None))) == A(None)
@@ -0,0 +1,336 @@
+import asyncio
+import io
+import threading
+from typing import Optional, Tuple
+
+import pytest
+
+from podite import (
+    pod,
+    U8,
+    U16,
+    U32,
+    U64,
+    Str,
+    Vec,
+    Bytes,
+    FixedLenArray,
+    Option,
+    Default,
+    Enum,
+    Variant,
+    AutoTagType,
+    FORMAT_BORSH,
+    FORMAT_ZERO_COPY,
+    Decoder,
+)
+from podite.bytes import BYTES_CATALOG
+
+
+@pod
+class Fill(Enum[AutoTagType]):
+    NONE = None
+    SOME = Variant(field=U32)
+
+
+@pod
+class Tick:
+    price: U64
+    size: U32
+    fill: Fill
+
+
+@pod
+class Quote:
+    price: U64
+    size: U32
+
+
+@pod
+class Message:
+    sender: Str[32]
+    values: Vec[U32]
+
+
+@pod
+class Batch:
+    names: Vec[Str[16]]
+
+
+@pod
+class Shape(Enum[AutoTagType]):
+    POINT = None
+    PATH = Variant(field=Vec[U16, 4])
+    LABEL = Variant(field=Str[8])
+
+
+@pod
+class Record:
+    note: Optional[U64]
+    pair: Tuple[U8, Str[8]]
+    shape: Shape
+    rust: Option[U32]
+    labels: FixedLenArray[Str[10], 2]
+    blob: Bytes[16]
+    count: Default[U32, 3]
+    title: str
+    shapes: Vec[Shape, 3]
+
+
+class CountingReader(io.BytesIO):
+    def __init__(self, raw):
+        super().__init__(raw)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+def make_ticks(n):
+    return [Tick(i, 2 * i, Fill.SOME(i) if i % 2 else Fill.NONE) for i in range(n)]
+
+
+@pytest.mark.parametrize("format", [FORMAT_BORSH, FORMAT_ZERO_COPY])
+def test_iter_from_stream_static(format):
+    ticks = make_ticks(1000)
+    raw = b"".join(Tick.to_bytes(t, format=format) for t in ticks)
+    fileobj = CountingReader(raw)
+
+    assert list(Tick.iter_from_stream(fileobj, format=format, chunk_size=4096)) == ticks
+    assert fileobj.reads <= len(raw) // 4096 + 2
+
+
+def test_iter_from_stream_dynamic():
+    messages = [Message(f"sender{i}", list(range(i))) for i in range(200)]
+    raw = b"".join(Message.to_bytes(m) for m in messages)
+
+    actual = Message.iter_from_stream(io.BytesIO(raw), chunk_size=64)
+    assert list(actual) == messages
+
+
+def test_iter_from_stream_truncated():
+    raw = Message.to_bytes(Message("a", [1, 2, 3]))
+    records = Message.iter_from_stream(io.BytesIO(raw + raw[:-2]))
+
+    assert next(records) == Message("a", [1, 2, 3])
+    with pytest.raises(Exception) as e:
+        next(records)
+    assert isinstance(e.value.__cause__, EOFError)
+
+
+def test_decoder_static():
+    quotes = [Quote(i, i + 1) for i in range(10)]
+    raw = b"".join(Quote.to_bytes(q) for q in quotes)
+
+    decoder = Decoder(Quote)
+    assert decoder.needed == 12
+
+    assert decoder.feed(raw[:15]) == quotes[:1]
+    assert decoder.needed == 9
+    assert decoder.pending == 3
+
+    assert decoder.feed(raw[15:]) == quotes[1:]
+    assert decoder.pending == 0
+
+
+def test_decoder_zero_copy():
+    ticks = make_ticks(10)
+    raw = b"".join(Tick.to_bytes(t, format=FORMAT_ZERO_COPY) for t in ticks)
+
+    decoder = Decoder(Tick, format=FORMAT_ZERO_COPY)
+    actual = []
+    for i in range(0, len(raw), 5):
+        actual.extend(decoder.feed(raw[i : i + 5]))
+
+    assert actual == ticks
+
+
+def count_decodes(monkeypatch, type_):
+    calls = []
+    unpack_partial = BYTES_CATALOG.unpack_partial
+
+    def counting(type_arg, *args, **kwargs):
+        if type_arg is type_:
+            calls.append(type_arg)
+        return unpack_partial(type_arg, *args, **kwargs)
+
+    monkeypatch.setattr(BYTES_CATALOG, "unpack_partial", counting)
+    return calls
+
+
+def test_decoder_dynamic(monkeypatch):
+    messages = [Message("x" * i, list(range(10 * i))) for i in range(1, 6)]
+    raw = b"".join(Message.to_bytes(m) for m in messages)
+    decodes = count_decodes(monkeypatch, Message)
+
+    decoder = Decoder(Message)
+    actual = []
+    for i in range(0, len(raw), 7):
+        actual.extend(decoder.feed(raw[i : i + 7]))
+
+    assert actual == messages
+    assert decoder.pending == 0
+    # a record split across chunks is decoded once more, after its scanner has found its end
+    assert len(decodes) <= 2 * len(messages)
+
+
+def test_decoder_large_record_in_small_chunks(monkeypatch):
+    batch = Batch([f"name{i}" for i in range(5000)])
+    raw = Batch.to_bytes(batch)
+    decodes = count_decodes(monkeypatch, Batch)
+
+    decoder = Decoder(Batch)
+    actual = []
+    for i in range(0, len(raw), 256):
+        actual.extend(decoder.feed(raw[i : i + 256]))
+
+    assert actual == [batch]
+    assert len(raw) // 256 > 200
+    assert len(decodes) == 2
+
+
+def test_decoder_split_records_start_no_threads():
+    raw = Batch.to_bytes(Batch(["a", "b", "c"]))
+    threads = threading.active_count()
+
+    decoders = [Decoder(Batch) for _ in range(2000)]
+    for decoder in decoders:
+        assert decoder.feed(raw[:-1]) == []
+        assert decoder.needed == 1
+        assert decoder.pending == len(raw) - 1
+
+    assert threading.active_count() == threads
+    assert decoders[0].feed(raw[-1:]) == [Batch(["a", "b", "c"])]
+
+
+@pytest.mark.parametrize("format", [FORMAT_BORSH, FORMAT_ZERO_COPY])
+def test_decoder_scans_every_kind_of_type(monkeypatch, format):
+    records = [
+        Record(
+            None,
+            (1, "a"),
+            Shape.POINT,
+            Option[U32].NONE,
+            ["x", "yz"],
+            b"",
+            3,
+            "",
+            [],
+        ),
+        Record(
+            7,
+            (2, "bcd"),
+            Shape.PATH([1, 2, 3]),
+            Option[U32].SOME(5),
+            ["long label", ""],
+            b"\x00\x01\x02",
+            4,
+            "title",
+            [Shape.LABEL("hi"), Shape.POINT, Shape.PATH([4])],
+        ),
+    ]
+    raw = b"".join(Record.to_bytes(r, format=format) for r in records)
+    decodes = count_decodes(monkeypatch, Record)
+
+    decoder = Decoder(Record, format=format)
+    actual = []
+    for i in range(len(raw)):
+        actual.extend(decoder.feed(raw[i : i + 1]))
+
+    assert actual == records
+    assert len(decodes) == 2 * len(records)
+
+
+def test_decoder_needed_is_exact_for_sized_reads():
+    message = Message("hello", list(range(100)))
+    raw = Message.to_bytes(message)
+
+    decoder = Decoder(Message)
+    received = []
+    pos = 0
+    while not received:
+        needed = decoder.needed
+        received = decoder.feed(raw[pos : pos + needed])
+        pos += needed
+
+    assert received == [message]
+    assert pos == len(raw)
+
+
+def make_reader(raw):
+    reader = asyncio.StreamReader()
+    reader.feed_data(raw)
+    reader.feed_eof()
+    return reader
+
+
+def test_read_from():
+    async def run():
+        quotes = [Quote(1, 2), Quote(3, 4)]
+        messages = [Message("a", [1]), Message("bc", list(range(50)))]
+        raw = b"".join(map(Quote.to_bytes, quotes)) + b"".join(
+            map(Message.to_bytes, messages)
+        )
+
+        reader = make_reader(raw)
+        assert await Quote.read_from(reader) == quotes[0]
+        assert await Quote.read_from(reader) == quotes[1]
+        assert await Message.read_from(reader) == messages[0]
+        assert await Message.read_from(reader) == messages[1]
+
+        with pytest.raises(EOFError):
+            await Message.read_from(reader)
+
+        reader = make_reader(Message.to_bytes(messages[1])[:-1])
+        with pytest.raises(asyncio.IncompleteReadError):
+            await Message.read_from(reader)
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("format", [FORMAT_BORSH, FORMAT_ZERO_COPY])
+def test_read_from_every_kind_of_type(format):
+    async def run():
+        records = [
+            Record(
+                None, (1, "a"), Shape.POINT, Option[U32].NONE, ["x"] * 2, b"", 3, "", []
+            ),
+            Record(
+                7,
+                (2, "bcd"),
+                Shape.PATH([1, 2, 3]),
+                Option[U32].SOME(5),
+                ["long label", ""],
+                b"\x00\x01\x02",
+                4,
+                "title",
+                [Shape.LABEL("hi"), Shape.POINT, Shape.PATH([4])],
+            ),
+        ]
+        raw = b"".join(Record.to_bytes(r, format=format) for r in records)
+
+        reader = make_reader(raw + b"\xff")
+        for record in records:
+            assert await Record.read_from(reader, format=format) == record
+        assert await reader.read() == b"\xff"
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("format", [FORMAT_BORSH, FORMAT_ZERO_COPY])
+def test_aiter_from_stream(format):
+    async def run():
+        ticks = make_ticks(100)
+        raw = b"".join(Tick.to_bytes(t, format=format) for t in ticks)
+
+        reader = make_reader(raw)
+        actual = [t async for t in Tick.aiter_from_stream(reader, format=format)]
+        assert actual == ticks
+
+        reader = make_reader(raw[:-1])
+        with pytest.raises(EOFError):
+            async for _ in Tick.aiter_from_stream(reader, format=format):
+                pass
+
+    asyncio.run(run())
@@ -0,0 +1,117 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from podite import (
+    pod,
+    U8,
+    U32,
+    U64,
+    Vec,
+    Enum,
+    Variant,
+    AutoTagType,
+    AutoTagTypeValueManager,
+    BytesJsonEncodingManager,
+    ForwardRef,
+    FORMAT_BORSH,
+    FORMAT_ZERO_COPY,
+)
+
+
+@pod
+class Fill(Enum[AutoTagType]):
+    NONE = None
+    SOME = Variant(field=U32)
+
+
+@pod
+class Tick:
+    price: U64
+    fill: Fill
+    next: ForwardRef["Vec[U8, 2]"]
+
+
+def run_concurrently(fn, count=8):
+    barrier = threading.Barrier(count)
+
+    def run(i):
+        barrier.wait()
+        return fn(i)
+
+    with ThreadPoolExecutor(count) as executor:
+        return list(executor.map(run, range(count)))
+
+
+def test_parametrized_types_are_created_once():
+    types = run_concurrently(lambda _: Vec[U32, 12345])
+    assert all(t is types[0] for t in types)
+
+
+def test_tag_type_is_per_thread():
+    def run(i):
+        with AutoTagTypeValueManager(U8 if i % 2 else U64):
+            before = AutoTagTypeValueManager.get_tag()
+            threading.Event().wait(0.01)
+            return before, AutoTagTypeValueManager.get_tag()
+
+    for i, (before, after) in enumerate(run_concurrently(run)):
+        assert before is after is (U8 if i % 2 else U64)
+    assert AutoTagTypeValueManager.get_tag() is U64
+
+
+def test_bytes_encoding_is_per_thread():
+    def run(i):
+        encoding = "hex" if i % 2 else "base64"
+        with BytesJsonEncodingManager(encoding):
+            threading.Event().wait(0.01)
+            return BytesJsonEncodingManager.get_encoding() == encoding
+
+    assert all(run_concurrently(run))
+    assert BytesJsonEncodingManager.get_encoding() == "list"
+
+
+def test_concurrent_decoding():
+    ticks = [
+        Tick(i, Fill.SOME(i) if i % 2 else Fill.NONE, [i % 256]) for i in range(200)
+    ]
+
+    def run(i):
+        format = FORMAT_ZERO_COPY if i % 2 else FORMAT_BORSH
+        encoded = [Tick.to_bytes(t, format=format) for t in ticks]
+        return [Tick.from_bytes(raw, format=format) for raw in encoded] == ticks
+
+    assert all(run_concurrently(run))
+
+
+def make_record_type():
+    @pod
+    class Inner:
+        a: U8
+        b: Vec[U32, 4]
+
+    annotations = {f"f{i}": (Inner if i % 3 else U64) for i in range(24)}
+    return pod(type("Record", (), {"__annotations__": annotations}))
+
+
+def test_concurrent_first_use_of_compiled_plans():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for _ in range(40):
+            record_type = make_record_type()
+            raw = record_type.to_bytes(
+                record_type.from_bytes(bytes(1000), checked=False)
+            )
+            as_dict = record_type.to_dict(record_type.from_bytes(raw))
+
+            def run(i):
+                if i % 3 == 0:
+                    return record_type.bytes_to_dict(raw) == as_dict
+                if i % 3 == 1:
+                    return record_type.dict_to_bytes(as_dict) == raw
+                return record_type.transcode(raw, FORMAT_BORSH, FORMAT_BORSH) == raw
+
+            assert all(run_concurrently(run))
+    finally:
+        sys.setswitchinterval(interval)
@@ -0,0 +1,128 @@
+from typing import Optional, Tuple
+
+from podite import (
+    pod,
+    U8,
+    U16,
+    U32,
+    U64,
+    Bool,
+    Str,
+    Vec,
+    FixedLenArray,
+    FixedLenStr,
+    Option,
+    Static,
+    Enum,
+    Variant,
+    AutoTagType,
+    FORMAT_BORSH,
+    FORMAT_ZERO_COPY,
+    PodPathError,
+)
+from podite.transcode import is_format_invariant
+
+
+@pod
+class Level:
+    price: U64
+    size: U32
+
+
+@pod
+class Side(Enum[U8]):
+    BID = None
+    ASK = None
+
+
+@pod
+class Event(Enum[AutoTagType]):
+    NONE = None
+    FILL = Variant(field=Level)
+    CANCEL = Variant(field=U16)
+
+
+@pod
+class Book:
+    side: Side
+    levels: FixedLenArray[Level, 3]
+    last: Event
+    events: FixedLenArray[Event, 2]
+    fee: Option[U16]
+    name: Static[FixedLenStr[4], 8]
+
+
+@pod
+class Message:
+    book: Book
+    note: Optional[Str[8]]
+    pair: Tuple[U8, Event]
+    history: Vec[Event]
+
+
+def make_book():
+    return Book(
+        side=Side.ASK,
+        levels=[Level(1, 2), Level(3, 4), Level(5, 6)],
+        last=Event.FILL(Level(7, 8)),
+        events=[Event.CANCEL(9), Event.NONE],
+        fee=Option[U16].SOME(3),
+        name="ab",
+    )
+
+
+def test_format_invariance():
+    assert is_format_invariant(Level)
+    assert is_format_invariant(Side)
+    assert is_format_invariant(FixedLenArray[Level, 3])
+    assert not is_format_invariant(Event)
+    assert not is_format_invariant(Book)
+
+
+def test_transcode_matches_round_trip():
+    for src_format, dst_format in [
+        (FORMAT_ZERO_COPY, FORMAT_BORSH),
+        (FORMAT_BORSH, FORMAT_ZERO_COPY),
+        (FORMAT_BORSH, FORMAT_BORSH),
+        (FORMAT_ZERO_COPY, FORMAT_ZERO_COPY),
+    ]:
+        raw = Book.to_bytes(make_book(), format=src_format)
+        expected = Book.to_bytes(
+            Book.from_bytes(raw, format=src_format), format=dst_format
+        )
+
+        assert Book.transcode(raw, src_format, dst_format) == expected
+
+
+def test_transcode_dynamic():
+    obj = Message(
+        book=make_book(),
+        note="hi",
+        pair=(1, Event.CANCEL(2)),
+        history=[Event.FILL(Level(1, 1)), Event.NONE],
+    )
+    raw = Message.to_bytes(obj, format=FORMAT_ZERO_COPY)
+    actual = Message.transcode(raw, FORMAT_ZERO_COPY, FORMAT_BORSH)
+
+    assert actual == Message.to_bytes(obj, format=FORMAT_BORSH)
+    assert Message.from_bytes(actual, format=FORMAT_BORSH) == obj
+
+
+def test_transcode_invariant_is_verbatim():
+    raw = FixedLenArray[Level, 3].to_bytes([Level(1, 2)] * 3)
+    for src_format, dst_format in [
+        (FORMAT_BORSH, FORMAT_ZERO_COPY),
+        (FORMAT_ZERO_COPY, FORMAT_BORSH),
+    ]:
+        assert FixedLenArray[Level, 3].transcode(raw, src_format, dst_format) == raw
+
+
+def test_transcode_error_path():
+    raw = Book.to_bytes(make_book(), format=FORMAT_ZERO_COPY)
+
+    try:
+        Book.transcode(raw[:50], FORMAT_ZERO_COPY, FORMAT_BORSH)
+    except PodPathError as e:
+        assert e.path[::-1] == ["Book", "last"]
+    else:
+        assert False